@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading large JSON exports
+
+Writes an export with N questions (default 1,000,000) using the JSON
+exporter, then compares a full json.load + StructuredData.from_dict with
+streaming the questions through loaders.iter_questions.
+
+Usage:
+    python benchmarks/bench_loaders.py [question_count] [--memory]
+
+--memory also reports peak Python allocations (tracemalloc slows both
+loaders considerably, so timings taken with it are not comparable).
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_maker import StructuredData
+from question_maker.exporters import export_result
+from question_maker.loaders import iter_questions
+
+
+def make_result(count):
+    questions = [
+        {
+            'question': f"Question {i}: which enzyme catalyses step {i % 97} of the pathway?",
+            'options': {'A': "Hexokinase", 'B': "Aldolase", 'C': "Enolase", 'D': f"Kinase {i}"},
+            'question_number': i + 1,
+            'start_position': i * 120,
+            'end_position': i * 120 + 119,
+        }
+        for i in range(count)
+    ]
+    return StructuredData(source="benchmark", content=None,
+                          extracted_data={'multiple_choice_questions': questions,
+                                          'question_count': count})
+
+
+def timed(label, count, func, memory=False):
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    line = f"{label:<32} {elapsed:8.2f} s  {count / elapsed:12,.0f} questions/s"
+    if memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  peak {peak / 2**20:8.1f} MiB"
+    print(line)
+    return result
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    memory = '--memory' in sys.argv
+    count = int(args[0]) if args else 1_000_000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "results.json")
+        result = make_result(count)
+        start = time.perf_counter()
+        export_result(result, {'json': path})
+        print(f"Wrote {count:,} questions ({os.path.getsize(path) / 2**20:.1f} MiB) "
+              f"in {time.perf_counter() - start:.2f} s")
+        del result
+
+        def full_load():
+            with open(path, encoding='utf-8') as f:
+                loaded = StructuredData.from_dict(json.load(f))
+            return len(loaded.get_questions())
+
+        def streamed():
+            return sum(1 for _ in iter_questions(path))
+
+        assert timed("json.load + get_questions", count, full_load, memory) == count
+        assert timed("iter_questions (streaming)", count, streamed, memory) == count
+
+
+if __name__ == "__main__":
+    main()
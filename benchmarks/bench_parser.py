@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the multiple-choice question parser
+
+Parses synthetic banks of N questions (default 50,000): one with
+single-line stems and options (the common fast path) and ones whose stems
+and options wrap over several lines, and reports the parse time of each.
+With a worker count, also times chunked parallel extraction of the
+single-line bank and checks it matches the sequential result.
+
+Usage:
+    python benchmarks/bench_parser.py [question_count] [workers]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_maker.text_transformer import iter_multiple_choice_questions, extract_multiple_choice_questions
+
+
+WORDS = ['which', 'of', 'the', 'following', 'enzyme', 'pathway', 'acid', 'cell',
+         'glucose', 'membrane', 'catalyses', 'reaction', 'regulation', 'protein']
+
+
+def make_bank(count, stem_lines=1, option_lines=1, seed=1):
+    generator = random.Random(seed)
+
+    def words(n):
+        return ' '.join(generator.choice(WORDS) for _ in range(n))
+
+    lines = []
+    for number in range(1, count + 1):
+        lines.append(f"{number}. {words(10)}")
+        lines.extend(words(10) for _ in range(stem_lines - 1))
+        for label in 'ABCD':
+            lines.append(f"{label}. {words(5)}")
+            lines.extend(f"   {words(5)}" for _ in range(option_lines - 1))
+    return '\n'.join(lines)
+
+
+def time_parse(label, text, count):
+    start = time.perf_counter()
+    parsed = sum(1 for _ in iter_multiple_choice_questions(text))
+    parse_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extract_multiple_choice_questions(text)
+    extract_seconds = time.perf_counter() - start
+
+    assert parsed == count, (parsed, count)
+    print(f"  {label:<28} {len(text) / 2**20:7.1f} MB  parse {parse_seconds:6.2f} s  "
+          f"({count / parse_seconds:,.0f} questions/s)  with dicts {extract_seconds:6.2f} s")
+
+
+def time_parallel(text, workers):
+    start = time.perf_counter()
+    sequential = extract_multiple_choice_questions(text)
+    sequential_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = extract_multiple_choice_questions(text, max_workers=workers)
+    parallel_seconds = time.perf_counter() - start
+
+    assert parallel == sequential
+    print(f"  extraction on {workers} workers: {parallel_seconds:.2f} s "
+          f"(sequential {sequential_seconds:.2f} s, {os.cpu_count()} CPUs)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    print(f"Parsing {count:,} questions:")
+    time_parse("single-line", make_bank(count), count)
+    time_parse("stems wrapped over 4 lines", make_bank(count, stem_lines=4), count)
+    time_parse("stems 4 lines, options 3", make_bank(count, stem_lines=4, option_lines=3), count)
+    if workers > 1:
+        time_parallel(make_bank(count), workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark the question search index
+
+Builds a QuestionSearchIndex over N synthetic questions (default 100,000)
+and times a sequence of queries as they would arrive while typing, with
+the prefix cache cleared before each so every query is measured cold.
+
+Usage:
+    python benchmarks/bench_search.py [question_count]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_maker.search import QuestionSearchIndex
+
+
+COMMON_WORDS = ['which', 'the', 'of', 'following', 'is', 'a', 'what', 'in',
+                'enzyme', 'pathway', 'acid', 'cell']
+
+QUERIES = ['w', 'wh', 'whi', 'which', 'which e', 'which enz', 'which enzyme pa',
+           'a', 'the of following is', 'zzzz']
+
+
+def make_questions(count, seed=1):
+    generator = random.Random(seed)
+    vocabulary = [''.join(generator.choice('abcdefghijklmnopqrstuvwxyz')
+                          for _ in range(generator.randint(3, 10))) for _ in range(20000)]
+
+    def sentence(words):
+        return ' '.join(generator.choice(COMMON_WORDS) if generator.random() < 0.4
+                        else generator.choice(vocabulary) for _ in range(words))
+
+    return [{'question': sentence(14) + '?', 'options': {label: sentence(3) for label in 'ABCD'}}
+            for _ in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    questions = make_questions(count)
+
+    start = time.perf_counter()
+    index = QuestionSearchIndex(questions)
+    print(f"Indexed {count:,} questions ({len(index.postings):,} terms) "
+          f"in {time.perf_counter() - start:.2f} s")
+
+    for query in QUERIES:
+        index._prefix_cache.clear()
+        start = time.perf_counter()
+        matches = index.search(query)
+        elapsed = time.perf_counter() - start
+        print(f"  {query!r:<26} {len(matches):>8,} matches  {elapsed * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
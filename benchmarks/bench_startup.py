@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark startup cost of the package and the GUI
+
+Runs ``python -X importtime`` in fresh interpreters for ``import question_maker``
+and ``import gui_app``, reporting the cumulative import time, the slowest
+modules and whether optional dependencies (requests, sqlite3, numpy,
+multiprocessing) were loaded. Then measures the GUI's time to first window:
+from the first import to the first drawn frame (skipped without a display).
+
+Usage:
+    python benchmarks/bench_startup.py [repeats]
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OPTIONAL_MODULES = ('requests', 'sqlite3', 'numpy', 'multiprocessing')
+
+FIRST_WINDOW = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+import gui_app
+try:
+    root = tk.Tk()
+except tk.TclError as e:
+    print("skip", e)
+    raise SystemExit
+app = gui_app.QuestionMakerGUI(root)
+root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+
+def run_python(args):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    # Let the interpreter cache bytecode so repeats measure warm imports
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run([sys.executable] + args, cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def parse_importtime(stderr):
+    """Return [(name, self_us, cumulative_us, depth)] from -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def import_cost(module, repeats):
+    """Best-of-N cumulative import time of a module and the modules it loaded"""
+    best = None
+    for _ in range(repeats):
+        entries = parse_importtime(run_python(['-X', 'importtime', '-c', f'import {module}']).stderr)
+        # Only what the module itself caused: entries up to and including its own line
+        end = next(i for i, entry in enumerate(entries) if entry[0] == module and entry[3] == 0)
+        start = end
+        while start > 0 and entries[start - 1][3] > 0:
+            start -= 1
+        own = entries[start:end + 1]
+        if best is None or own[-1][2] < best[-1][2]:
+            best = own
+    return best
+
+
+def report_imports(module, repeats):
+    entries = import_cost(module, repeats)
+    names = {entry[0] for entry in entries}
+    print(f"import {module}: {entries[-1][2] / 1000:.1f} ms cumulative, {len(entries)} modules")
+    loaded = [name for name in OPTIONAL_MODULES if name in names]
+    print(f"  optional dependencies loaded: {', '.join(loaded) or 'none'}")
+    print("  slowest modules (self time):")
+    for name, self_us, _, _ in sorted(entries, key=lambda entry: -entry[1])[:8]:
+        print(f"    {self_us / 1000:7.2f} ms  {name}")
+
+
+def report_first_window(repeats):
+    times = []
+    for _ in range(repeats):
+        output = run_python(['-c', FIRST_WINDOW]).stdout.strip()
+        if output.startswith('skip'):
+            print(f"time to first window: skipped ({output[5:]})")
+            return
+        times.append(float(output))
+    print(f"time to first window: {min(times) * 1000:.1f} ms (best of {repeats})")
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run_python(['-c', 'import gui_app'])  # warm the bytecode cache
+    report_imports('question_maker', repeats)
+    report_imports('gui_app', repeats)
+    report_first_window(repeats)
+
+
+if __name__ == "__main__":
+    main()
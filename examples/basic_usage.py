@@ -67,8 +67,9 @@ This makes it an excellent choice for beginners and experts alike!""")
     for key, value in result.extracted_data.items():
         if isinstance(value, list):
             print(f"  {key}: {len(value)} items")
-            if key == 'sentences' and value:
-                print(f"    First sentence: {value[0]}")
+            if key == 'sentence_spans' and value:
+                start, end = value[0]
+                print(f"    First sentence: {result.content[start:end]}")
         else:
             print(f"  {key}: {value}")
     
@@ -4,12 +4,12 @@ Demo script that processes an input text file containing multiple-choice questio
 and saves the structured results to an output file for inspection.
 """
 
-import json
 import os
 from datetime import datetime
 from pathlib import Path
 
 from question_maker import TextTransformer
+from question_maker.exporters import export_result
 from question_maker.text_transformer import (
     basic_stats_processor,
     extract_multiple_choice_questions,
@@ -69,15 +69,23 @@ def process_file_demo():
     print(f"Average word length: {data.get('avg_word_length', 0):.1f} characters")
     print()
     
-    # Save complete results as JSON
-    json_output_file = output_dir / f"AA-metabolism_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    # Save JSON, simple text and CSV formats in a single pass over the questions
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    json_output_file = output_dir / f"AA-metabolism_results_{timestamp}.json"
+    simple_format_file = output_dir / f"AA-metabolism_questions_simple_{timestamp}.txt"
+    csv_file = output_dir / f"AA-metabolism_questions_{timestamp}.csv"
     
     print(f"Saving complete results to: {json_output_file.name}")
-    with open(json_output_file, 'w', encoding='utf-8') as f:
-        json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+    print(f"Saving simple question format to: {simple_format_file.name}")
+    print(f"Saving CSV format to: {csv_file.name}")
+    export_result(
+        result,
+        {'json': json_output_file, 'text': simple_format_file, 'csv': csv_file},
+        {'text': {'title': "AMINO ACID METABOLISM QUESTIONS - SIMPLE FORMAT"}}
+    )
     
     # Save human-readable summary
-    summary_file = output_dir / f"AA-metabolism_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    summary_file = output_dir / f"AA-metabolism_summary_{timestamp}.txt"
     
     print(f"Saving human-readable summary to: {summary_file.name}")
     with open(summary_file, 'w', encoding='utf-8') as f:
@@ -114,49 +122,6 @@ def process_file_demo():
             f.write(f"Text position: {question_data.get('start_position', 0)}-{question_data.get('end_position', 0)}\n")
             f.write("\n" + "-" * 50 + "\n\n")
     
-    # Save questions in a simple format for easy review
-    simple_format_file = output_dir / f"AA-metabolism_questions_simple_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-    
-    print(f"Saving simple question format to: {simple_format_file.name}")
-    with open(simple_format_file, 'w', encoding='utf-8') as f:
-        f.write("AMINO ACID METABOLISM QUESTIONS - SIMPLE FORMAT\n")
-        f.write("=" * 50 + "\n\n")
-        
-        questions = data.get('multiple_choice_questions', [])
-        for i, question_data in enumerate(questions, 1):
-            f.write(f"{i}. {question_data['question']}\n")
-            for label in sorted(question_data['options'].keys()):
-                f.write(f"   {label}) {question_data['options'][label]}\n")
-            f.write("\n")
-    
-    # Create a CSV file with question data for spreadsheet analysis
-    csv_file = output_dir / f"AA-metabolism_questions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    
-    print(f"Saving CSV format to: {csv_file.name}")
-    import csv
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        
-        # Write header
-        writer.writerow(['Question_Number', 'Question_Text', 'Option_A', 'Option_B', 'Option_C', 'Option_D', 'Option_E', 'Start_Position', 'End_Position'])
-        
-        # Write question data
-        questions = data.get('multiple_choice_questions', [])
-        for question_data in questions:
-            options = question_data['options']
-            row = [
-                question_data.get('question_number', ''),
-                question_data['question'],
-                options.get('A', ''),
-                options.get('B', ''),
-                options.get('C', ''),
-                options.get('D', ''),
-                options.get('E', ''),
-                question_data.get('start_position', ''),
-                question_data.get('end_position', '')
-            ]
-            writer.writerow(row)
-    
     print("\n=== Files Created ===")
     print(f"1. Complete JSON results: {json_output_file.name}")
     print(f"2. Human-readable summary: {summary_file.name}")
@@ -5,20 +5,259 @@ GUI Application for question_maker - Multiple Choice Question Extractor
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import json
 import os
 from pathlib import Path
 from datetime import datetime
 import threading
-import webbrowser
+import functools
+import queue
+import bisect
 
-from question_maker import TextTransformer
-from question_maker.text_transformer import (
-    basic_stats_processor,
-    extract_multiple_choice_questions,
-    extract_sentences,
-    extract_paragraphs
+from question_maker import (
+    TextTransformer, StructuredData, ProcessingContext, CancellationToken, OperationCancelled
 )
+from question_maker.exporters import EXPORTERS, BackgroundExporter, export_result, auto_export
+from question_maker.search import QuestionSearchIndex, match_spans
+from question_maker.watch import FileWatcher
+from question_maker.history import ResultHistory
+
+
+# The worker sends questions in batches of WORKER_QUESTION_BATCH (or sooner,
+# with each progress report); the Tk thread polls every UI_POLL_MS and adds
+# at most UI_MAX_QUESTIONS_PER_POLL questions per poll
+WORKER_QUESTION_BATCH = 200
+UI_POLL_MS = 50
+UI_MAX_QUESTIONS_PER_POLL = 20000
+BATCH_FILE_PATTERNS = ('*.txt',)
+SEARCH_DEBOUNCE_MS = 150
+
+# Text input larger than this is held in a Python buffer, and the text
+# widget only shows a read-only preview of its first PREVIEW_CHARS
+PREVIEW_THRESHOLD_CHARS = 256 * 1024
+PREVIEW_CHARS = 32 * 1024
+
+# Watch mode: stat the file this often, reprocess once it settles this long
+WATCH_POLL_MS = 500
+WATCH_DEBOUNCE_SECONDS = 0.5
+
+# Estimated bytes of earlier results kept in memory; older ones are spilled to disk
+HISTORY_MEMORY_BUDGET = 256 * 2**20
+
+# Lines of surrounding text shown around a question in the source view
+SOURCE_CONTEXT_LINES = 20
+
+
+class VirtualQuestionList:
+    """
+    Treeview that only creates rows for the visible window of a question list
+    
+    The questions stay in a Python list; scrolling re-fills a fixed set of
+    rows from the current offset, so showing 50k questions costs the same
+    as showing 20. Row ids are question indexes, so a selection maps
+    straight back to the in-memory question. A filter restricts the rows to
+    a sorted list of question indexes without copying any questions.
+    """
+    
+    def __init__(self, parent, on_select=None):
+        self.on_select = on_select
+        self.questions = []
+        self.view = None
+        self.offset = 0
+        self.visible_rows = 10
+        self.selected_index = None
+        
+        self.tree = ttk.Treeview(parent, columns=('question', 'options'),
+                                 show='tree headings', height=10, selectmode='browse')
+        self.tree.heading('#0', text='#')
+        self.tree.heading('question', text='Question')
+        self.tree.heading('options', text='Options')
+        
+        self.tree.column('#0', width=60, minwidth=50)
+        self.tree.column('question', width=400, minwidth=200)
+        self.tree.column('options', width=100, minwidth=100)
+        
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self._on_scrollbar)
+        
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self._scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self._scroll_by(3))
+        self.tree.bind('<Up>', lambda event: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda event: self._move_selection(1))
+        self.tree.bind('<Prior>', lambda event: self._move_selection(-self.visible_rows))
+        self.tree.bind('<Next>', lambda event: self._move_selection(self.visible_rows))
+        self.tree.bind('<Home>', lambda event: self._move_selection(-self.row_count()))
+        self.tree.bind('<End>', lambda event: self._move_selection(self.row_count()))
+    
+    def pack(self):
+        """Pack the tree and its scrollbar into the parent"""
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    
+    def set_questions(self, questions, keep_position=False):
+        """
+        Show a new list of question dictionaries, clearing any filter
+        
+        Args:
+            questions: Question dictionaries to show
+            keep_position: Keep the scroll offset and selection (clamped to
+                the new list) instead of scrolling to the top
+        """
+        self.questions = questions
+        self.view = None
+        if not keep_position:
+            self.offset = 0
+            self.selected_index = None
+        elif self.selected_index is not None and self.selected_index >= len(questions):
+            self.selected_index = None
+        self.refresh()
+    
+    def set_filter(self, indexes):
+        """
+        Show only the questions at the given sorted indexes (None shows all)
+        
+        The selection is kept if the selected question is still shown.
+        """
+        self.view = indexes
+        self.offset = 0
+        if self.selected_index is not None and self._row_of(self.selected_index) is None:
+            self.selected_index = None
+        if self.selected_index is not None:
+            self.offset = self._row_of(self.selected_index) - self.visible_rows // 2
+        self.refresh()
+    
+    def row_count(self):
+        """Number of rows currently shown (after filtering)"""
+        return len(self.view) if self.view is not None else len(self.questions)
+    
+    def _index_at(self, row):
+        return self.view[row] if self.view is not None else row
+    
+    def _row_of(self, index):
+        """Return the row showing a question index, or None if it is filtered out"""
+        if self.view is None:
+            return index if index < len(self.questions) else None
+        row = bisect.bisect_left(self.view, index)
+        if row < len(self.view) and self.view[row] == index:
+            return row
+        return None
+    
+    def append_questions(self, questions):
+        """Add questions to the end, only rebuilding rows if the window changes"""
+        window_end = self.offset + self.visible_rows
+        had_room = self.row_count() < window_end
+        self.questions.extend(questions)
+        if self.view is not None:
+            # Filtered lists gain rows only when the filter is re-applied
+            return
+        if had_room:
+            self.refresh()
+        else:
+            self._update_scrollbar()
+    
+    def clear(self):
+        """Remove all questions"""
+        self.set_questions([])
+    
+    def get_selected_question(self):
+        """Return the selected question dictionary, or None"""
+        if self.selected_index is None or self.selected_index >= len(self.questions):
+            return None
+        return self.questions[self.selected_index]
+    
+    def refresh(self):
+        """Rebuild the visible rows from the current offset"""
+        count = self.row_count()
+        self.offset = max(0, min(self.offset, count - self.visible_rows))
+        self.tree.delete(*self.tree.get_children())
+        
+        end = min(self.offset + self.visible_rows, count)
+        for row in range(self.offset, end):
+            index = self._index_at(row)
+            question = self.questions[index]
+            option_count = len(question.get('options', {}))
+            self.tree.insert('', 'end', iid=str(index), text=str(index + 1),
+                             values=(question['question'][:60] + '...', f"{option_count} options"))
+        
+        if self.selected_index is not None and self.tree.exists(str(self.selected_index)):
+            self.tree.selection_set(str(self.selected_index))
+            self.tree.focus(str(self.selected_index))
+        
+        self._update_scrollbar()
+    
+    def _update_scrollbar(self):
+        count = self.row_count()
+        if count:
+            end = min(self.offset + self.visible_rows, count)
+            self.scrollbar.set(self.offset / count, end / count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def scroll_to(self, index):
+        """Scroll so that a question index is visible (if it is not filtered out)"""
+        row = self._row_of(index)
+        if row is None:
+            return
+        if row < self.offset:
+            self.offset = row
+        elif row >= self.offset + self.visible_rows:
+            self.offset = row - self.visible_rows + 1
+        else:
+            return
+        self.refresh()
+    
+    def _scroll_by(self, rows):
+        self.offset += rows
+        self.refresh()
+        return "break"
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.offset = int(float(amount) * self.row_count())
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self.offset += int(amount) * step
+        self.refresh()
+    
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+    
+    def _on_configure(self, event):
+        style = ttk.Style()
+        row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        # Leave room for the heading row so no inserted row is clipped
+        rows = max(1, event.height // row_height - 2)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.refresh()
+    
+    def _move_selection(self, delta):
+        count = self.row_count()
+        if not count:
+            return "break"
+        current = self._row_of(self.selected_index) if self.selected_index is not None else None
+        if current is None:
+            current = self.offset - 1
+        row = max(0, min(current + delta, count - 1))
+        self._select(self._index_at(row))
+        return "break"
+    
+    def _select(self, index):
+        self.selected_index = index
+        self.scroll_to(index)
+        self.tree.selection_set(str(index))
+        self.tree.focus(str(index))
+    
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        index = int(selection[0])
+        changed = index != self.selected_index
+        self.selected_index = index
+        if self.on_select:
+            self.on_select(self.questions[index], changed)
 
 
 class QuestionMakerGUI:
@@ -31,10 +270,48 @@ class QuestionMakerGUI:
         
         # Initialize transformer
         self.transformer = TextTransformer()
+        # The question processor, rebuilt only when its settings change
+        self._extract_key = None
+        self._extract_processor = None
         self.setup_processors()
         
         # Results storage
         self.current_result = None
+        
+        # Running job state
+        self.ui_queue = None
+        self.cancel_token = None
+        self._streamed_count = 0
+        self._showing_stream = False  # The list shows a running job's questions, not current_result
+        
+        # Batch mode: selected files and the results of the last batch run
+        self.batch_files = []
+        self.batch_results = {}
+        self.batch_errors = {}
+        self._batch_finished = 0
+        
+        # Exports run on a background writer; it reports back through a queue
+        self.export_status_queue = queue.Queue()
+        self.export_writer = BackgroundExporter(
+            on_complete=lambda key, paths, error: self.export_status_queue.put((key, paths, error)))
+        self._export_polling = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Search: index of the shown question list, built on a background thread
+        self._search_index = None
+        self._search_source = None
+        self._search_building = None
+        self._search_after_id = None
+        self._detail_segments = []
+        
+        # Backing buffer for large text input shown in preview mode
+        self.text_buffer = None
+        
+        # Previous results of this session; older ones are spilled to disk
+        self.history = ResultHistory(memory_budget=HISTORY_MEMORY_BUDGET, background=True)
+        self._history_ids = []
+        self._history_loading = None
+        self._watch_entry_id = None
     
     def setup_window(self):
         """Configure the main window"""
@@ -54,26 +331,66 @@ class QuestionMakerGUI:
         """Initialize tkinter variables"""
         self.source_type = tk.StringVar(value="file")
         self.input_text = tk.StringVar()
+        self.input_text.trace_add('write', lambda *args: self._on_input_path_change())
         self.status_text = tk.StringVar(value="Ready")
         self.progress_var = tk.DoubleVar()
+        self.batch_workers = tk.IntVar(value=os.cpu_count() or 1)
+        
+        # Watch mode for the File source (set before widgets trigger the trace)
+        self.watch_file = tk.BooleanVar(value=False)
+        self.watcher = None
+        self._watch_busy = False
         
         # Processor options
         self.use_basic_stats = tk.BooleanVar(value=True)
         self.use_mc_questions = tk.BooleanVar(value=True)
         self.use_sentences = tk.BooleanVar(value=False)
         self.use_paragraphs = tk.BooleanVar(value=False)
+        self.use_answer_keys = tk.BooleanVar(value=True)
+        self.glossary_path = tk.StringVar()
         
         # Export settings
         self.export_location = tk.StringVar(value=str(Path("exports").absolute()))
     
     def setup_processors(self):
         """Setup text processors based on user selection"""
+        from question_maker.text_transformer import (
+            basic_stats_processor,
+            extract_multiple_choice_questions,
+            extract_sentences,
+            extract_paragraphs
+        )
+        from question_maker.answers import extract_questions_with_answers
+        from question_maker.glossary import glossary_processor, load_glossary
+        
         self.transformer.processors.clear()
         
         if self.use_basic_stats.get():
             self.transformer.add_processor(basic_stats_processor)
         if self.use_mc_questions.get():
-            self.transformer.add_processor(extract_multiple_choice_questions)
+            extract = (extract_questions_with_answers if self.use_answer_keys.get()
+                       else extract_multiple_choice_questions)
+            glossary = None
+            glossary_path = self.glossary_path.get().strip()
+            if glossary_path:
+                try:
+                    # Compiled glossaries are cached, so this is only slow the first time
+                    glossary = load_glossary(glossary_path)
+                except (OSError, UnicodeDecodeError) as e:
+                    messagebox.showerror("Glossary Error", f"Cannot read glossary:\n{glossary_path}\n\nError: {e}")
+            # A single large document is parsed in parallel chunks; batch
+            # runs already spread whole files over the worker processes
+            max_workers = self._parallel_workers() if self.source_type.get() != "batch" else None
+            
+            key = (extract, glossary, max_workers)
+            if key != self._extract_key:
+                if glossary is not None:
+                    extract = glossary_processor(glossary, extract)
+                if max_workers is not None:
+                    extract = functools.update_wrapper(
+                        functools.partial(extract, max_workers=max_workers), extract)
+                self._extract_key, self._extract_processor = key, extract
+            self.transformer.add_processor(self._extract_processor)
         if self.use_sentences.get():
             self.transformer.add_processor(extract_sentences)
         if self.use_paragraphs.get():
@@ -124,6 +441,8 @@ class QuestionMakerGUI:
                        value="url", command=self.on_source_change).pack(side=tk.LEFT, padx=10)
         ttk.Radiobutton(source_frame, text="Text Input", variable=self.source_type, 
                        value="string", command=self.on_source_change).pack(side=tk.LEFT, padx=10)
+        ttk.Radiobutton(source_frame, text="Multiple Files", variable=self.source_type, 
+                       value="batch", command=self.on_source_change).pack(side=tk.LEFT, padx=10)
         
         # Input section
         input_section = ttk.LabelFrame(main_container, text="Input", padding=10)
@@ -141,6 +460,9 @@ class QuestionMakerGUI:
                                        command=self.browse_file)
         self.browse_button.pack(side=tk.RIGHT)
         
+        ttk.Checkbutton(self.file_frame, text="Watch for changes", variable=self.watch_file,
+                       command=self.toggle_watch).pack(side=tk.RIGHT, padx=(0, 5))
+        
         # URL input frame
         self.url_frame = ttk.Frame(input_section)
         self.url_entry = ttk.Entry(self.url_frame, textvariable=self.input_text,
@@ -150,12 +472,63 @@ class QuestionMakerGUI:
         # Text input frame
         self.text_frame = ttk.Frame(input_section)
         
-        text_label = ttk.Label(self.text_frame, text="Enter or paste your text:")
-        text_label.pack(anchor=tk.W)
+        text_header = ttk.Frame(self.text_frame)
+        text_header.pack(fill=tk.X)
+        
+        text_label = ttk.Label(text_header, text="Enter or paste your text:")
+        text_label.pack(side=tk.LEFT)
+        
+        ttk.Button(text_header, text="Load File...", 
+                  command=self.load_text_file).pack(side=tk.RIGHT)
+        
+        # Shown only while a large text is held in the backing buffer
+        self.preview_status = tk.StringVar()
+        self.preview_label = ttk.Label(self.text_frame, textvariable=self.preview_status,
+                                      foreground='#8a5a00')
         
         self.text_input = scrolledtext.ScrolledText(self.text_frame, height=15, 
                                                    font=('Consolas', 10))
         self.text_input.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.text_input.bind('<<Paste>>', self._on_text_paste)
+        
+        # Batch input frame: file list doubling as the per-file status table
+        self.batch_frame = ttk.Frame(input_section)
+        
+        batch_buttons = ttk.Frame(self.batch_frame)
+        batch_buttons.pack(fill=tk.X)
+        
+        ttk.Button(batch_buttons, text="Add Files...", 
+                  command=self.browse_batch_files).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(batch_buttons, text="Add Folder...", 
+                  command=self.browse_batch_folder).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(batch_buttons, text="Clear List", 
+                  command=self.clear_batch_files).pack(side=tk.LEFT)
+        
+        self.batch_summary = tk.StringVar(value="No files selected")
+        ttk.Label(batch_buttons, textvariable=self.batch_summary).pack(side=tk.RIGHT)
+        
+        table_frame = ttk.Frame(self.batch_frame)
+        table_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        
+        self.batch_table = ttk.Treeview(table_frame, columns=('file', 'state', 'duration', 'questions'),
+                                        show='headings', height=8)
+        self.batch_table.heading('file', text='File')
+        self.batch_table.heading('state', text='State')
+        self.batch_table.heading('duration', text='Duration')
+        self.batch_table.heading('questions', text='Questions')
+        self.batch_table.column('file', width=400)
+        self.batch_table.column('state', width=90, anchor=tk.CENTER)
+        self.batch_table.column('duration', width=80, anchor=tk.E)
+        self.batch_table.column('questions', width=80, anchor=tk.E)
+        
+        batch_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.batch_table.yview)
+        self.batch_table.configure(yscrollcommand=batch_scrollbar.set)
+        self.batch_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        batch_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Double-click a finished file to see its own results
+        self.batch_table.bind('<Double-1>', self.on_batch_file_open)
+        self.batch_table.tag_configure('failed', foreground='red')
         
         # Control buttons
         button_frame = ttk.Frame(main_container)
@@ -165,6 +538,10 @@ class QuestionMakerGUI:
                                         command=self.process_text, style='Accent.TButton')
         self.process_button.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", 
+                                       command=self.cancel_processing, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=(0, 10))
+        
         self.clear_button = ttk.Button(button_frame, text="Clear", 
                                       command=self.clear_input)
         self.clear_button.pack(side=tk.LEFT, padx=(0, 10))
@@ -174,7 +551,8 @@ class QuestionMakerGUI:
         self.example_button.pack(side=tk.LEFT)
         
         # Progress bar
-        self.progress_bar = ttk.Progressbar(main_container, mode='indeterminate')
+        self.progress_bar = ttk.Progressbar(main_container, mode='determinate', maximum=100,
+                                           variable=self.progress_var)
         self.progress_bar.pack(fill=tk.X, pady=(10, 0))
         
         # Initially show file input
@@ -186,6 +564,15 @@ class QuestionMakerGUI:
         results_container = ttk.Frame(self.results_frame)
         results_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # Session history: switch back to an earlier result
+        history_frame = ttk.Frame(results_container)
+        history_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(history_frame, text="History:").pack(side=tk.LEFT)
+        self.history_combo = ttk.Combobox(history_frame, state='readonly')
+        self.history_combo.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.history_combo.bind('<<ComboboxSelected>>', lambda event: self.on_history_select())
+        
         # Results summary
         summary_frame = ttk.LabelFrame(results_container, text="Summary", padding=10)
         summary_frame.pack(fill=tk.X, pady=(0, 10))
@@ -198,25 +585,25 @@ class QuestionMakerGUI:
         questions_frame = ttk.LabelFrame(results_container, text="Extracted Questions", padding=10)
         questions_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
-        # Questions tree view with hidden column for data storage
-        self.questions_tree = ttk.Treeview(questions_frame, columns=('question', 'options', 'full_question'), 
-                                          show='tree headings', height=10)
-        self.questions_tree.heading('#0', text='#')
-        self.questions_tree.heading('question', text='Question')
-        self.questions_tree.heading('options', text='Options')
+        # Search box: filters the list as you type
+        search_frame = ttk.Frame(questions_frame)
+        search_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
         
-        self.questions_tree.column('#0', width=50, minwidth=50)
-        self.questions_tree.column('question', width=400, minwidth=200)
-        self.questions_tree.column('options', width=100, minwidth=100)
-        self.questions_tree.column('full_question', width=0, minwidth=0)  # Hidden column for data
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.search_status = tk.StringVar()
+        ttk.Label(search_frame, textvariable=self.search_status).pack(side=tk.RIGHT)
         
-        # Scrollbar for tree
-        tree_scroll = ttk.Scrollbar(questions_frame, orient=tk.VERTICAL, 
-                                   command=self.questions_tree.yview)
-        self.questions_tree.configure(yscrollcommand=tree_scroll.set)
+        self.search_var.trace_add('write', lambda *args: self._schedule_search())
+        # Start indexing as soon as the user is about to search
+        self.search_entry.bind('<FocusIn>', lambda event: self._get_search_index())
+        self.search_entry.bind('<Escape>', lambda event: self.search_var.set(''))
         
-        self.questions_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        # Virtual question list: rows exist only for the visible window
+        self.question_list = VirtualQuestionList(questions_frame, on_select=self.on_question_select)
+        self.question_list.pack()
         
         # Question detail view
         detail_frame = ttk.LabelFrame(results_container, text="Question Details", padding=10)
@@ -226,6 +613,10 @@ class QuestionMakerGUI:
                                                     font=('Consolas', 10),
                                                     state=tk.DISABLED)
         self.detail_text.pack(fill=tk.BOTH, expand=True)
+        self.detail_text.tag_configure('match', background='#ffe066')
+        
+        ttk.Button(detail_frame, text="Show in Source",
+                  command=self.show_question_source).pack(anchor=tk.E, pady=(5, 0))
         
         # Export buttons
         export_frame = ttk.Frame(results_container)
@@ -237,9 +628,6 @@ class QuestionMakerGUI:
                   command=self.export_csv).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(export_frame, text="Export Text", 
                   command=self.export_text).pack(side=tk.LEFT)
-        
-        # Bind tree selection
-        self.questions_tree.bind('<<TreeviewSelect>>', self.on_question_select)
     
     def create_settings_tab(self):
         """Create the settings tab"""
@@ -254,11 +642,32 @@ class QuestionMakerGUI:
                        variable=self.use_basic_stats).pack(anchor=tk.W, pady=2)
         ttk.Checkbutton(processors_frame, text="Multiple Choice Questions", 
                        variable=self.use_mc_questions).pack(anchor=tk.W, pady=2)
+        ttk.Checkbutton(processors_frame, text="Match Answer Keys to Questions", 
+                       variable=self.use_answer_keys).pack(anchor=tk.W, padx=(20, 0), pady=2)
+        
+        glossary_frame = ttk.Frame(processors_frame)
+        glossary_frame.pack(fill=tk.X, padx=(20, 0), pady=2)
+        ttk.Label(glossary_frame, text="Glossary file (one term per line):").pack(side=tk.LEFT)
+        ttk.Entry(glossary_frame, textvariable=self.glossary_path).pack(side=tk.LEFT, fill=tk.X,
+                                                                       expand=True, padx=5)
+        ttk.Button(glossary_frame, text="Browse...", 
+                  command=self.browse_glossary).pack(side=tk.LEFT)
+        
         ttk.Checkbutton(processors_frame, text="Extract Sentences", 
                        variable=self.use_sentences).pack(anchor=tk.W, pady=2)
         ttk.Checkbutton(processors_frame, text="Extract Paragraphs", 
                        variable=self.use_paragraphs).pack(anchor=tk.W, pady=2)
         
+        # Parallel processing
+        batch_settings_frame = ttk.LabelFrame(settings_container, text="Parallel Processing", padding=10)
+        batch_settings_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(batch_settings_frame, text="Parallel workers:").pack(side=tk.LEFT)
+        ttk.Spinbox(batch_settings_frame, from_=1, to=max(64, os.cpu_count() or 1), width=5,
+                   textvariable=self.batch_workers).pack(side=tk.LEFT, padx=5)
+        ttk.Label(batch_settings_frame, text="files processed at once, or chunks of one large document",
+                 font=('Arial', 8), foreground='gray').pack(side=tk.LEFT)
+        
         # Output settings
         output_frame = ttk.LabelFrame(settings_container, text="Output Settings", padding=10)
         output_frame.pack(fill=tk.X, pady=(0, 10))
@@ -267,6 +676,10 @@ class QuestionMakerGUI:
         ttk.Checkbutton(output_frame, text="Auto-export results to files", 
                        variable=self.auto_export).pack(anchor=tk.W, pady=2)
         
+        self.json_include_content = tk.BooleanVar(value=True)
+        ttk.Checkbutton(output_frame, text="Include original source text in JSON exports", 
+                       variable=self.json_include_content).pack(anchor=tk.W, pady=2)
+        
         # Export location setting
         export_location_frame = ttk.Frame(output_frame)
         export_location_frame.pack(fill=tk.X, pady=5)
@@ -342,6 +755,7 @@ Features:
         self.file_frame.pack_forget()
         self.url_frame.pack_forget()
         self.text_frame.pack_forget()
+        self.batch_frame.pack_forget()
         
         # Show appropriate frame
         if source == "file":
@@ -350,11 +764,191 @@ Features:
             self.url_frame.pack(fill=tk.X, pady=5)
         elif source == "string":
             self.text_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        elif source == "batch":
+            self.batch_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
         # Clear input
         self.input_text.set("")
         if hasattr(self, 'text_input'):
-            self.text_input.delete('1.0', tk.END)
+            self._set_text_input("")
+    
+    def _set_text_input(self, text):
+        """
+        Replace the text input, switching to preview mode for large texts
+        
+        Large texts stay in self.text_buffer; the widget gets a read-only
+        preview so Tk never holds (or lays out) the whole text.
+        """
+        self.text_input.config(state=tk.NORMAL)
+        self.text_input.delete('1.0', tk.END)
+        
+        if len(text) <= PREVIEW_THRESHOLD_CHARS:
+            self.text_buffer = None
+            self.text_input.insert('1.0', text)
+            self.preview_label.pack_forget()
+            return
+        
+        self.text_buffer = text
+        self.text_input.insert('1.0', text[:PREVIEW_CHARS])
+        self.text_input.config(state=tk.DISABLED)
+        self.preview_status.set(
+            f"Preview: showing the first {PREVIEW_CHARS // 1024} KB of {len(text):,} characters. "
+            f"The full text will be processed; press Clear to edit.")
+        self.preview_label.pack(anchor=tk.W, before=self.text_input, pady=(5, 0))
+    
+    def _get_text_input(self):
+        """Return the full text input from the backing buffer or the widget"""
+        if self.text_buffer is not None:
+            return self.text_buffer
+        return self.text_input.get('1.0', tk.END)
+    
+    def _on_text_paste(self, event):
+        """Paste large clipboard texts into the backing buffer instead of the widget"""
+        if self.text_buffer is not None:
+            return "break"  # The preview is read-only
+        try:
+            pasted = self.root.clipboard_get()
+        except tk.TclError:
+            return None
+        if len(pasted) <= PREVIEW_THRESHOLD_CHARS:
+            return None  # Let Tk paste small texts as usual
+        
+        # Splice the paste into the current (small) widget text
+        if self.text_input.tag_ranges(tk.SEL):
+            before = self.text_input.get('1.0', tk.SEL_FIRST)
+            after = self.text_input.get(tk.SEL_LAST, 'end-1c')
+        else:
+            before = self.text_input.get('1.0', tk.INSERT)
+            after = self.text_input.get(tk.INSERT, 'end-1c')
+        self._set_text_input(before + pasted + after)
+        return "break"
+    
+    def load_text_file(self):
+        """Load a text file into the text input (previewed if large)"""
+        filename = filedialog.askopenfilename(
+            title="Load text file",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        try:
+            with open(filename, 'r', encoding='utf-8', errors='replace') as f:
+                self._set_text_input(f.read())
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not read file:\n{e}")
+    
+    def toggle_watch(self):
+        """Start or stop watching the selected file"""
+        if not self.watch_file.get():
+            self.stop_watching()
+            return
+        
+        path = self.input_text.get().strip()
+        if not path or not os.path.isfile(path):
+            self.watch_file.set(False)
+            messagebox.showerror("Error", "Please select an existing file to watch")
+            return
+        
+        self.setup_processors()
+        if not self.transformer.processors:
+            self.watch_file.set(False)
+            messagebox.showerror("Error", "Please select at least one processor in Settings")
+            return
+        
+        self.watcher = FileWatcher(path, debounce=WATCH_DEBOUNCE_SECONDS)
+        self._watch_busy = False
+        self._watch_entry_id = None
+        # Process right away; later runs happen only when the content changes
+        self._start_watch_job(self.watcher)
+        self.root.after(WATCH_POLL_MS, self._poll_watch, self.watcher)
+    
+    def stop_watching(self):
+        """Stop watching; a reprocess still running is discarded"""
+        if self.watcher is None:
+            return
+        self.watcher = None
+        self._watch_entry_id = None
+        self.watch_file.set(False)
+        self.status_text.set("Stopped watching")
+    
+    def _on_input_path_change(self):
+        """Stop watching when the file path is edited or the source changes"""
+        if self.watcher is not None and self.input_text.get().strip() != self.watcher.path:
+            self.stop_watching()
+    
+    def _poll_watch(self, watcher):
+        """Cheap periodic stat of the watched file"""
+        if watcher is not self.watcher:
+            return
+        if not self._watch_busy and watcher.poll():
+            self._start_watch_job(watcher)
+        self.root.after(WATCH_POLL_MS, self._poll_watch, watcher)
+    
+    def _start_watch_job(self, watcher):
+        """Hash and, if the content changed, reprocess the watched file in the background"""
+        self._watch_busy = True
+        self.status_text.set(f"Checking {os.path.basename(watcher.path)}...")
+        watch_queue = queue.Queue()
+        threading.Thread(target=self._watch_worker,
+                        args=(watcher, self._job_transformer(), watch_queue),
+                        daemon=True).start()
+        self.root.after(UI_POLL_MS, self._poll_watch_job, watcher, watch_queue)
+    
+    def _watch_worker(self, watcher, transformer, watch_queue):
+        """Worker thread for watch mode; never touches Tk directly"""
+        try:
+            with open(watcher.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            if not watcher.check_content(text):
+                watch_queue.put(('unchanged',))
+                return
+            # Process the text just hashed rather than reading the file again,
+            # so the result always matches the recorded hash
+            result = transformer.transform(text, 'string')
+            result.source = str(Path(watcher.path).absolute())
+            watch_queue.put(('updated', result))
+        except Exception as e:
+            # Retry on the next change even if the text is the same
+            watcher.content_hash = None
+            watch_queue.put(('error', str(e)))
+    
+    def _poll_watch_job(self, watcher, watch_queue):
+        """Wait for a watch job; show its result if the file is still watched"""
+        try:
+            message = watch_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(UI_POLL_MS, self._poll_watch_job, watcher, watch_queue)
+            return
+        
+        if watcher is not self.watcher:
+            return
+        self._watch_busy = False
+        name = os.path.basename(watcher.path)
+        if message[0] == 'unchanged':
+            self.status_text.set(f"Watching {name} - content unchanged")
+        elif message[0] == 'error':
+            self.status_text.set(f"Watching {name} - error: {message[1]}")
+        elif self.cancel_token is not None:
+            # A manual run is in progress and will replace the results anyway
+            watcher.content_hash = None
+        else:
+            self._show_watch_result(message[1])
+    
+    def _show_watch_result(self, result):
+        """Update the results view in place with a reprocessed watched file"""
+        self.display_results(result, keep_position=True)
+        # Each update replaces the watched file's previous history entry
+        self._watch_entry_id = self._add_to_history(result, replaces=self._watch_entry_id)
+        
+        # The selected row may now hold an edited question
+        question = self.question_list.get_selected_question()
+        if question is not None:
+            self.on_question_select(question)
+        
+        self.status_text.set(f"Watching {os.path.basename(self.watcher.path)} - "
+                             f"updated at {datetime.now().strftime('%H:%M:%S')}")
+        if self.auto_export.get():
+            self.auto_export_results()
     
     def browse_file(self):
         """Open file browser"""
@@ -371,6 +965,89 @@ Features:
         if filename:
             self.input_text.set(filename)
     
+    def browse_batch_files(self):
+        """Add files to the batch list"""
+        filenames = filedialog.askopenfilenames(
+            title="Select text files",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        self.add_batch_files(filenames)
+    
+    def browse_batch_folder(self):
+        """Add every text file in a folder to the batch list"""
+        folder = filedialog.askdirectory(title="Select folder of text files")
+        if not folder:
+            return
+        
+        filenames = sorted({str(path) for pattern in BATCH_FILE_PATTERNS
+                            for path in Path(folder).glob(pattern) if path.is_file()})
+        if not filenames:
+            messagebox.showwarning("No Files", "The selected folder contains no text files")
+            return
+        self.add_batch_files(filenames)
+    
+    def add_batch_files(self, filenames):
+        """Append files to the batch list, skipping ones already listed"""
+        listed = set(self.batch_files)
+        for filename in filenames:
+            if filename in listed:
+                continue
+            listed.add(filename)
+            self.batch_files.append(filename)
+            self.batch_table.insert('', tk.END, iid=str(len(self.batch_files) - 1),
+                                    values=(filename, 'Pending', '', ''))
+        self._update_batch_summary()
+    
+    def clear_batch_files(self):
+        """Empty the batch list"""
+        if self.cancel_token is not None and self.source_type.get() == "batch":
+            return  # Rows are still being updated by the running batch
+        self.batch_files = []
+        self.batch_results = {}
+        self.batch_errors = {}
+        self.batch_table.delete(*self.batch_table.get_children())
+        self._update_batch_summary()
+    
+    def _update_batch_summary(self):
+        """Show the number of listed files and, once processing, finished files"""
+        count = len(self.batch_files)
+        if not count:
+            self.batch_summary.set("No files selected")
+        elif self._batch_finished:
+            self.batch_summary.set(f"{self._batch_finished} of {count} files processed")
+        else:
+            self.batch_summary.set(f"{count} file{'s' if count != 1 else ''} selected")
+    
+    def _set_batch_row(self, index, state, duration=None, questions=None):
+        """Update one row of the batch status table"""
+        self.batch_table.item(str(index), values=(
+            self.batch_files[index], state,
+            f"{duration:.2f}s" if duration is not None else '',
+            f"{questions:,}" if questions is not None else ''),
+            tags=('failed',) if state == 'Failed' else ())
+    
+    def on_batch_file_open(self, event):
+        """Show the results (or error) of one file of the last batch"""
+        row = self.batch_table.identify_row(event.y)
+        if not row:
+            return
+        if int(row) in self.batch_errors:
+            messagebox.showerror("Processing Error", f"{self.batch_files[int(row)]}:\n\n{self.batch_errors[int(row)]}")
+            return
+        if int(row) not in self.batch_results:
+            return
+        self.display_results(self.batch_results[int(row)])
+        self.notebook.select(self.results_frame)
+    
+    def browse_glossary(self):
+        """Choose the glossary whose terms questions are tagged with"""
+        filename = filedialog.askopenfilename(
+            title="Select glossary file",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if filename:
+            self.glossary_path.set(filename)
+    
     def browse_export_location(self):
         """Open directory browser for export location"""
         directory = filedialog.askdirectory(
@@ -432,7 +1109,7 @@ Features:
         """Clear all input"""
         self.input_text.set("")
         if hasattr(self, 'text_input'):
-            self.text_input.delete('1.0', tk.END)
+            self._set_text_input("")
         self.clear_results()
     
     def load_example(self):
@@ -456,15 +1133,11 @@ B Python
 C JavaScript
 D C++"""
         
-        if self.source_type.get() == "string":
-            self.text_input.delete('1.0', tk.END)
-            self.text_input.insert('1.0', example_text)
-        else:
+        if self.source_type.get() != "string":
             # Switch to text input and load example
             self.source_type.set("string")
             self.on_source_change()
-            self.text_input.delete('1.0', tk.END)
-            self.text_input.insert('1.0', example_text)
+        self._set_text_input(example_text)
     
     def process_text(self):
         """Process the text input"""
@@ -488,10 +1161,15 @@ D C++"""
                 messagebox.showerror("Error", "Please enter a valid URL (starting with http:// or https://)")
                 return
         elif source_type == "string":
-            input_data = self.text_input.get('1.0', tk.END).strip()
+            # Read from the backing buffer, never from a preview in the widget
+            input_data = self._get_text_input().strip()
             if not input_data:
                 messagebox.showerror("Error", "Please enter some text")
                 return
+        elif source_type == "batch":
+            if not self.batch_files:
+                messagebox.showerror("Error", "Please add files or a folder to process")
+                return
         
         # Setup processors
         self.setup_processors()
@@ -500,40 +1178,265 @@ D C++"""
             messagebox.showerror("Error", "Please select at least one processor in Settings")
             return
         
-        # Process in separate thread
+        # Process in separate thread; it reports back through a queue that
+        # the Tk thread drains with a periodic after() poll
         self.start_processing()
-        threading.Thread(target=self._process_worker, args=(input_data, source_type), 
+        self.ui_queue = queue.Queue()
+        self.cancel_token = CancellationToken()
+        self._streamed_count = 0
+        if source_type == "batch":
+            self._start_batch()
+        else:
+            threading.Thread(target=self._process_worker,
+                            args=(self._job_transformer(), input_data, source_type,
+                                  self.ui_queue, self.cancel_token), 
+                            daemon=True).start()
+        self.root.after(UI_POLL_MS, self._poll_worker_queue, self.ui_queue)
+    
+    def _start_batch(self):
+        """Reset the status table and start the batch coordinator thread"""
+        self.batch_results = {}
+        self.batch_errors = {}
+        self._batch_finished = 0
+        for index in range(len(self.batch_files)):
+            self._set_batch_row(index, 'Queued')
+        self._update_batch_summary()
+        
+        threading.Thread(target=self._batch_worker,
+                        args=(self._job_transformer(), list(self.batch_files), self._parallel_workers(),
+                              self.ui_queue, self.cancel_token),
                         daemon=True).start()
     
+    def _parallel_workers(self):
+        """The 'Parallel workers' setting, or the CPU count if it is invalid"""
+        try:
+            return max(1, int(self.batch_workers.get()))
+        except (tk.TclError, ValueError):
+            return os.cpu_count() or 1
+    
+    def _job_transformer(self):
+        """
+        Snapshot of the configured transformer for one background job
+        
+        A cancelled job may still be winding down when the next one starts
+        and reconfigures self.transformer, so each job gets its own.
+        """
+        transformer = TextTransformer()
+        for processor in self.transformer.processors:
+            transformer.add_processor(processor)
+        return transformer
+    
     def start_processing(self):
-        """Start processing animation"""
+        """Reset the progress bar and disable processing controls"""
         self.process_button.config(state=tk.DISABLED)
-        self.progress_bar.start()
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_var.set(0)
         self.status_text.set("Processing...")
     
     def stop_processing(self):
-        """Stop processing animation"""
+        """Re-enable processing controls"""
         self.process_button.config(state=tk.NORMAL)
-        self.progress_bar.stop()
+        self.cancel_button.config(state=tk.DISABLED)
+    
+    def cancel_processing(self):
+        """Stop the running job and go back to the previous results"""
+        if self.cancel_token is None:
+            return
+        # The worker stops at its next chunk or question boundary; its queue
+        # is abandoned so nothing it still sends reaches the UI
+        self.cancel_token.cancel()
+        self.cancel_token = None
+        self.ui_queue = None
+        
+        self.stop_processing()
+        self.progress_var.set(0)
+        for row in self.batch_table.get_children():
+            if self.batch_table.set(row, 'state') in ('Queued', 'Running'):
+                self.batch_table.set(row, 'state', 'Cancelled')
+        if self._streamed_count:
+            # Streaming replaced the results view; restore the previous run
+            if self.current_result is not None:
+                self.display_results(self.current_result)
+            else:
+                self.clear_results()
+        self.status_text.set("Processing cancelled")
     
-    def _process_worker(self, input_data, source_type):
-        """Worker thread for processing"""
+    def _process_worker(self, transformer, input_data, source_type, ui_queue, cancel_token):
+        """Worker thread for processing; never touches Tk directly"""
+        pending = []
+        sent_any = False
+        
+        def on_question(question):
+            nonlocal sent_any
+            pending.append(question)
+            # Send the very first question at once so results appear immediately
+            if len(pending) >= WORKER_QUESTION_BATCH or not sent_any:
+                ui_queue.put(('questions', pending[:]))
+                pending.clear()
+                sent_any = True
+        
+        def on_progress(stage, done, total):
+            if pending:
+                ui_queue.put(('questions', pending[:]))
+                pending.clear()
+            ui_queue.put(('progress', stage, done, total))
+        
+        context = ProcessingContext(on_progress=on_progress, on_question=on_question,
+                                    cancel_token=cancel_token)
         try:
             # Process the text
-            result = self.transformer.transform(input_data, source_type)
+            result = transformer.transform(input_data, source_type, context=context)
+            ui_queue.put(('done', result))
             
-            # Update UI in main thread
-            self.root.after(0, self._process_complete, result)
+        except OperationCancelled:
+            pass
+        except Exception as e:
+            ui_queue.put(('error', str(e)))
+    
+    def _batch_worker(self, transformer, files, max_workers, ui_queue, cancel_token):
+        """
+        Coordinator thread for a batch; never touches Tk directly
+        
+        Files are parsed on a bounded process pool so throughput scales with
+        cores, and each file's start and outcome are reported as they happen.
+        """
+        try:
+            outcomes = transformer.iter_transform_parallel(
+                files, 'file', max_workers=max_workers, cancel_token=cancel_token,
+                on_start=lambda index: ui_queue.put(('file_started', index)))
+            for outcome in outcomes:
+                if outcome.error is None:
+                    ui_queue.put(('file_done', outcome.index, outcome.result, outcome.duration))
+                else:
+                    ui_queue.put(('file_failed', outcome.index, str(outcome.error), outcome.duration))
+            ui_queue.put(('batch_done',))
             
+        except OperationCancelled:
+            pass
         except Exception as e:
-            # Handle errors in main thread
-            self.root.after(0, self._process_error, str(e))
+            ui_queue.put(('error', str(e)))
+    
+    def _poll_worker_queue(self, ui_queue):
+        """Drain a bounded batch of worker messages, then reschedule"""
+        if ui_queue is not self.ui_queue:
+            return  # The job was cancelled
+        
+        questions = []
+        progress = None
+        finished = None
+        
+        while len(questions) < UI_MAX_QUESTIONS_PER_POLL:
+            try:
+                message = ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == 'questions':
+                questions.extend(message[1])
+            elif kind == 'progress':
+                progress = message[1:]
+            elif kind in ('file_started', 'file_done', 'file_failed'):
+                self._show_batch_file(message)
+            else:
+                finished = message
+                break
+        
+        if questions:
+            self._show_streamed_questions(questions)
+        if progress is not None:
+            self._show_progress(*progress)
+        
+        if finished is None:
+            self.root.after(UI_POLL_MS, self._poll_worker_queue, ui_queue)
+            return
+        
+        self.ui_queue = None
+        self.cancel_token = None
+        if finished[0] == 'done':
+            self._process_complete(finished[1])
+        elif finished[0] == 'batch_done':
+            self._batch_complete()
+        else:
+            self._process_error(finished[1])
+    
+    def _show_streamed_questions(self, questions):
+        """Append questions that arrived while processing is still running"""
+        if self._streamed_count == 0:
+            # First questions of this run: replace the previous results
+            self.clear_results()
+            self._showing_stream = True
+            self._set_summary("Processing... results will be summarized when complete")
+            self.question_list.set_questions([])
+            self.notebook.select(self.results_frame)
+        self._streamed_count += len(questions)
+        self.question_list.append_questions(questions)
+        if self.search_var.get().strip():
+            self._schedule_search()
+    
+    def _show_progress(self, stage, done, total):
+        """Show real progress for the current stage"""
+        label = stage.replace('_', ' ')
+        if total:
+            percent = min(100.0, 100.0 * done / total)
+            self.progress_var.set(percent)
+            status = f"{label.capitalize()}: {percent:.0f}% ({done:,} of {total:,})"
+        else:
+            status = f"{label.capitalize()}: {done:,}"
+        if self._streamed_count:
+            status += f" - {self._streamed_count:,} questions so far"
+        self.status_text.set(status)
+    
+    def _show_batch_file(self, message):
+        """Update the status table for one batch file event"""
+        kind, index = message[0], message[1]
+        if kind == 'file_started':
+            self._set_batch_row(index, 'Running')
+            return
+        
+        self._batch_finished += 1
+        if kind == 'file_done':
+            result, duration = message[2], message[3]
+            self.batch_results[index] = result
+            self._set_batch_row(index, 'Done', duration, result.get_field('question_count', 0))
+        else:
+            self.batch_errors[index] = message[2]
+            self._set_batch_row(index, 'Failed', message[3])
+        
+        self.progress_var.set(100.0 * self._batch_finished / len(self.batch_files))
+        self.status_text.set(f"Processed {self._batch_finished} of {len(self.batch_files)} files")
+        self._update_batch_summary()
+    
+    def _batch_complete(self):
+        """Show the aggregate of every successfully processed file"""
+        self.stop_processing()
+        self.progress_var.set(100)
+        
+        results = [self.batch_results[index] for index in sorted(self.batch_results)]
+        failed = len(self.batch_files) - len(results)
+        merged = StructuredData.merge(results, source=f"{len(results)} files")
+        self.display_results(merged)
+        self._add_to_history(merged)
+        
+        status = f"Batch complete: {len(results)} files processed"
+        if failed:
+            status += f", {failed} failed"
+        self.status_text.set(status)
+        self.notebook.select(self.results_frame)
+        
+        if self.auto_export.get():
+            self.auto_export_results()
     
     def _process_complete(self, result):
         """Handle successful processing"""
         self.stop_processing()
-        self.current_result = result
-        self.display_results(result)
+        self.progress_var.set(100)
+        questions = result.get_field('multiple_choice_questions', [])
+        if self._streamed_count and self._search_source is self.question_list.questions:
+            # Same questions as streamed so far; the index just needs extending
+            self._search_source = questions
+        # Keep the scroll position and selection of streamed questions
+        self.display_results(result, keep_position=self._streamed_count > 0)
+        self._add_to_history(result)
         self.status_text.set("Processing complete")
         
         # Switch to results tab
@@ -549,19 +1452,28 @@ D C++"""
         self.status_text.set("Error occurred")
         messagebox.showerror("Processing Error", f"An error occurred while processing:\n\n{error_msg}")
     
-    def display_results(self, result):
-        """Display results in the results tab"""
-        # Clear previous results
-        self.clear_results()
-        
-        # Display summary
-        self.summary_text.config(state=tk.NORMAL)
-        self.summary_text.delete('1.0', tk.END)
+    def display_results(self, result, keep_position=False):
+        """
+        Display results in the results tab
+        
+        The result becomes ``current_result``, which locations, Show in
+        Source and exports act on, so they always match what is shown.
+        
+        Args:
+            result: The StructuredData to show
+            keep_position: Keep the question list's scroll position and
+                selection instead of starting from the top
+        """
+        self.current_result = result
+        self._showing_stream = False
+        if not keep_position:
+            # Clear previous results
+            self.clear_results()
         
         data = result.extracted_data
         summary = f"""Source: {result.source}
 Processing Time: {result.timestamp}
-Content Length: {len(result.content):,} characters
+Content Length: {result.get_content_length():,} characters
 
 Statistics:
 """
@@ -575,20 +1487,27 @@ Statistics:
         if 'question_count' in data:
             summary += f"  Questions Found: {data['question_count']:,}\n"
             summary += f"  Questions with Options: {data.get('questions_with_options', 0):,}\n"
-        
+        if 'answer_count' in data:
+            summary += f"  Answers Matched: {data['answer_count']:,}"
+            unmatched = len(data.get('unmatched_answer_keys', []))
+            if unmatched:
+                summary += f" ({unmatched:,} unmatched keys)"
+            summary += "\n"
+        
+        self._set_summary(summary)
+        
+        # Display questions in the virtual list (no per-question widgets)
+        self.question_list.set_questions(data.get('multiple_choice_questions', []),
+                                         keep_position=keep_position)
+        if self.search_var.get().strip():
+            self._apply_search()
+    
+    def _set_summary(self, summary):
+        """Replace the summary panel text"""
+        self.summary_text.config(state=tk.NORMAL)
+        self.summary_text.delete('1.0', tk.END)
         self.summary_text.insert('1.0', summary)
         self.summary_text.config(state=tk.DISABLED)
-        
-        # Display questions in tree
-        if 'multiple_choice_questions' in data:
-            questions = data['multiple_choice_questions']
-            for i, question in enumerate(questions, 1):
-                option_count = len(question.get('options', {}))
-                item_id = self.questions_tree.insert('', 'end', text=str(i),
-                                                    values=(question['question'][:60] + '...', 
-                                                           f"{option_count} options"))
-                # Store full question data
-                self.questions_tree.set(item_id, 'full_question', json.dumps(question))
     
     def clear_results(self):
         """Clear all results"""
@@ -598,132 +1517,280 @@ Statistics:
             self.summary_text.delete('1.0', tk.END)
             self.summary_text.config(state=tk.DISABLED)
         
-        # Clear questions tree
-        if hasattr(self, 'questions_tree'):
-            for item in self.questions_tree.get_children():
-                self.questions_tree.delete(item)
+        # Clear question list
+        if hasattr(self, 'question_list'):
+            self.question_list.clear()
+        self._search_index = None
+        self._search_source = None
+        if hasattr(self, 'search_status'):
+            self.search_status.set('')
         
         # Clear detail view
         if hasattr(self, 'detail_text'):
             self.detail_text.config(state=tk.NORMAL)
             self.detail_text.delete('1.0', tk.END)
             self.detail_text.config(state=tk.DISABLED)
+        self._detail_segments = []
     
-    def on_question_select(self, event):
-        """Handle question selection in tree"""
-        selection = self.questions_tree.selection()
-        if not selection:
+    def _add_to_history(self, result, replaces=None):
+        """Record a result in the session history and return its entry id"""
+        entry = self.history.add(result, replaces=replaces)
+        self._refresh_history(select=entry.entry_id)
+        return entry.entry_id
+    
+    def _refresh_history(self, select=None):
+        """List the history entries, newest first, marking those held on disk"""
+        entries = self.history.entries()
+        self._history_ids = [entry.entry_id for entry in entries]
+        values = []
+        for entry in entries:
+            label = f"{entry.timestamp[11:19]}  {entry.source}  ({entry.question_count:,} questions)"
+            if not entry.in_memory:
+                label += "  [on disk]"
+            values.append(label)
+        self.history_combo.config(values=values)
+        if select in self._history_ids:
+            self.history_combo.current(self._history_ids.index(select))
+    
+    def on_history_select(self):
+        """Show an earlier result, reloading it in the background if it was spilled"""
+        index = self.history_combo.current()
+        if index < 0:
+            return
+        if self.ui_queue is not None:
+            self.status_text.set("Wait for processing to finish before switching results")
             return
         
-        item = selection[0]
-        question_json = self.questions_tree.set(item, 'full_question')
+        entry_id = self._history_ids[index]
+        self._history_loading = entry_id
+        self.status_text.set("Loading result...")
+        history_queue = queue.Queue()
         
-        if question_json:
-            question = json.loads(question_json)
-            
-            # Display question details
-            self.detail_text.config(state=tk.NORMAL)
-            self.detail_text.delete('1.0', tk.END)
-            
-            detail = f"Question: {question['question']}\n\n"
-            detail += "Options:\n"
-            
-            for label in sorted(question.get('options', {}).keys()):
-                detail += f"  {label}. {question['options'][label]}\n"
-            
-            detail += f"\nQuestion Number: {question.get('question_number', 'N/A')}\n"
-            detail += f"Text Position: {question.get('start_position', 0)}-{question.get('end_position', 0)}"
-            
-            self.detail_text.insert('1.0', detail)
-            self.detail_text.config(state=tk.DISABLED)
+        def load():
+            try:
+                history_queue.put(('done', self.history.get(entry_id)))
+            except Exception as e:
+                history_queue.put(('error', str(e)))
+        
+        threading.Thread(target=load, daemon=True).start()
+        self.root.after(UI_POLL_MS, self._poll_history_load, entry_id, history_queue)
     
-    def export_json(self):
-        """Export results as JSON"""
-        if not self.current_result:
-            messagebox.showwarning("No Results", "No results to export")
+    def _poll_history_load(self, entry_id, history_queue):
+        """Show a history entry once it has been loaded"""
+        if entry_id != self._history_loading:
+            return  # Another entry was selected meanwhile
+        try:
+            kind, value = history_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(UI_POLL_MS, self._poll_history_load, entry_id, history_queue)
             return
         
-        # Ensure export directory exists
-        export_dir = Path(self.export_location.get())
-        export_dir.mkdir(parents=True, exist_ok=True)
+        self._history_loading = None
+        if kind == 'error':
+            self.status_text.set("Could not load result")
+            messagebox.showerror("History Error", f"Could not load the earlier result:\n\n{value}")
+            return
+        self.display_results(value)
+        # Loading may have spilled other entries
+        self._refresh_history(select=entry_id)
+        self.status_text.set(f"Showing earlier result: {value.source}")
+    
+    def _schedule_search(self):
+        """Debounce typing: filter once input pauses for SEARCH_DEBOUNCE_MS"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self._apply_search)
+    
+    def _get_search_index(self):
+        """
+        Return the search index for the shown questions, or None while it builds
+        
+        The index is built once per question list on a background thread;
+        questions streamed in after it was built are added incrementally.
+        """
+        questions = self.question_list.questions
+        if self._search_source is questions and self._search_index is not None:
+            if len(self._search_index) < len(questions):
+                self._search_index.extend(questions[len(self._search_index):])
+            return self._search_index
+        
+        if self._search_building is not questions:
+            self._search_building = questions
+            snapshot = questions[:]
+            built = queue.Queue()
+            threading.Thread(target=lambda: built.put(QuestionSearchIndex(snapshot)),
+                            daemon=True).start()
+            self.root.after(UI_POLL_MS, self._poll_search_index, questions, built)
+        return None
+    
+    def _poll_search_index(self, questions, built):
+        """Adopt a finished background index if its list is still shown"""
+        try:
+            index = built.get_nowait()
+        except queue.Empty:
+            self.root.after(UI_POLL_MS, self._poll_search_index, questions, built)
+            return
+        if self._search_building is questions:
+            self._search_building = None
+        if questions is not self.question_list.questions:
+            return  # Results were replaced while indexing
+        self._search_index = index
+        self._search_source = questions
+        if self.search_var.get().strip():
+            self._apply_search()
+    
+    def _apply_search(self):
+        """Filter the question list by the search box and refresh highlights"""
+        self._search_after_id = None
+        query = self.search_var.get()
+        if not query.strip():
+            self.question_list.set_filter(None)
+            self.search_status.set('')
+            self._highlight_detail()
+            return
         
-        filename = filedialog.asksaveasfilename(
-            title="Save JSON Results",
-            initialdir=str(export_dir),
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-        )
+        index = self._get_search_index()
+        if index is None:
+            self.search_status.set("Indexing questions...")
+            return  # _poll_search_index re-applies the search when ready
         
-        if filename:
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(self.current_result.to_dict(), f, indent=2, ensure_ascii=False)
-                
-                # Show success message with option to open folder
-                result = messagebox.askyesno("Export Successful", 
-                                           f"JSON file saved successfully:\n{filename}\n\nOpen containing folder?")
-                if result:
-                    self.open_file_location(filename)
-                
-                self.status_text.set(f"Exported JSON to {os.path.basename(filename)}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export JSON:\n{e}")
+        matches = index.search(query)
+        self.question_list.set_filter(matches)
+        self.search_status.set(f"{len(matches):,} of {len(index):,} match")
+        self._highlight_detail()
     
-    def export_csv(self):
-        """Export results as CSV"""
-        if not self.current_result or 'multiple_choice_questions' not in self.current_result.extracted_data:
-            messagebox.showwarning("No Results", "No questions to export")
+    def _highlight_detail(self):
+        """Highlight words matching the search in the question detail view"""
+        self.detail_text.tag_remove('match', '1.0', tk.END)
+        query = self.search_var.get()
+        for offset, text in self._detail_segments:
+            for start, end in match_spans(text, query):
+                self.detail_text.tag_add('match', f"1.0 + {offset + start} chars",
+                                         f"1.0 + {offset + end} chars")
+    
+    def on_question_select(self, question, changed=True):
+        """Show the selected question, read straight from the in-memory result"""
+        if not changed:
             return
         
-        # Ensure export directory exists
-        export_dir = Path(self.export_location.get())
-        export_dir.mkdir(parents=True, exist_ok=True)
+        # Display question details
+        self.detail_text.config(state=tk.NORMAL)
+        self.detail_text.delete('1.0', tk.END)
+        
+        # Remember where the question and option texts sit for highlighting
+        segments = []
+        detail = ''
+        if 'source' in question:
+            detail += f"Source: {question['source']}\n"
+        detail += "Question: "
+        segments.append((len(detail), question['question']))
+        detail += f"{question['question']}\n\n"
+        detail += "Options:\n"
+        
+        for label in sorted(question.get('options', {}).keys()):
+            detail += f"  {label}. "
+            segments.append((len(detail), question['options'][label]))
+            detail += f"{question['options'][label]}\n"
+        if question.get('answer'):
+            detail += f"\nAnswer: {question['answer']}\n"
+        if question.get('topic') is not None:
+            detail += f"\nTopic: {question['topic']}\n"
+        if question.get('terms'):
+            detail += f"\nTerms: {', '.join(question['terms'])}\n"
+        
+        detail += f"\nQuestion Number: {question.get('question_number', 'N/A')}\n"
+        detail += f"Text Position: {question.get('start_position', 0)}-{question.get('end_position', 0)}"
+        location = self._question_location(question)
+        if location is not None:
+            detail += f"\nLocation: line {location[0]:,}, column {location[1] + 1}"
+        
+        self.detail_text.insert('1.0', detail)
+        self._detail_segments = segments
+        self._highlight_detail()
+        self.detail_text.config(state=tk.DISABLED)
+    
+    def _displayed_result(self):
+        """The result shown in the results tab, or None while a run's questions are streaming in"""
+        return None if self._showing_stream else self.current_result
+    
+    def _question_location(self, question):
+        """Return the (line, column) where a question starts, if its text is in memory"""
+        result = self._displayed_result()
+        if result is None or 'source' in question or not result.is_content_loaded():
+            return None
+        try:
+            return result.line_index().position(question.get('start_position', 0))
+        except IndexError:
+            return None
+    
+    def show_question_source(self):
+        """Open a window showing the selected question in its source text"""
+        question = self.question_list.get_selected_question()
+        if question is None:
+            messagebox.showwarning("No Question", "Select a question first")
+            return
+        result = self._displayed_result()
+        if result is None:
+            messagebox.showinfo("Show in Source", "The source can be shown once processing completes")
+            return
+        if 'source' in question:
+            messagebox.showinfo("Show in Source", f"Open {question['source']} to see this question")
+            return
         
-        filename = filedialog.asksaveasfilename(
-            title="Save CSV Results",
-            initialdir=str(export_dir),
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-        )
+        try:
+            text = result.load_content(self.transformer.content_cache)
+            index = result.line_index(self.transformer.content_cache)
+            start = question.get('start_position', 0)
+            end = question.get('end_position', start)
+            first_line = index.line_of(start)
+            last_line = index.line_of(end)
+        except (OSError, KeyError, ValueError, IndexError) as e:
+            messagebox.showerror("Show in Source", f"Source text is not available:\n\n{e}")
+            return
         
-        if filename:
-            try:
-                import csv
-                questions = self.current_result.extracted_data['multiple_choice_questions']
-                
-                with open(filename, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Question_Number', 'Question_Text', 'Option_A', 'Option_B', 
-                                   'Option_C', 'Option_D', 'Option_E', 'Start_Position', 'End_Position'])
-                    
-                    for question in questions:
-                        options = question.get('options', {})
-                        row = [
-                            question.get('question_number', ''),
-                            question['question'],
-                            options.get('A', ''),
-                            options.get('B', ''),
-                            options.get('C', ''),
-                            options.get('D', ''),
-                            options.get('E', ''),
-                            question.get('start_position', ''),
-                            question.get('end_position', '')
-                        ]
-                        writer.writerow(row)
-                
-                # Show success message with option to open folder
-                result = messagebox.askyesno("Export Successful", 
-                                           f"CSV file saved successfully:\n{filename}\n\nOpen containing folder?")
-                if result:
-                    self.open_file_location(filename)
-                
-                self.status_text.set(f"Exported CSV to {os.path.basename(filename)}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export CSV:\n{e}")
+        # Only a window of lines around the question goes into the widget
+        shown_first = max(1, first_line - SOURCE_CONTEXT_LINES)
+        shown_last = min(len(index), last_line + SOURCE_CONTEXT_LINES)
+        window_start = index.line_span(shown_first)[0]
+        window_end = index.line_span(shown_last)[1]
+        
+        window = tk.Toplevel(self.root)
+        window.title(f"{result.source} - line {first_line:,}")
+        window.geometry("800x500")
+        source_text = scrolledtext.ScrolledText(window, font=('Consolas', 10), wrap=tk.NONE)
+        source_text.pack(fill=tk.BOTH, expand=True)
+        source_text.insert('1.0', text[window_start:window_end])
+        source_text.tag_configure('question', background='#d0e4ff')
+        source_text.tag_add('question', f"1.0 + {start - window_start} chars",
+                            f"1.0 + {end - window_start} chars")
+        source_text.see(f"{first_line - shown_first + 1}.0")
+        source_text.config(state=tk.DISABLED)
+        ttk.Label(window, text=f"Lines {shown_first:,}-{shown_last:,} of {len(index):,}").pack(anchor=tk.W)
+    
+    def export_json(self):
+        """Export results as JSON"""
+        self._export_format('json', "JSON", [("JSON files", "*.json"), ("All files", "*.*")])
+    
+    def export_csv(self):
+        """Export results as CSV"""
+        result = self._displayed_result()
+        if not result or 'multiple_choice_questions' not in result.extracted_data:
+            messagebox.showwarning("No Results", "No questions to export")
+            return
+        self._export_format('csv', "CSV", [("CSV files", "*.csv"), ("All files", "*.*")])
     
     def export_text(self):
         """Export results as formatted text"""
-        if not self.current_result:
+        self._export_format('text', "Text", [("Text files", "*.txt"), ("All files", "*.*")])
+    
+    def _export_options(self):
+        """Per-format exporter options from the Settings tab"""
+        return {'json': {'include_content': self.json_include_content.get()}}
+    
+    def _export_format(self, format_name, label, filetypes):
+        """Ask for a file name and export the displayed result in one format"""
+        result = self._displayed_result()
+        if not result:
             messagebox.showwarning("No Results", "No results to export")
             return
         
@@ -732,44 +1799,18 @@ Statistics:
         export_dir.mkdir(parents=True, exist_ok=True)
         
         filename = filedialog.asksaveasfilename(
-            title="Save Text Results",
+            title=f"Save {label} Results",
             initialdir=str(export_dir),
-            defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            defaultextension=EXPORTERS[format_name].extension,
+            filetypes=filetypes
         )
         
         if filename:
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("QUESTION MAKER - EXTRACTED RESULTS\n")
-                    f.write("=" * 50 + "\n\n")
-                    
-                    # Write summary
-                    data = self.current_result.extracted_data
-                    f.write(f"Source: {self.current_result.source}\n")
-                    f.write(f"Processing Time: {self.current_result.timestamp}\n")
-                    f.write(f"Content Length: {len(self.current_result.content):,} characters\n\n")
-                    
-                    if 'multiple_choice_questions' in data:
-                        questions = data['multiple_choice_questions']
-                        f.write(f"EXTRACTED QUESTIONS ({len(questions)} found):\n")
-                        f.write("-" * 30 + "\n\n")
-                        
-                        for i, question in enumerate(questions, 1):
-                            f.write(f"{i}. {question['question']}\n")
-                            for label in sorted(question.get('options', {}).keys()):
-                                f.write(f"   {label}) {question['options'][label]}\n")
-                            f.write("\n")
-                
-                # Show success message with option to open folder
-                result = messagebox.askyesno("Export Successful", 
-                                           f"Text file saved successfully:\n{filename}\n\nOpen containing folder?")
-                if result:
-                    self.open_file_location(filename)
-                
-                self.status_text.set(f"Exported text to {os.path.basename(filename)}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export text:\n{e}")
+            # Written in the background; _export_finished reports the outcome
+            options = self._export_options()
+            self._submit_export(('manual', label, filename),
+                                lambda: export_result(result, {format_name: filename}, options))
+            self.status_text.set(f"Exporting {label} to {os.path.basename(filename)}...")
     
     def auto_export_results(self):
         """Auto-export results to timestamped files"""
@@ -778,46 +1819,67 @@ Statistics:
         
         # Use selected export directory
         export_dir = Path(self.export_location.get())
-        export_dir.mkdir(parents=True, exist_ok=True)
         
+        # A newer auto-export to the same directory replaces one still queued
+        result, options = self.current_result, self._export_options()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._submit_export(('auto', str(export_dir)),
+                            lambda: auto_export(result, export_dir, ('json', 'csv'), options, timestamp))
+    
+    def _submit_export(self, key, job):
+        """Queue an export on the background writer and watch for its completion"""
+        self.export_writer.submit(key, job)
+        if not self._export_polling:
+            self._export_polling = True
+            self.root.after(UI_POLL_MS, self._poll_export_status)
+    
+    def _poll_export_status(self):
+        """Report finished exports; keep polling while the writer has work"""
+        while True:
+            try:
+                key, paths, error = self.export_status_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._export_finished(key, paths, error)
         
-        try:
-            # Export JSON
-            json_file = export_dir / f"results_{timestamp}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(self.current_result.to_dict(), f, indent=2, ensure_ascii=False)
-            
-            # Export CSV if questions exist
-            if 'multiple_choice_questions' in self.current_result.extracted_data:
-                csv_file = export_dir / f"questions_{timestamp}.csv"
-                questions = self.current_result.extracted_data['multiple_choice_questions']
-                
-                import csv
-                with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Question_Number', 'Question_Text', 'Option_A', 'Option_B', 
-                                   'Option_C', 'Option_D', 'Option_E'])
-                    
-                    for question in questions:
-                        options = question.get('options', {})
-                        row = [
-                            question.get('question_number', ''),
-                            question['question'],
-                            options.get('A', ''),
-                            options.get('B', ''),
-                            options.get('C', ''),
-                            options.get('D', ''),
-                            options.get('E', '')
-                        ]
-                        writer.writerow(row)
-            
-            self.status_text.set(f"Auto-exported to {export_dir.name}/ directory")
-            
-        except Exception as e:
-            print(f"Auto-export error: {e}")
-            self.status_text.set("Auto-export failed")
-
+        if self.export_writer.is_busy() or not self.export_status_queue.empty():
+            self.root.after(UI_POLL_MS, self._poll_export_status)
+        else:
+            self._export_polling = False
+    
+    def _export_finished(self, key, paths, error):
+        """Show the outcome of a background export"""
+        if key[0] == 'auto':
+            export_dir = Path(key[1])
+            if error is not None:
+                print(f"Auto-export error: {error}")
+                self.status_text.set("Auto-export failed")
+            else:
+                self.status_text.set(f"Auto-exported to {export_dir.name}/ directory")
+            return
+        
+        _, label, filename = key
+        if error is not None:
+            self.status_text.set(f"{label} export failed")
+            messagebox.showerror("Error", f"Failed to export {label}:\n{error}")
+            return
+        
+        self.status_text.set(f"Exported {label} to {os.path.basename(filename)}")
+        # Show success message with option to open folder
+        result = messagebox.askyesno("Export Successful", 
+                                   f"{label} file saved successfully:\n{filename}\n\nOpen containing folder?")
+        if result:
+            self.open_file_location(filename)
+    
+    def on_close(self):
+        """Close the window once queued exports have been written"""
+        self.export_writer.close(timeout=0)
+        if self.export_writer.is_busy():
+            self.status_text.set("Finishing exports...")
+            self.root.after(UI_POLL_MS, self.on_close)
+            return
+        self.history.close()
+        self.root.destroy()
 
 def main():
     """Main application entry point"""
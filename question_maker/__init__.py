@@ -4,7 +4,29 @@ question_maker - A project for transforming text from various sources into struc
 
 __version__ = "0.1.0"
 
-from .text_transformer import TextTransformer, extract_multiple_choice_questions
+import importlib
+
+from .text_transformer import TextTransformer, BatchItemResult, extract_multiple_choice_questions
 from .data_models import StructuredData, MultipleChoiceQuestion
+from .progress import ProcessingContext, CancellationToken, OperationCancelled
+
+__all__ = ["TextTransformer", "StructuredData", "MultipleChoiceQuestion", "extract_multiple_choice_questions",
+           "QuestionStore", "ProcessingContext",
+           "CancellationToken", "OperationCancelled", "BatchItemResult"]
+
+# Exports whose modules pull in heavier dependencies, imported on first use
+_LAZY_EXPORTS = {
+    "QuestionStore": ".store",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["TextTransformer", "StructuredData", "MultipleChoiceQuestion", "extract_multiple_choice_questions"]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
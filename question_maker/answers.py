@@ -0,0 +1,172 @@
+"""
+Answer-key extraction and joining of answers onto parsed questions
+
+Two layouts are recognized:
+
+* Answer-key blocks: a line starting with ``Answers:``, ``Answer key:`` or
+  ``Key:`` followed by numbered pairs (``1-B 2-C``, ``1. B, 2. C``, ...) or
+  by letters in question order (``B C A D``); the pairs may continue on the
+  following lines.
+* Per-question lines such as ``Answer: D`` or ``Correct answer: (d)``, which
+  belong to the question they follow.
+
+Keys are found with regular-expression scans over the whole text and joined
+onto the questions through a dictionary index, so both steps are linear.
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from .grammars import (
+    ANSWER_KEY_HEADER_PATTERN, ANSWER_KEY_LETTERS_PATTERN, ANSWER_KEY_PAIRS_PATTERN,
+    ANSWER_LINE_PATTERN, QuestionGrammar, detect_grammar, get_grammar
+)
+from .progress import ProcessingContext
+from .text_transformer import extract_multiple_choice_questions
+
+
+_PAIR_PATTERN = re.compile(r'(\d+)[ \t]*[-.:)=]?[ \t]*([A-Za-z])(?![A-Za-z])')
+_LETTER_PATTERN = re.compile(r'(?<![A-Za-z])([A-Za-z])(?![A-Za-z])')
+
+# The rest of a key line: only numbered pairs, or only letters
+_PAIRS_LINE = ANSWER_KEY_PAIRS_PATTERN
+_LETTERS_LINE = ANSWER_KEY_LETTERS_PATTERN
+
+_KEY_HEADER = re.compile(rf'^[ \t]*{ANSWER_KEY_HEADER_PATTERN.pattern}', re.IGNORECASE | re.MULTILINE)
+# ANSWER_LINE_PATTERN applied to whole lines of a text in one scan
+_INLINE_ANSWER = re.compile(rf'^[ \t]*(?P<line>{ANSWER_LINE_PATTERN.pattern[1:-1]})[ \t]*\r?$',
+                            re.IGNORECASE | re.MULTILINE)
+
+
+def _key_entries(text: str, start: int) -> Tuple[List[Dict[str, Any]], int]:
+    """Read a key block's pairs from ``start`` on, line by line; returns (entries, end)"""
+    entries: List[Dict[str, Any]] = []
+    position = start
+    first = True  # No non-blank line read yet (the header's own rest may be empty)
+    while position <= len(text):
+        line_end = text.find('\n', position)
+        if line_end == -1:
+            line_end = len(text)
+        line = text[position:line_end].rstrip('\r')
+        if _PAIRS_LINE.match(line):
+            entries.extend({'number': int(match.group(1)), 'answer': match.group(2).upper(),
+                            'position': position + match.start(), 'inline': False}
+                           for match in _PAIR_PATTERN.finditer(line))
+        elif first and _LETTERS_LINE.match(line):
+            # Letters in question order, only on the first line with content
+            entries.extend({'number': None, 'answer': match.group(1).upper(),
+                            'position': position + match.start(), 'inline': False}
+                           for match in _LETTER_PATTERN.finditer(line))
+        elif not (first and not line.strip()):
+            break
+        if line.strip():
+            first = False
+        position = line_end + 1
+    return entries, position
+
+
+def extract_answer_key(text: str) -> List[Dict[str, Any]]:
+    """
+    Find the answers given in a text, in text order
+
+    Returns:
+        Dictionaries with 'number' (the question number, or None for keys
+        given in question order or per question), 'answer' (a capital
+        letter), 'position' (offset of the pair, or of a per-question answer
+        line's text) and 'inline' (True for a per-question answer line)
+    """
+    entries = []
+    search_from = 0
+    for header in _KEY_HEADER.finditer(text):
+        if header.start() < search_from:
+            continue
+        block, search_from = _key_entries(text, header.end())
+        entries.extend(block)
+
+    entries.extend({'number': None, 'answer': match.group('answer').upper(),
+                    'position': match.start('line'), 'inline': True}
+                   for match in _INLINE_ANSWER.finditer(text))
+    entries.sort(key=lambda entry: entry['position'])
+    return entries
+
+
+def join_answers(questions: List[Dict[str, Any]], entries: List[Dict[str, Any]],
+                 by_number: bool = True) -> Tuple[List[Dict[str, Any]], List[Optional[int]]]:
+    """
+    Set each question's 'answer' from answer-key entries, in one pass over each
+
+    Per-question answers go to the question they directly follow, i.e. the
+    last question starting before them if it extends up to the answer line.
+    Numbered keys go to the question with that number when ``by_number``,
+    otherwise to the question at that (1-based) position, which suits
+    documents whose questions are not numbered. Keys without numbers are
+    taken in question order.
+
+    Args:
+        questions: Question dictionaries in text order (updated in place)
+        entries: Entries from ``extract_answer_key``
+        by_number: Join numbered keys on 'question_number'
+
+    Returns:
+        (unmatched entries, numbers of questions left without an answer)
+    """
+    by_key: Dict[int, Dict[str, Any]] = {}
+    if by_number:
+        for question in questions:
+            by_key.setdefault(question.get('question_number'), question)
+
+    unmatched = []
+    next_question = 0   # Questions starting before the current inline entry
+    next_in_order = 0   # Next question for keys given in question order
+    for entry in entries:
+        if entry['inline']:
+            while (next_question < len(questions)
+                   and questions[next_question].get('start_position', 0) < entry['position']):
+                next_question += 1
+            question = questions[next_question - 1] if next_question else None
+            if question is not None and question.get('end_position', 0) < entry['position']:
+                question = None  # Follows text that was not a question
+        elif entry['number'] is None:
+            question = questions[next_in_order] if next_in_order < len(questions) else None
+            next_in_order += 1
+        elif by_number:
+            question = by_key.get(entry['number'])
+        else:
+            index = entry['number'] - 1
+            question = questions[index] if 0 <= index < len(questions) else None
+
+        if question is None:
+            unmatched.append(entry)
+        else:
+            question['answer'] = entry['answer']
+
+    unanswered = [question.get('question_number') for question in questions if not question.get('answer')]
+    return unmatched, unanswered
+
+
+def extract_questions_with_answers(text: str, context: Optional[ProcessingContext] = None,
+                                   grammar: Optional[Union[str, QuestionGrammar]] = None,
+                                   max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extract multiple-choice questions and join the text's answer keys onto them
+
+    Returns the fields of ``extract_multiple_choice_questions`` with each
+    question's 'answer' filled in where a key gives one, plus:
+    'answer_count', 'unmatched_answer_keys' (entries that name no extracted
+    question) and 'unanswered_questions' (question numbers without an answer).
+
+    Numbered keys are joined on question numbers when the questions are
+    numbered in the text, and on question order otherwise. ``max_workers``
+    parses a large text in parallel chunks, as in
+    ``extract_multiple_choice_questions``.
+    """
+    grammar = detect_grammar(text) if grammar is None else get_grammar(grammar)
+    data = extract_multiple_choice_questions(text, context, grammar, max_workers)
+    questions = data['multiple_choice_questions']
+    unmatched, unanswered = join_answers(questions, extract_answer_key(text),
+                                         by_number=grammar.number_pattern is not None)
+
+    data['answer_count'] = len(questions) - len(unanswered)
+    data['unmatched_answer_keys'] = unmatched
+    data['unanswered_questions'] = unanswered
+    return data
@@ -2,10 +2,31 @@
 Data models for structured data representation
 """
 
-from typing import Dict, List, Any, Optional
+import json
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from .lines import LineIndex
+
+
+# Version of the dictionary layout produced by StructuredData.to_dict
+SCHEMA_VERSION = 1
+
+# Count fields that are summed when results are merged
+_SUMMED_FIELDS = (
+    'word_count', 'line_count', 'char_count', 'sentence_count',
+    'paragraph_count', 'question_count', 'questions_with_options',
+    'answer_count',
+)
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a text"""
+    import hashlib
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
 
 @dataclass
 class StructuredData:
@@ -14,20 +35,167 @@ class StructuredData:
     
     Attributes:
         source: The source of the text (file path, URL, or 'string')
-        content: The original text content
+        content: The original text content, or None when held by reference
         extracted_data: Dictionary containing extracted structured information
         metadata: Additional metadata about the extraction
         timestamp: When the data was extracted
+        content_hash: SHA-256 of the content when held by reference
+        content_locator: File path, URL or 'cache:<hash>' key to reload the content
     """
     source: str
-    content: str
+    content: Optional[str]
     extracted_data: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    content_hash: Optional[str] = None
+    content_locator: Optional[str] = None
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation"""
-        return asdict(self)
+    def to_dict(self, include_content: bool = True) -> Dict[str, Any]:
+        """
+        Convert to dictionary representation
+        
+        Args:
+            include_content: Whether to include the original text under 'content'
+        """
+        data = {'schema_version': SCHEMA_VERSION, **asdict(self)}
+        if not include_content:
+            data['content'] = None
+        if data['content_hash'] is None and data['content_locator'] is None:
+            del data['content_hash']
+            del data['content_locator']
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StructuredData':
+        """
+        Rebuild a StructuredData from its dictionary representation
+        
+        Dictionaries without a 'schema_version' are treated as version 1.
+        
+        Raises:
+            ValueError: If the dictionary uses a newer schema version
+        """
+        version = data.get('schema_version', 1)
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Unsupported schema version {version} (newest supported: {SCHEMA_VERSION})")
+        
+        return cls(
+            source=data['source'],
+            content=data.get('content'),
+            extracted_data=dict(data.get('extracted_data') or {}),
+            metadata=dict(data.get('metadata') or {}),
+            timestamp=data.get('timestamp') or datetime.now().isoformat(),
+            content_hash=data.get('content_hash'),
+            content_locator=data.get('content_locator'),
+        )
+    
+    @classmethod
+    def from_json(cls, text: str) -> 'StructuredData':
+        """Rebuild a StructuredData from a JSON string"""
+        return cls.from_dict(json.loads(text))
+    
+    @classmethod
+    def merge(cls, results: List['StructuredData'], source: str) -> 'StructuredData':
+        """
+        Combine several results into one aggregate result
+        
+        Question lists are concatenated in order, each question tagged with
+        the 'source' it came from, and count fields are summed. The aggregate
+        holds no content of its own.
+        
+        Args:
+            results: Results to combine
+            source: Source description for the aggregate
+        """
+        questions = []
+        counts: Dict[str, int] = {}
+        text_length = 0
+        for result in results:
+            data = result.extracted_data
+            for question in data.get('multiple_choice_questions', []):
+                questions.append(dict(question, source=result.source))
+            for key in _SUMMED_FIELDS:
+                if key in data:
+                    counts[key] = counts.get(key, 0) + data[key]
+            text_length += result.get_content_length()
+        
+        extracted_data: Dict[str, Any] = dict(counts)
+        if any('multiple_choice_questions' in result.extracted_data for result in results):
+            extracted_data['multiple_choice_questions'] = questions
+        return cls(
+            source=source,
+            content=None,
+            extracted_data=extracted_data,
+            metadata={'text_length': text_length,
+                      'sources': [result.source for result in results]},
+        )
+    
+    def get_questions(self) -> List['MultipleChoiceQuestion']:
+        """Return extracted questions as MultipleChoiceQuestion objects"""
+        return [MultipleChoiceQuestion.from_dict(q) for q in self.get_field('multiple_choice_questions', [])]
+    
+    def is_content_loaded(self) -> bool:
+        """Return True if the original text is held in memory"""
+        return self.content is not None
+    
+    def get_content_hash(self) -> str:
+        """Return the content hash, computing it from the text if needed"""
+        if self.content_hash is None:
+            return hash_text(self.content or '')
+        return self.content_hash
+    
+    def get_content_length(self) -> int:
+        """Return the length of the original text without reloading it"""
+        if self.content is not None:
+            return len(self.content)
+        return self.metadata.get('text_length', 0)
+    
+    def load_content(self, cache: Optional[Any] = None) -> str:
+        """
+        Return the original text, reloading it from its locator if needed
+        
+        The reloaded text is verified against ``content_hash`` and is not
+        kept on the object, so repeated calls reload it again.
+        
+        Args:
+            cache: ContentCache used to resolve 'cache:' locators
+        
+        Returns:
+            The original text content
+        """
+        if self.content is not None:
+            return self.content
+        if not self.content_locator:
+            raise ValueError(f"No content or content locator for source: {self.source}")
+        
+        from .input_handlers import resolve_locator
+        text = resolve_locator(self.content_locator, cache)
+        if self.content_hash is not None and hash_text(text) != self.content_hash:
+            raise ValueError(f"Content at {self.content_locator} has changed since extraction")
+        return text
+    
+    def line_index(self, cache: Optional[Any] = None) -> 'LineIndex':
+        """
+        Return the content's line-offset index, built once and kept with the result
+        
+        Use it to map question offsets to (line, column) positions, e.g.
+        ``result.line_index().position(question['start_position'])``.
+        
+        Args:
+            cache: ContentCache used to reload content held by reference
+        """
+        index = self.__dict__.get('_line_index')
+        if index is None:
+            from .lines import get_line_index
+            index = get_line_index(self.load_content(cache))
+            self.__dict__['_line_index'] = index  # Not a field: never serialized
+        return index
+    
+    def release_content(self) -> None:
+        """Drop the in-memory text, keeping its hash so it can be verified on reload"""
+        if self.content is not None:
+            self.content_hash = hash_text(self.content)
+            self.content = None
     
     def add_field(self, key: str, value: Any) -> None:
         """Add a field to extracted_data"""
@@ -70,16 +238,47 @@ class MultipleChoiceQuestion:
         question_number: Optional question number or identifier
         start_position: Starting position in original text
         end_position: Ending position in original text
+        answer: Label of the correct option, if the text gives an answer key
+        topic: Topic cluster id assigned by ``topics.assign_topics``
+        terms: Glossary terms the question mentions, each mapped to the
+            [start, end] offsets of its mentions (see ``glossary.tag_questions``)
     """
     question: str
     options: Dict[str, str] = field(default_factory=dict)
     question_number: Optional[int] = None
     start_position: int = 0
     end_position: int = 0
+    answer: Optional[str] = None
+    topic: Optional[int] = None
+    terms: Dict[str, List[List[int]]] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation"""
-        return asdict(self)
+        # Built directly: asdict's recursive deep copy dominated extraction time
+        return {
+            'question': self.question,
+            'options': dict(self.options),
+            'question_number': self.question_number,
+            'start_position': self.start_position,
+            'end_position': self.end_position,
+            'answer': self.answer,
+            'topic': self.topic,
+            'terms': dict(self.terms),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MultipleChoiceQuestion':
+        """Rebuild a question from its dictionary representation"""
+        return cls(
+            question=data['question'],
+            options=dict(data.get('options') or {}),
+            question_number=data.get('question_number'),
+            start_position=data.get('start_position', 0),
+            end_position=data.get('end_position', 0),
+            answer=data.get('answer'),
+            topic=data.get('topic'),
+            terms=dict(data.get('terms') or {}),
+        )
     
     def add_option(self, label: str, text: str) -> None:
         """Add an option to the question"""
@@ -0,0 +1,234 @@
+"""
+Near-duplicate question detection with MinHash signatures and LSH banding
+
+Requires NumPy (``pip install -e ".[analysis]"``).
+"""
+
+import re
+import zlib
+from typing import Dict, List, Any, Optional, Hashable, Iterable, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .data_models import StructuredData, MultipleChoiceQuestion
+
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Upper bound on shingles hashed per NumPy batch (rows x num_perm uint64s)
+_SHINGLE_BATCH = 1 << 15
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Near-duplicate detection requires numpy: pip install numpy")
+
+
+def question_text(question: Union[Dict[str, Any], MultipleChoiceQuestion]) -> str:
+    """Return a question's stem and options as one string, options in label order"""
+    if isinstance(question, MultipleChoiceQuestion):
+        return question.get_full_text()
+    options = question.get('options', {})
+    parts = [question.get('question', '')]
+    parts.extend(f"{label} {options[label]}" for label in sorted(options))
+    return '\n'.join(parts)
+
+
+def shingle_hashes(text: str, shingle_size: int = 3) -> List[int]:
+    """
+    Return the 32-bit hashes of a text's word shingles
+
+    Text is lowercased and split into word tokens; texts shorter than
+    ``shingle_size`` tokens produce a single shingle.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) <= shingle_size:
+        return [zlib.crc32(' '.join(tokens).encode('utf-8'))]
+    shingles = {' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+    return [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles]
+
+
+def choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Pick an LSH (bands, rows) split whose S-curve midpoint is nearest the threshold
+
+    A pair with Jaccard similarity s becomes a candidate with probability
+    1 - (1 - s^rows)^bands, which rises steeply around (1/bands)^(1/rows).
+    """
+    best = (1, num_perm)
+    best_error = float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class QuestionDeduplicator:
+    """
+    Finds clusters of near-duplicate multiple-choice questions
+
+    Questions are added incrementally (from single questions, results or a
+    QuestionStore), MinHash signatures are computed in vectorized batches,
+    and LSH banding limits similarity checks to candidate pairs, so
+    clustering runs in roughly linear time.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128,
+                 shingle_size: int = 3, seed: int = 1):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity at which two questions are duplicates
+            num_perm: Number of MinHash permutations per signature
+            shingle_size: Number of words per shingle
+            seed: Seed for the permutation parameters
+        """
+        _require_numpy()
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+
+        # Multiply-shift hash family: odd 64-bit multipliers, 64-bit offsets
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = generator.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+        self.keys: List[Hashable] = []
+        self._pending: List[List[int]] = []
+        self._signatures: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: Hashable, question: Union[Dict[str, Any], MultipleChoiceQuestion]) -> None:
+        """Add a question under a caller-chosen key"""
+        self.keys.append(key)
+        self._pending.append(shingle_hashes(question_text(question), self.shingle_size))
+
+    def add_questions(self, questions: Iterable[Union[Dict[str, Any], MultipleChoiceQuestion]]) -> None:
+        """Add questions keyed by their position in this deduplicator"""
+        for question in questions:
+            self.add(len(self.keys), question)
+
+    def add_result(self, result: StructuredData) -> None:
+        """Add a result's questions keyed by (source, question_number)"""
+        for question in result.get_field('multiple_choice_questions', []):
+            self.add((result.source, question.get('question_number')), question)
+
+    def add_store(self, store: Any, source: Optional[str] = None) -> None:
+        """Add questions from a QuestionStore keyed by their store id"""
+        for question in store.iter_questions(source):
+            self.add(question['id'], question)
+
+    def signatures(self) -> 'np.ndarray':
+        """Return the (questions x num_perm) MinHash signature matrix"""
+        self._compute_pending()
+        if not self._signatures:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+        return np.concatenate(self._signatures)
+
+    def _compute_pending(self) -> None:
+        """Compute signatures for added questions in bounded NumPy batches"""
+        pending, self._pending = self._pending, []
+        start = 0
+        while start < len(pending):
+            end, shingle_count = start, 0
+            while end < len(pending) and (end == start or shingle_count + len(pending[end]) <= _SHINGLE_BATCH):
+                shingle_count += len(pending[end])
+                end += 1
+            self._signatures.append(self._minhash(pending[start:end]))
+            start = end
+
+    def _minhash(self, shingle_sets: List[List[int]]) -> 'np.ndarray':
+        lengths = np.fromiter((len(s) for s in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+        offsets = np.zeros(len(shingle_sets), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        flat = np.fromiter((h for s in shingle_sets for h in s), dtype=np.uint64, count=int(lengths.sum()))
+
+        # (a*x + b) >> 32 in wrapping 64-bit arithmetic, for every permutation at once
+        hashed = np.outer(flat, self._a)
+        hashed += self._b
+        hashed >>= np.uint64(32)
+        return np.minimum.reduceat(hashed, offsets, axis=0).astype(np.uint32)
+
+    def find_clusters(self) -> List[List[Hashable]]:
+        """
+        Group near-duplicate questions
+
+        Returns:
+            Clusters of two or more keys, each in insertion order, ordered by
+            their first member
+        """
+        signatures = self.signatures()
+        count = len(signatures)
+        parent = list(range(count))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            band_keys = signatures[:, band * self.rows:(band + 1) * self.rows]
+            buckets: Dict[bytes, List[int]] = {}
+            for index in range(count):
+                buckets.setdefault(band_keys[index].tobytes(), []).append(index)
+
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                # Compare each member to one representative per cluster seen in
+                # the bucket, so buckets of exact copies stay linear
+                representatives: List[int] = []
+                for index in members:
+                    root = find(index)
+                    for rep in representatives:
+                        rep_root = find(rep)
+                        if rep_root == root:
+                            break
+                        if self._similarity(signatures, index, rep) >= self.threshold:
+                            parent[root] = rep_root
+                            break
+                    else:
+                        representatives.append(index)
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(count):
+            groups.setdefault(find(index), []).append(index)
+        clusters = sorted((members for members in groups.values() if len(members) > 1),
+                          key=lambda members: members[0])
+        return [[self.keys[i] for i in members] for members in clusters]
+
+    @staticmethod
+    def _similarity(signatures: 'np.ndarray', i: int, j: int) -> float:
+        """Estimate Jaccard similarity as the fraction of matching signature slots"""
+        return float(np.count_nonzero(signatures[i] == signatures[j])) / signatures.shape[1]
+
+
+def find_near_duplicates(questions: Iterable[Union[Dict[str, Any], MultipleChoiceQuestion]],
+                         threshold: float = 0.8, num_perm: int = 128,
+                         shingle_size: int = 3) -> List[List[int]]:
+    """
+    Find clusters of near-duplicate questions in a list
+
+    Args:
+        questions: Question dictionaries or MultipleChoiceQuestion objects
+        threshold: Estimated Jaccard similarity at which two questions are duplicates
+        num_perm: Number of MinHash permutations per signature
+        shingle_size: Number of words per shingle
+
+    Returns:
+        Clusters of question indices, each with two or more members
+    """
+    deduplicator = QuestionDeduplicator(threshold, num_perm, shingle_size)
+    deduplicator.add_questions(questions)
+    return deduplicator.find_clusters()
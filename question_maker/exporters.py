@@ -0,0 +1,436 @@
+"""
+Streaming exporters for writing results as JSON, CSV and formatted text
+
+Each exporter writes to an open text stream as questions are fed to it, so
+several formats can be produced in a single pass over a result's questions.
+``BackgroundExporter`` runs exports on a writer thread so interactive callers
+never wait on disk I/O.
+"""
+
+import csv
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Hashable, Optional, TextIO, Iterable, Union
+
+from .data_models import StructuredData, SCHEMA_VERSION
+
+
+QUESTIONS_KEY = 'multiple_choice_questions'
+
+
+def get_questions(result: StructuredData) -> List[Dict[str, Any]]:
+    """Return a result's extracted question dictionaries"""
+    return result.get_field(QUESTIONS_KEY, [])
+
+
+def collect_option_labels(questions: Iterable[Dict[str, Any]]) -> List[str]:
+    """Return every option label used by the questions, sorted"""
+    labels = set()
+    for question in questions:
+        labels.update(question.get('options', {}))
+    return sorted(labels)
+
+
+class Exporter:
+    """
+    Base class for streaming exporters
+
+    Exporters are driven by ``export_result``: ``begin`` is called once,
+    ``write_question`` once per question in order, then ``end``.
+    """
+
+    format_name = ''
+    extension = ''
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def begin(self, result: StructuredData, questions: List[Dict[str, Any]]) -> None:
+        """Write anything that precedes the questions"""
+
+    def write_question(self, number: int, question: Dict[str, Any]) -> None:
+        """Write one question (number is its 1-based position)"""
+
+    def end(self, result: StructuredData) -> None:
+        """Write anything that follows the questions"""
+
+
+class JSONExporter(Exporter):
+    """
+    Write the full result as JSON, streaming the question list
+
+    Output matches ``json.dump(result.to_dict(include_content), indent=indent)``
+    without building the intermediate dictionary.
+    """
+
+    format_name = 'json'
+    extension = '.json'
+
+    def __init__(self, stream: TextIO, indent: Optional[int] = 2, include_content: bool = True):
+        super().__init__(stream)
+        self.indent = indent
+        self.include_content = include_content
+        self._after_questions: List[tuple] = []
+        self._question_count = 0
+        self._has_questions = False
+        self._comma = ',' if indent is not None else ', '
+
+    def _newline(self, depth: int) -> str:
+        if self.indent is None:
+            return ''
+        return '\n' + ' ' * (self.indent * depth)
+
+    def _dumps(self, value: Any, depth: int) -> str:
+        text = json.dumps(value, indent=self.indent, ensure_ascii=False)
+        if self.indent is None:
+            return text
+        return text.replace('\n', self._newline(depth))
+
+    def _top_level_items(self, result: StructuredData) -> List[tuple]:
+        items = [('schema_version', SCHEMA_VERSION)]
+        items += [(f.name, getattr(result, f.name)) for f in fields(result)]
+        if not self.include_content:
+            items = [(k, None if k == 'content' else v) for k, v in items]
+        if result.content_hash is None and result.content_locator is None:
+            items = [(k, v) for k, v in items if k not in ('content_hash', 'content_locator')]
+        return items
+
+    def _write_item(self, key: str, value: Any, depth: int, first: bool) -> None:
+        separator = '' if first else self._comma
+        self.stream.write(f"{separator}{self._newline(depth)}{json.dumps(key)}: {self._dumps(value, depth)}")
+
+    def begin(self, result: StructuredData, questions: List[Dict[str, Any]]) -> None:
+        items = self._top_level_items(result)
+        self.stream.write('{')
+        for index, (key, value) in enumerate(items):
+            if key != 'extracted_data' or QUESTIONS_KEY not in value:
+                self._write_item(key, value, 1, index == 0)
+                continue
+
+            # Open extracted_data and stream its question list; the keys that
+            # follow are written by end()
+            self._has_questions = True
+            self.stream.write(f"{'' if index == 0 else self._comma}{self._newline(1)}\"extracted_data\": {{")
+            data_items = list(value.items())
+            position = [k for k, _ in data_items].index(QUESTIONS_KEY)
+            for data_index, (data_key, data_value) in enumerate(data_items[:position]):
+                self._write_item(data_key, data_value, 2, data_index == 0)
+            self.stream.write(f"{'' if position == 0 else self._comma}{self._newline(2)}\"{QUESTIONS_KEY}\": [")
+            self._after_questions = [('data', item) for item in data_items[position + 1:]]
+            self._after_questions += [('top', item) for item in items[index + 1:]]
+            return
+        self.stream.write(self._newline(0) + '}')
+
+    def write_question(self, number: int, question: Dict[str, Any]) -> None:
+        separator = self._comma if self._question_count else ''
+        self.stream.write(f"{separator}{self._newline(3)}{self._dumps(question, 3)}")
+        self._question_count += 1
+
+    def end(self, result: StructuredData) -> None:
+        if not self._has_questions:
+            return
+        if self._question_count:
+            self.stream.write(self._newline(2))
+        self.stream.write(']')
+        closed_data = False
+        for level, (key, value) in self._after_questions:
+            if level == 'top' and not closed_data:
+                self.stream.write(self._newline(1) + '}')
+                closed_data = True
+            self._write_item(key, value, 2 if level == 'data' else 1, False)
+        if not closed_data:
+            self.stream.write(self._newline(1) + '}')
+        self.stream.write(self._newline(0) + '}')
+
+
+class CSVExporter(Exporter):
+    """Write one row per question with a column for every option label used"""
+
+    format_name = 'csv'
+    extension = '.csv'
+
+    def __init__(self, stream: TextIO, option_labels: Optional[List[str]] = None,
+                 include_positions: bool = True):
+        super().__init__(stream)
+        self.option_labels = option_labels
+        self.include_positions = include_positions
+        self.writer = csv.writer(stream)
+
+    def begin(self, result: StructuredData, questions: List[Dict[str, Any]]) -> None:
+        if self.option_labels is None:
+            self.option_labels = collect_option_labels(questions)
+        self.include_answers = any(question.get('answer') for question in questions)
+        self.include_topics = any(question.get('topic') is not None for question in questions)
+        self.include_terms = any(question.get('terms') for question in questions)
+        header = ['Question_Number', 'Question_Text']
+        header += [f"Option_{label}" for label in self.option_labels]
+        if self.include_answers:
+            header.append('Answer')
+        if self.include_topics:
+            header.append('Topic')
+        if self.include_terms:
+            header.append('Terms')
+        if self.include_positions:
+            header += ['Start_Position', 'End_Position']
+        self.writer.writerow(header)
+
+    def write_question(self, number: int, question: Dict[str, Any]) -> None:
+        options = question.get('options', {})
+        row = [question.get('question_number', ''), question['question']]
+        row += [options.get(label, '') for label in self.option_labels]
+        if self.include_answers:
+            row.append(question.get('answer') or '')
+        if self.include_topics:
+            row.append('' if question.get('topic') is None else question['topic'])
+        if self.include_terms:
+            row.append('; '.join(question.get('terms') or ()))
+        if self.include_positions:
+            row += [question.get('start_position', ''), question.get('end_position', '')]
+        self.writer.writerow(row)
+
+
+class TextExporter(Exporter):
+    """Write a human-readable listing of the result and its questions"""
+
+    format_name = 'text'
+    extension = '.txt'
+
+    def __init__(self, stream: TextIO, title: str = "QUESTION MAKER - EXTRACTED RESULTS"):
+        super().__init__(stream)
+        self.title = title
+
+    def begin(self, result: StructuredData, questions: List[Dict[str, Any]]) -> None:
+        write = self.stream.write
+        write(f"{self.title}\n")
+        write("=" * 50 + "\n\n")
+        write(f"Source: {result.source}\n")
+        write(f"Processing Time: {result.timestamp}\n")
+        write(f"Content Length: {result.get_content_length():,} characters\n\n")
+        if QUESTIONS_KEY in result.extracted_data:
+            write(f"EXTRACTED QUESTIONS ({len(questions)} found):\n")
+            write("-" * 30 + "\n\n")
+
+    def write_question(self, number: int, question: Dict[str, Any]) -> None:
+        options = question.get('options', {})
+        lines = [f"{number}. {question['question']}\n"]
+        lines += [f"   {label}) {options[label]}\n" for label in sorted(options)]
+        if question.get('answer'):
+            lines.append(f"   Answer: {question['answer']}\n")
+        if question.get('topic') is not None:
+            lines.append(f"   Topic: {question['topic']}\n")
+        if question.get('terms'):
+            lines.append(f"   Terms: {', '.join(question['terms'])}\n")
+        lines.append("\n")
+        self.stream.write(''.join(lines))
+
+
+EXPORTERS = {
+    'json': JSONExporter,
+    'csv': CSVExporter,
+    'text': TextExporter,
+}
+
+
+def _check_formats(formats: Iterable[str]) -> None:
+    unknown = set(formats) - set(EXPORTERS)
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+
+
+def stream_result(result: StructuredData, exporters: List[Exporter]) -> int:
+    """
+    Drive several exporters through a result's questions in one pass
+
+    Returns:
+        Number of questions written
+    """
+    questions = get_questions(result)
+    for exporter in exporters:
+        exporter.begin(result, questions)
+    for number, question in enumerate(questions, 1):
+        for exporter in exporters:
+            exporter.write_question(number, question)
+    for exporter in exporters:
+        exporter.end(result)
+    return len(questions)
+
+
+def export_result(result: StructuredData, targets: Dict[str, Union[str, Path]],
+                  options: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Path]:
+    """
+    Export a result to one file per format in a single pass over its questions
+
+    Each file is written to a temporary file in the target directory and
+    renamed into place once every format has been written, so readers never
+    see a partial export and a failed export leaves existing files untouched.
+
+    Args:
+        result: The StructuredData to export
+        targets: Mapping of format name ('json', 'csv', 'text') to file path
+        options: Optional per-format exporter keyword arguments, e.g.
+            ``{'json': {'include_content': False}}``
+
+    Returns:
+        Mapping of format name to the written path
+    """
+    options = options or {}
+    _check_formats(targets)
+
+    paths = {name: Path(path) for name, path in targets.items()}
+    streams = []
+    temp_paths = {}
+    try:
+        exporters = []
+        for name, path in paths.items():
+            # Created like open() would, so the umask applies to the final file
+            temp_path = path.with_name(f".{path.name}.{os.urandom(6).hex()}.tmp")
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            temp_paths[name] = temp_path
+            stream = open(fd, 'w', encoding='utf-8', newline='' if name == 'csv' else None)
+            streams.append(stream)
+            exporters.append(EXPORTERS[name](stream, **options.get(name, {})))
+        stream_result(result, exporters)
+        for stream in streams:
+            stream.close()
+        for name in list(temp_paths):
+            os.replace(temp_paths.pop(name), paths[name])
+    finally:
+        for stream in streams:
+            stream.close()
+        for temp_path in temp_paths.values():
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    return paths
+
+
+def auto_export(result: StructuredData, directory: Union[str, Path],
+                formats: Iterable[str] = ('json', 'csv'),
+                options: Optional[Dict[str, Dict[str, Any]]] = None,
+                timestamp: Optional[str] = None) -> Dict[str, Path]:
+    """
+    Export a result to timestamped files in a directory
+
+    Files are named ``results_<timestamp>.json``, ``questions_<timestamp>.csv``
+    and ``results_<timestamp>.txt``; the CSV is skipped when the result has
+    no extracted questions.
+
+    Returns:
+        Mapping of format name to the written path
+    """
+    formats = list(formats)
+    _check_formats(formats)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    targets = {}
+    for name in formats:
+        if name == 'csv':
+            if QUESTIONS_KEY not in result.extracted_data:
+                continue
+            targets[name] = directory / f"questions_{timestamp}.csv"
+        else:
+            targets[name] = directory / f"results_{timestamp}{EXPORTERS[name].extension}"
+    return export_result(result, targets, options)
+
+
+# (key, written paths or None, error or None)
+ExportCallback = Callable[[Hashable, Optional[Dict[str, Path]], Optional[BaseException]], None]
+
+
+class BackgroundExporter:
+    """
+    Runs export jobs one at a time on a background writer thread
+
+    Jobs are submitted under a key. A job that has not started yet is
+    replaced when another job is submitted under the same key, so bursts of
+    exports to the same destination coalesce into one write of the newest
+    result. ``on_complete`` is called on the writer thread after each job.
+    """
+
+    def __init__(self, on_complete: Optional[ExportCallback] = None):
+        self.on_complete = on_complete
+        self._pending: 'OrderedDict[Hashable, Callable[[], Dict[str, Path]]]' = OrderedDict()
+        self._condition = threading.Condition()
+        self._active = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, key: Hashable, job: Callable[[], Dict[str, Path]]) -> bool:
+        """
+        Queue an export job
+
+        Args:
+            key: Destination key; a pending job with the same key is replaced
+            job: Callable that performs the export and returns written paths
+
+        Returns:
+            True if the job replaced a pending one
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BackgroundExporter is closed")
+            coalesced = self._pending.pop(key, None) is not None
+            self._pending[key] = job
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="export-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+        return coalesced
+
+    def submit_result(self, key: Hashable, result: StructuredData,
+                      targets: Dict[str, Union[str, Path]],
+                      options: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
+        """Queue ``export_result`` for a result; see ``submit``"""
+        return self.submit(key, lambda: export_result(result, targets, options))
+
+    def is_busy(self) -> bool:
+        """Return True while jobs are pending or being written"""
+        with self._condition:
+            return bool(self._pending) or self._active > 0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted job has been written
+
+        Returns:
+            True if the writer is idle, False if the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._active, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting jobs and wait for pending ones to be written"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        return self.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                key, job = self._pending.popitem(last=False)
+                self._active += 1
+
+            paths, error = None, None
+            try:
+                paths = job()
+            except Exception as e:
+                error = e
+            try:
+                if self.on_complete is not None:
+                    self.on_complete(key, paths, error)
+            finally:
+                with self._condition:
+                    self._active -= 1
+                    self._condition.notify_all()
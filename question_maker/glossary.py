@@ -0,0 +1,283 @@
+"""
+Glossary term tagging with an Aho-Corasick automaton
+
+A glossary of terms (single words or phrases) is compiled once into an
+Aho-Corasick automaton over words, so a question is scanned for every
+term in a single pass whatever the size of the glossary. Matching is
+case-insensitive and on whole words; punctuation and whitespace between
+the words of a phrase are ignored, so "amino acid" also matches
+"Amino-acid" or a phrase wrapped across lines. A word keeps any '+' or
+'#' it ends with and any '.' between its characters, so "C++", "C#", "C"
+and "Node.js" are all different words.
+
+Compiled glossaries are cached by their term list, so processors rebuilt
+for each ``transform`` call (or unpickled in each worker process) reuse
+the same automaton.
+"""
+
+import functools
+import re
+import warnings
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .grammars import QuestionGrammar, detect_grammar, get_grammar
+from .progress import ProcessingContext
+from .text_transformer import extract_multiple_choice_questions
+
+
+# A word, with dots inside it ("3.5", "Node.js") and a '+'/'#' suffix ("C++", "C#")
+_WORD = re.compile(r'\w+(?:\.\w+)*[+#]*')
+
+# Compiled glossaries kept by compile_glossary
+_CACHE_SIZE = 8
+
+
+class Glossary:
+    """
+    Aho-Corasick automaton over the words of a list of glossary terms
+
+    Terms that normalize to the same words (e.g. "DNA" and "dna") are
+    reported as the first of them, and terms without any word characters
+    are ignored; both are warned about.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: Tuple[str, ...] = tuple(terms)
+        self._words: Dict[str, int] = {}
+        goto: List[Dict[int, int]] = [{}]
+        output = [-1]   # Index of the term ending at each state, or -1
+        depth = [0]     # Number of words from the root to each state
+
+        for index, term in enumerate(self.terms):
+            state = 0
+            words = _WORD.findall(term.lower())
+            if not words:
+                warnings.warn(f"Glossary term {term!r} has no words and is ignored", stacklevel=2)
+                continue
+            for word in words:
+                token = self._words.setdefault(word, len(self._words))
+                child = goto[state].get(token)
+                if child is None:
+                    child = len(goto)
+                    goto[state][token] = child
+                    goto.append({})
+                    output.append(-1)
+                    depth.append(depth[state] + 1)
+                state = child
+            if output[state] < 0:
+                output[state] = index
+            else:
+                warnings.warn(f"Glossary term {term!r} has the same words as "
+                              f"{self.terms[output[state]]!r} and is reported as it", stacklevel=2)
+
+        # Failure links in breadth-first order, each state's pointing at its
+        # longest proper suffix in the trie; ``report`` is the nearest state
+        # on that chain (itself included) where a term ends
+        fail = [0] * len(goto)
+        report = [0] * len(goto)
+        queue = deque(goto[0].values())
+        for state in queue:
+            report[state] = state if output[state] >= 0 else 0
+        while queue:
+            state = queue.popleft()
+            for token, child in goto[state].items():
+                suffix = fail[state]
+                while suffix and token not in goto[suffix]:
+                    suffix = fail[suffix]
+                fail[child] = goto[suffix].get(token, 0)
+                report[child] = child if output[child] >= 0 else report[fail[child]]
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._report = report
+        self._output = output
+        self._depth = depth
+        self._max_words = max(depth)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __reduce__(self):
+        # Pickled as its terms: a worker process compiles (and caches) its own copy
+        return compile_glossary, (self.terms,)
+
+    def find(self, text: str, start: int = 0,
+             end: Optional[int] = None) -> List[Tuple[int, int, int]]:
+        """
+        Find every glossary term in text[start:end] in one pass
+
+        Overlapping matches are all reported, so "glutamate dehydrogenase"
+        also yields "dehydrogenase" when both are terms.
+
+        Returns:
+            (start, end, term index) of each match, with offsets into ``text``,
+            ordered by where the matches end
+        """
+        words = self._words
+        goto, fail, report = self._goto, self._fail, self._report
+        output, depth = self._output, self._depth
+        # Start offsets of the last few words, enough for the longest term
+        size = self._max_words or 1
+        starts = [0] * size
+        count = 0
+        state = 0
+        matches: List[Tuple[int, int, int]] = []
+        for match in _WORD.finditer(text, start, len(text) if end is None else end):
+            token = words.get(match.group().lower())
+            if token is None:
+                state = 0  # No term contains this word
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            starts[count % size] = match.start()
+            count += 1
+            found = report[state]
+            while found:
+                matches.append((starts[(count - depth[found]) % size], match.end(), output[found]))
+                found = report[fail[found]]
+        return matches
+
+    def find_terms(self, text: str, start: int = 0,
+                   end: Optional[int] = None) -> Dict[str, List[List[int]]]:
+        """Return the terms found in text[start:end], each with its [start, end] spans"""
+        terms = self.terms
+        found: Dict[str, List[List[int]]] = {}
+        for match_start, match_end, index in self.find(text, start, end):
+            found.setdefault(terms[index], []).append([match_start, match_end])
+        return found
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _compile(terms: Tuple[str, ...]) -> Glossary:
+    return Glossary(terms)
+
+
+def compile_glossary(terms: Union[Glossary, Iterable[str]]) -> Glossary:
+    """Return the compiled glossary for a term list, reusing a cached one when possible"""
+    if isinstance(terms, Glossary):
+        return terms
+    return _compile(tuple(terms))
+
+
+def load_glossary(file_path: str, encoding: str = 'utf-8') -> Glossary:
+    """
+    Load a glossary file with one term per line
+
+    Blank lines and lines starting with '#' are skipped.
+    """
+    with open(file_path, 'r', encoding=encoding) as f:
+        terms = [line.strip() for line in f]
+    return compile_glossary(term for term in terms if term and not term.startswith('#'))
+
+
+def _label_span(text: str, line_start: int, end: int, grammar: QuestionGrammar,
+                numbered: bool) -> Optional[Tuple[int, int]]:
+    """
+    Offsets of the option label (or, if ``numbered``, the question number)
+    starting the line at ``line_start``, or None if the line has neither
+
+    The span runs from the label to the line's text, so it covers "1. " or
+    "(a) " whole.
+    """
+    line_end = text.find('\n', line_start, end)
+    line = text[line_start:end if line_end < 0 else line_end]
+    stripped = line.strip()
+    match = grammar.option_pattern.match(stripped)
+    if match is None and numbered and grammar.number_pattern is not None:
+        match = grammar.number_pattern.match(stripped)
+    if match is None:
+        return None
+    label_start = line_start + len(line) - len(line.lstrip())
+    return label_start, label_start + match.start(2)
+
+
+def tag_questions(text: str, questions: List[Dict[str, Any]],
+                  glossary: Union[Glossary, Iterable[str]],
+                  grammar: Optional[Union[str, QuestionGrammar]] = None) -> Dict[str, int]:
+    """
+    Set each question's 'terms' to the glossary terms it mentions
+
+    Each question's span of the text (stem and options) is scanned, and
+    'terms' maps every term found to its [start, end] offsets in ``text``.
+    Question numbers and option labels are not part of the question's
+    wording, so matches touching them are skipped: a term "C" is found in
+    "written in C?" but not in the label of option "C. Java".
+
+    Args:
+        text: The text the questions were extracted from
+        questions: Question dictionaries, updated in place
+        glossary: The glossary, or its terms
+        grammar: Question format used to find the labels (a QuestionGrammar
+            or its name); detected from the text if not given
+
+    Returns:
+        The number of questions mentioning each term, most common first
+    """
+    glossary = compile_glossary(glossary)
+    grammar = detect_grammar(text) if grammar is None else get_grammar(grammar)
+    terms = glossary.terms
+    counts: Dict[str, int] = {}
+    for question in questions:
+        start, end = question['start_position'], question['end_position']
+        labels: Dict[int, Optional[Tuple[int, int]]] = {}  # By line start, read on demand
+        found: Dict[str, List[List[int]]] = {}
+        for match_start, match_end, index in glossary.find(text, start, end):
+            # Check the label of each line the match touches
+            line_start = max(start, text.rfind('\n', start, match_start) + 1)
+            while True:
+                if line_start not in labels:
+                    labels[line_start] = _label_span(text, line_start, end, grammar,
+                                                     numbered=line_start == start)
+                label = labels[line_start]
+                if label is not None and match_start < label[1] and match_end > label[0]:
+                    break
+                line_end = text.find('\n', line_start, match_end)
+                if line_end < 0:
+                    found.setdefault(terms[index], []).append([match_start, match_end])
+                    break
+                line_start = line_end + 1
+        question['terms'] = found
+        for term in found:
+            counts[term] = counts.get(term, 0) + 1
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+
+def extract_questions_with_glossary(text: str, context: Optional[ProcessingContext] = None,
+                                    grammar: Optional[Union[str, QuestionGrammar]] = None,
+                                    max_workers: Optional[int] = None, *,
+                                    glossary: Union[Glossary, Iterable[str]],
+                                    extract: Callable[..., Dict[str, Any]] = extract_multiple_choice_questions
+                                    ) -> Dict[str, Any]:
+    """
+    Extract multiple-choice questions and tag them with glossary terms
+
+    Returns the fields of ``extract`` (``extract_multiple_choice_questions``
+    by default; pass ``answers.extract_questions_with_answers`` to join
+    answer keys as well) with each question's 'terms' filled in, plus
+    'glossary_term_counts' (questions mentioning each term) and
+    'tagged_question_count'.
+    """
+    data = extract(text, context, grammar, max_workers)
+    questions = data['multiple_choice_questions']
+    counts = tag_questions(text, questions, glossary, grammar)
+
+    data['glossary_term_counts'] = counts
+    data['tagged_question_count'] = sum(1 for question in questions if question['terms'])
+    return data
+
+
+def glossary_processor(terms: Union[Glossary, Iterable[str]],
+                       extract: Callable[..., Dict[str, Any]] = extract_multiple_choice_questions
+                       ) -> Callable[..., Dict[str, Any]]:
+    """
+    Return a processor extracting questions tagged with a glossary's terms
+
+    The glossary is compiled here, once; the processor can be added to any
+    number of transformers and is picklable for process-pool batches.
+    """
+    processor = functools.partial(extract_questions_with_glossary,
+                                  glossary=compile_glossary(terms), extract=extract)
+    return functools.update_wrapper(processor, extract_questions_with_glossary)
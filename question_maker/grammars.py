@@ -0,0 +1,161 @@
+"""
+Question formats recognized by the multiple-choice parser
+
+Each grammar is a precompiled option-line pattern, optionally combined with a
+question-numbering pattern. ``detect_grammar`` picks one from a fixed-size
+sample at the start of a document, so the full text is parsed with a single
+grammar instead of trying every pattern on every line.
+"""
+
+import re
+from dataclasses import dataclass, replace
+from typing import Optional, Pattern, Tuple, Union
+
+
+# Characters sampled from the start of a document to detect its format
+DETECT_SAMPLE_CHARS = 8192
+
+# "1. Stem", "2) Stem", "Q3: Stem", "Question 4. Stem"
+NUMBER_PATTERN = re.compile(r'^(?:Q(?:uestion)?\s*)?(\d+)\s*[.):]\s+(.+)$', re.IGNORECASE)
+
+# A per-question answer line: "Answer: D", "Ans. b", "Correct answer: (d)"
+ANSWER_LINE_PATTERN = re.compile(r'^(?:correct[ \t]+)?(?:answer|ans)[ \t]*[:.\-][ \t]*'
+                                 r'\(?(?P<answer>[A-Za-z])\)?$', re.IGNORECASE)
+# First characters of an answer line, to skip the regex for most lines
+ANSWER_LINE_INITIALS = frozenset('AaCc')
+
+# The header of an answer-key block: "Answers:", "Answer key -", "Key:"
+ANSWER_KEY_HEADER_PATTERN = re.compile(r'(?:answer[ \t]*key|answers|key)[ \t]*[:\-]', re.IGNORECASE)
+# First characters of an answer-key header
+ANSWER_KEY_INITIALS = frozenset('AaKk')
+# Lines of an answer-key block: numbered pairs ("1-B 2-C", "1. b, 2. c"),
+# or letters in question order ("B C A")
+_KEY_PAIR = r'\d+[ \t]*[-.:)=]?[ \t]*[A-Za-z](?![A-Za-z])'
+ANSWER_KEY_PAIRS_PATTERN = re.compile(rf'[ \t]*(?:{_KEY_PAIR}[ \t,;]*)+$')
+ANSWER_KEY_LETTERS_PATTERN = re.compile(r'[ \t]*(?:[A-Za-z](?![A-Za-z])[ \t,;]*)+$')
+
+# Non-option lines allowed between consecutive options (wrapped option text)
+_MAX_OPTION_GAP = 3
+
+
+@dataclass(frozen=True)
+class QuestionGrammar:
+    """
+    A question format: how option lines and question numbers look
+
+    Attributes:
+        name: Format name, e.g. 'letter_dot' or 'letter_dot+numbered'
+        option_pattern: Matches an option line; groups are (label, text)
+        number_pattern: Matches a numbered question line; groups are
+            (number, stem). None if questions are not numbered
+    """
+    name: str
+    option_pattern: Pattern
+    number_pattern: Optional[Pattern] = None
+
+    def numbered(self) -> 'QuestionGrammar':
+        """Return this grammar with question numbering"""
+        if self.number_pattern is not None:
+            return self
+        return replace(self, name=f"{self.name}+numbered", number_pattern=NUMBER_PATTERN)
+
+
+# Built-in option styles, in order of preference when detection ties
+GRAMMARS: Tuple[QuestionGrammar, ...] = (
+    QuestionGrammar('letter', re.compile(r'^([A-Z])\s+(.+)$')),             # A Option
+    QuestionGrammar('letter_dot', re.compile(r'^([A-Z])\.\s+(.+)$')),       # A. Option
+    QuestionGrammar('letter_paren', re.compile(r'^([A-Z])\)\s+(.+)$')),     # A) Option
+    QuestionGrammar('enclosed', re.compile(r'^\(([A-Za-z])\)\s+(.+)$')),    # (a) Option
+    QuestionGrammar('lower', re.compile(r'^([a-z])[.)]\s+(.+)$')),          # a. Option, a) Option
+)
+
+DEFAULT_GRAMMAR = GRAMMARS[0]
+
+
+def get_grammar(grammar: Union[str, QuestionGrammar]) -> QuestionGrammar:
+    """
+    Resolve a grammar name such as 'letter_paren' or 'lower+numbered'
+
+    Raises:
+        ValueError: If the name is not a built-in grammar
+    """
+    if isinstance(grammar, QuestionGrammar):
+        return grammar
+    base, _, suffix = grammar.partition('+')
+    for candidate in GRAMMARS:
+        if candidate.name == base and suffix in ('', 'numbered'):
+            return candidate.numbered() if suffix else candidate
+    raise ValueError(f"Unknown question format: {grammar}")
+
+
+def _sample_lines(text: str, sample_size: int) -> list:
+    sample = text[:sample_size]
+    if len(text) > sample_size and '\n' in sample:
+        sample = sample[:sample.rindex('\n')]  # Drop the partial last line
+    return [line.strip() for line in sample.split('\n') if line.strip()]
+
+
+def _sequence_score(grammar: QuestionGrammar, lines: list) -> int:
+    """Count option lines following one another with consecutive labels (A then B, ...)"""
+    match = grammar.option_pattern.match
+    score = 0
+    previous = None
+    gap = 0
+    for line in lines:
+        option = match(line)
+        if option is None:
+            gap += 1
+            if gap > _MAX_OPTION_GAP:
+                previous = None
+            continue
+        label = option.group(1).upper()
+        if previous is not None and ord(label) == ord(previous) + 1:
+            score += 1
+        previous = label
+        gap = 0
+    return score
+
+
+def detect_grammar(text: str, sample_size: int = DETECT_SAMPLE_CHARS) -> QuestionGrammar:
+    """
+    Detect a document's question format from its first ``sample_size`` characters
+
+    Option styles are scored by how many option lines in the sample follow
+    one another with consecutive labels (allowing a few wrapped lines in
+    between), which ordinary prose rarely does.
+    Questions are treated as numbered if at least half of the stems (the
+    first of the lines before an 'A' option) carry a number.
+
+    Args:
+        text: The document
+        sample_size: Characters to sample; detection cost does not depend
+            on the document's length
+
+    Returns:
+        The best matching grammar, or DEFAULT_GRAMMAR if none matches
+    """
+    lines = _sample_lines(text, sample_size)
+
+    best, best_score = DEFAULT_GRAMMAR, 0
+    for grammar in GRAMMARS:
+        score = _sequence_score(grammar, lines)
+        if score > best_score:
+            best, best_score = grammar, score
+
+    stems = numbered = 0
+    match = best.option_pattern.match
+    stem_start = None  # First line of the current run of non-option lines
+    for line in lines:
+        option = match(line)
+        if option is None:
+            if stem_start is None and not ANSWER_LINE_PATTERN.match(line):
+                stem_start = line
+            continue
+        if option.group(1).upper() == 'A' and stem_start is not None:
+            stems += 1
+            if NUMBER_PATTERN.match(stem_start):
+                numbered += 1
+        stem_start = None
+    if numbered and numbered * 2 >= stems:
+        return best.numbered()
+    return best
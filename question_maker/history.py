@@ -0,0 +1,270 @@
+"""
+Session history of results with a memory budget
+
+Recent results stay in memory. When their estimated size exceeds the budget,
+the least recently used are written to gzip-compressed JSON files and dropped
+from memory, then reloaded from disk when they are selected again.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .data_models import StructuredData
+from .exporters import BackgroundExporter, JSONExporter, stream_result
+
+
+# Rough per-object overheads used to estimate a result's in-memory size
+_QUESTION_OVERHEAD = 600
+_OPTION_OVERHEAD = 120
+_ITEM_OVERHEAD = 60
+
+
+def estimate_size(result: StructuredData) -> int:
+    """Estimate the memory held by a result in bytes (content, questions, text lists)"""
+    size = len(result.content or '')
+    for key, value in result.extracted_data.items():
+        if key == 'multiple_choice_questions':
+            for question in value:
+                size += _QUESTION_OVERHEAD + len(question.get('question', ''))
+                for option in question.get('options', {}).values():
+                    size += _OPTION_OVERHEAD + len(option)
+        elif isinstance(value, list):
+            size += sum(_ITEM_OVERHEAD + len(item) if isinstance(item, str) else _ITEM_OVERHEAD
+                        for item in value)
+    return size
+
+
+@dataclass
+class HistoryEntry:
+    """
+    One result in a ResultHistory
+
+    Attributes:
+        entry_id: Identifier, increasing with each added result
+        source: The result's source
+        timestamp: The result's extraction time
+        question_count: Number of extracted questions
+        size: Estimated in-memory size in bytes
+        path: Spill file, once the result has been written to disk
+    """
+    entry_id: int
+    source: str
+    timestamp: str
+    question_count: int
+    size: int
+    path: Optional[Path] = None
+    result: Optional[StructuredData] = field(default=None, repr=False)
+    last_used: int = field(default=0, repr=False)
+    releasing: bool = field(default=False, repr=False)
+
+    @property
+    def in_memory(self) -> bool:
+        """True while the result is held in memory (and not being released)"""
+        return self.result is not None and not self.releasing
+
+
+class ResultHistory:
+    """
+    Bounded history of results that spills older entries to disk
+
+    The most recently used result always stays in memory; others are spilled
+    least recently used first once the total estimated size exceeds
+    ``memory_budget``. Results are treated as immutable once added, so an
+    entry is written at most once and later evictions just drop it.
+    """
+
+    def __init__(self, memory_budget: int = 256 * 2**20, max_entries: int = 50,
+                 directory: Optional[Union[str, Path]] = None, background: bool = False):
+        """
+        Args:
+            memory_budget: Estimated bytes of results to keep in memory
+            max_entries: Entries kept at all; the oldest are discarded beyond this
+            directory: Where spilled results are written (defaults to a
+                temporary directory removed by ``close``)
+            background: Write spill files on a background thread, so adding
+                a result never waits on disk I/O
+        """
+        self.memory_budget = memory_budget
+        self.max_entries = max_entries
+        self._owns_directory = directory is None
+        self.directory = Path(directory if directory is not None
+                              else tempfile.mkdtemp(prefix='question_maker_history_'))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writer = BackgroundExporter() if background else None
+        self._entries: Dict[int, HistoryEntry] = {}
+        self._lock = threading.RLock()
+        self._next_id = 1
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> 'ResultHistory':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _touch(self, entry: HistoryEntry) -> None:
+        self._clock += 1
+        entry.last_used = self._clock
+
+    def add(self, result: StructuredData, replaces: Optional[int] = None) -> HistoryEntry:
+        """
+        Add a result as the most recent entry
+
+        Args:
+            result: The result to keep
+            replaces: Id of an entry to remove (e.g. an earlier version of
+                the same watched file)
+        """
+        with self._lock:
+            if replaces is not None:
+                self.remove(replaces)
+            entry = HistoryEntry(
+                entry_id=self._next_id,
+                source=result.source,
+                timestamp=result.timestamp,
+                question_count=len(result.get_field('multiple_choice_questions', [])),
+                size=estimate_size(result),
+                result=result,
+            )
+            self._next_id += 1
+            self._touch(entry)
+            self._entries[entry.entry_id] = entry
+
+            while len(self._entries) > self.max_entries:
+                self.remove(min(self._entries))
+            self._enforce_budget()
+            return entry
+
+    def get(self, entry_id: int) -> StructuredData:
+        """
+        Return an entry's result, reloading it from disk if it was spilled
+
+        Raises:
+            KeyError: If there is no such entry
+        """
+        with self._lock:
+            entry = self._entries[entry_id]
+            self._touch(entry)
+            if entry.result is not None:
+                entry.releasing = False
+                return entry.result
+            path = entry.path
+
+        result = load_spilled(path)
+        with self._lock:
+            if entry.result is None:
+                entry.result = result
+            self._enforce_budget()
+            return entry.result
+
+    def entries(self) -> List[HistoryEntry]:
+        """Return the entries, newest first"""
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda entry: -entry.entry_id)
+
+    def memory_used(self) -> int:
+        """Estimated bytes of results held in memory"""
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values() if entry.in_memory)
+
+    def remove(self, entry_id: int) -> None:
+        """Remove an entry and its spill file"""
+        with self._lock:
+            entry = self._entries.pop(entry_id, None)
+            if entry is None:
+                return
+            entry.result = None
+            path, entry.path = entry.path, None
+        if path is not None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _enforce_budget(self) -> None:
+        """Spill least recently used entries until memory fits the budget"""
+        candidates = sorted((entry for entry in self._entries.values() if entry.in_memory),
+                            key=lambda entry: entry.last_used)
+        used = sum(entry.size for entry in candidates)
+        # Never spill the most recently used entry
+        for entry in candidates[:-1]:
+            if used <= self.memory_budget:
+                break
+            used -= entry.size
+            self._spill(entry)
+
+    def _spill(self, entry: HistoryEntry) -> None:
+        if entry.path is not None:
+            entry.result = None  # Already on disk; results never change
+            return
+
+        entry.releasing = True
+        if self._writer is None:
+            self._write_spill(entry)
+        else:
+            self._writer.submit(entry.entry_id, lambda: self._write_spill(entry))
+
+    def _write_spill(self, entry: HistoryEntry) -> Dict[str, Path]:
+        with self._lock:
+            result = entry.result
+            if result is None or not entry.releasing:
+                return {}
+        path = self.directory / f"result_{entry.entry_id}.json.gz"
+        write_spilled(result, path)
+        with self._lock:
+            if entry.entry_id not in self._entries:
+                os.remove(path)  # Removed while being written
+                return {}
+            entry.path = path
+            # A get() while writing keeps the result in memory
+            if entry.releasing:
+                entry.result = None
+                entry.releasing = False
+        return {'json': path}
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background spill writes to finish"""
+        return self._writer.wait(timeout) if self._writer is not None else True
+
+    def close(self) -> None:
+        """Drop all entries and delete the spill directory if it was created here"""
+        if self._writer is not None:
+            self._writer.close()
+        with self._lock:
+            for entry_id in list(self._entries):
+                self.remove(entry_id)
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def write_spilled(result: StructuredData, path: Union[str, Path]) -> None:
+    """Write a result as compact gzip-compressed JSON, atomically"""
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.{os.urandom(6).hex()}.tmp")
+    try:
+        # Level 1: spill files are short-lived, so favour speed over size
+        with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=1) as stream:
+            stream_result(result, [JSONExporter(stream, indent=None)])
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_spilled(path: Union[str, Path]) -> StructuredData:
+    """Load a result written by ``write_spilled``"""
+    with gzip.open(path, 'rt', encoding='utf-8') as stream:
+        return StructuredData.from_dict(json.load(stream))
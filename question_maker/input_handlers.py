@@ -3,16 +3,31 @@ Input handlers for various text sources
 """
 
 import os
+import threading
+import weakref
+from collections import OrderedDict
 from typing import Optional
 from pathlib import Path
-import requests
+
+from .progress import ProcessingContext
+
+
+# Characters (files) or bytes (URLs) read between progress reports and
+# cancellation checks
+READ_CHUNK_SIZE = 1 << 20
+URL_CHUNK_SIZE = 1 << 16
 
 
 class TextSource:
     """Base class for text sources"""
     
-    def read(self) -> str:
-        """Read and return text content"""
+    def read(self, context: Optional[ProcessingContext] = None) -> str:
+        """
+        Read and return text content
+        
+        Args:
+            context: Optional context that receives read progress
+        """
         raise NotImplementedError("Subclasses must implement read()")
     
     def get_source_info(self) -> str:
@@ -30,10 +45,21 @@ class FileSource(TextSource):
         if not self.file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
     
-    def read(self) -> str:
-        """Read text from file"""
+    def read(self, context: Optional[ProcessingContext] = None) -> str:
+        """Read text from file, in chunks when a context is given"""
         with open(self.file_path, 'r', encoding=self.encoding) as f:
-            return f.read()
+            if context is None:
+                return f.read()
+            
+            context.set_stage('reading', os.fstat(f.fileno()).st_size)
+            chunks = []
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                context.report_progress(f.buffer.tell())
+            return ''.join(chunks)
     
     def get_source_info(self) -> str:
         """Return file path as source info"""
@@ -47,12 +73,27 @@ class URLSource(TextSource):
         self.url = url
         self.timeout = timeout
     
-    def read(self) -> str:
-        """Fetch text from URL"""
+    def read(self, context: Optional[ProcessingContext] = None) -> str:
+        """Fetch text from URL, streaming the body when a context is given"""
+        # Imported here so string and file users never load the HTTP stack
+        import requests
+        
         try:
-            response = requests.get(self.url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.text
+            if context is None:
+                response = requests.get(self.url, timeout=self.timeout)
+                response.raise_for_status()
+                return response.text
+            
+            with requests.get(self.url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                context.set_stage('downloading', int(response.headers.get('Content-Length') or 0))
+                chunks = []
+                received = 0
+                for chunk in response.iter_content(URL_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    context.report_progress(received)
+                return str(b''.join(chunks), response.encoding or 'utf-8', errors='replace')
         except requests.RequestException as e:
             raise ValueError(f"Failed to fetch URL {self.url}: {str(e)}")
     
@@ -67,7 +108,7 @@ class StringSource(TextSource):
     def __init__(self, text: str):
         self.text = text
     
-    def read(self) -> str:
+    def read(self, context: Optional[ProcessingContext] = None) -> str:
         """Return the string content"""
         return self.text
     
@@ -93,3 +134,128 @@ def create_source(input_data: str, source_type: Optional[str] = None) -> TextSou
         return URLSource(input_data)
     else:
         return StringSource(input_data)
+
+
+CACHE_LOCATOR_PREFIX = 'cache:'
+
+
+class ContentCache:
+    """
+    Keyed store for text that has no file or URL to reload it from
+
+    Without a directory, text is kept in memory up to ``memory_budget``
+    characters; beyond that the least recently used texts are moved to a
+    temporary directory (removed with the cache) and read back from there.
+    With ``directory``, every text is written there as one file per key.
+    Either way results can drop their content and still reload it later by
+    'cache:<key>' locator.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, memory_budget: int = 64 * 2**20):
+        self.directory = Path(directory) if directory else None
+        self.memory_budget = memory_budget
+        self._texts: 'OrderedDict[str, str]' = OrderedDict()  # Least recently used first
+        self._memory_used = 0
+        self._spill_directory: Optional[Path] = None
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+    
+    @property
+    def memory_used(self) -> int:
+        """Characters of text held in memory"""
+        return self._memory_used
+    
+    def put(self, key: str, text: str) -> str:
+        """Store text under a key and return its locator"""
+        if self.directory is None:
+            with self._lock:
+                if key in self._texts:
+                    self._texts.move_to_end(key)
+                else:
+                    self._texts[key] = text
+                    self._memory_used += len(text)
+                    self._enforce_budget()
+        else:
+            path = self.directory / f"{key}.txt"
+            if not path.exists():
+                path.write_text(text, encoding='utf-8')
+        return CACHE_LOCATOR_PREFIX + key
+    
+    def get(self, key: str) -> str:
+        """Return the text stored under a key"""
+        if self.directory is None:
+            with self._lock:
+                text = self._texts.get(key)
+                if text is not None:
+                    self._texts.move_to_end(key)
+                    return text
+            directory = self._spill_directory
+        else:
+            directory = self.directory
+        path = directory / f"{key}.txt" if directory is not None else None
+        if path is None or not path.exists():
+            raise KeyError(f"Content not in cache: {key}")
+        return path.read_text(encoding='utf-8')
+    
+    def discard(self, key: str) -> None:
+        """Remove the text stored under a key, if present"""
+        with self._lock:
+            text = self._texts.pop(key, None)
+            if text is not None:
+                self._memory_used -= len(text)
+        for directory in (self.directory, self._spill_directory):
+            if directory is not None:
+                (directory / f"{key}.txt").unlink(missing_ok=True)
+    
+    def _enforce_budget(self) -> None:
+        """Move least recently used texts to disk until memory fits the budget (lock held)"""
+        # The newest text always stays, even if it alone exceeds the budget
+        while self._memory_used > self.memory_budget and len(self._texts) > 1:
+            key, text = self._texts.popitem(last=False)
+            self._memory_used -= len(text)
+            if self._spill_directory is None:
+                # Imported here: only needed once memory overflows
+                import shutil
+                import tempfile
+                self._spill_directory = Path(tempfile.mkdtemp(prefix='question_maker_content_'))
+                weakref.finalize(self, shutil.rmtree, self._spill_directory, ignore_errors=True)
+            path = self._spill_directory / f"{key}.txt"
+            if not path.exists():
+                path.write_text(text, encoding='utf-8')
+
+
+default_content_cache = ContentCache()
+
+
+def get_locator(source: TextSource) -> Optional[str]:
+    """
+    Return a locator that can re-read a source's text, if it has one
+    
+    Files and URLs are their own locators; string sources have none and
+    must be put in a ContentCache instead.
+    """
+    if isinstance(source, FileSource):
+        return source.get_source_info()
+    if isinstance(source, URLSource):
+        return source.url
+    return None
+
+
+def resolve_locator(locator: str, cache: Optional[ContentCache] = None) -> str:
+    """
+    Read the text a locator points to
+    
+    Args:
+        locator: File path, URL, or 'cache:<key>'
+        cache: Cache for 'cache:' locators (defaults to the shared cache)
+    
+    Returns:
+        The text content
+    """
+    if locator.startswith(CACHE_LOCATOR_PREFIX):
+        cache = cache if cache is not None else default_content_cache
+        return cache.get(locator[len(CACHE_LOCATOR_PREFIX):])
+    if locator.startswith(('http://', 'https://')):
+        return URLSource(locator).read()
+    return FileSource(locator).read()
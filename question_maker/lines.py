@@ -0,0 +1,165 @@
+"""
+Line-offset index for mapping character offsets to lines and columns
+
+A ``LineIndex`` holds the offset at which each line of a text starts, built
+once per document (vectorized with NumPy for large texts when it is
+installed; NumPy is only imported then, not with the package). Offsets are
+converted to (line, column) and back by binary search, so lookups cost
+O(log lines) however large the document is.
+
+Lines are numbered from 1 and columns from 0, as in Tk text indexes.
+"""
+
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Characters scanned per NumPy batch (a non-ASCII batch takes 4 bytes per character)
+_SCAN_CHUNK_CHARS = 1 << 22
+# Smaller texts are scanned with a regex (about 0.1 ms), so indexing them
+# never pays the ~90 ms it takes to import NumPy
+_NUMPY_MIN_CHARS = 1 << 14
+
+# The numpy module once _numpy() has imported it, or False if it is missing
+_np = None
+
+_NEWLINE = re.compile('\n')
+
+
+def _numpy():
+    """Import NumPy on first use; returns None if it is not installed"""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - exercised only without numpy
+            numpy = False
+        _np = numpy
+    return _np or None
+
+
+def _line_starts(text: str):
+    """Return the start offset of every line: 0, then the offset after each newline"""
+    np = _numpy() if len(text) >= _NUMPY_MIN_CHARS else None
+    if np is None:
+        starts = array('q', [0])
+        starts.extend(match.end() for match in _NEWLINE.finditer(text))
+        return starts
+
+    parts = [np.zeros(1, dtype=np.int64)]
+    for offset in range(0, len(text), _SCAN_CHUNK_CHARS):
+        chunk = text[offset:offset + _SCAN_CHUNK_CHARS]
+        if chunk.isascii():
+            codes = np.frombuffer(chunk.encode('ascii'), dtype=np.uint8)
+        else:
+            codes = np.frombuffer(chunk.encode('utf-32-le'), dtype='<u4')
+        parts.append(np.flatnonzero(codes == 10).astype(np.int64) + (offset + 1))
+    return np.concatenate(parts)
+
+
+class LineIndex:
+    """
+    Start offsets of a text's lines, for offset <-> (line, column) lookups
+
+    A text has one more line than it has newlines; the last line may be
+    empty. Only the offsets are kept, not the text.
+    """
+
+    def __init__(self, text: str):
+        # An array('q'), or a NumPy array for large texts
+        self.starts = _line_starts(text)
+        self.length = len(text)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line_of(self, offset: int) -> int:
+        """
+        Return the (1-based) line containing a character offset
+
+        Raises:
+            IndexError: If the offset is outside the text
+        """
+        if not 0 <= offset <= self.length:
+            raise IndexError(f"offset {offset} outside text of length {self.length}")
+        if isinstance(self.starts, array):
+            return bisect_right(self.starts, offset)
+        return int(_np.searchsorted(self.starts, offset, side='right'))
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Return the (line, column) of a character offset"""
+        line = self.line_of(offset)
+        return line, offset - int(self.starts[line - 1])
+
+    def positions(self, offsets: Iterable[int]) -> List[Tuple[int, int]]:
+        """Return the (line, column) of many offsets, in one vectorized search when possible"""
+        offsets = list(offsets)
+        if isinstance(self.starts, array):
+            return [self.position(offset) for offset in offsets]
+        values = _np.asarray(offsets, dtype=_np.int64)
+        if values.size and (values.min() < 0 or values.max() > self.length):
+            raise IndexError(f"offset outside text of length {self.length}")
+        lines = _np.searchsorted(self.starts, values, side='right')
+        columns = values - self.starts[lines - 1]
+        return list(zip(lines.tolist(), columns.tolist()))
+
+    def offset(self, line: int, column: int = 0) -> int:
+        """
+        Return the character offset of a (line, column) position
+
+        Raises:
+            IndexError: If the line does not exist or the column is past its end
+        """
+        start, end = self.line_span(line)
+        if not 0 <= column <= end - start:
+            raise IndexError(f"column {column} outside line {line}")
+        return start + column
+
+    def line_span(self, line: int) -> Tuple[int, int]:
+        """Return a line's (start, end) offsets, excluding its newline"""
+        if not 1 <= line <= len(self):
+            raise IndexError(f"line {line} outside 1-{len(self)}")
+        start = int(self.starts[line - 1])
+        end = int(self.starts[line]) - 1 if line < len(self) else self.length
+        return start, end
+
+
+class _SharedIndex:
+    """The line index shared by processors working on one text"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.index: Optional[LineIndex] = None
+
+
+_shared = threading.local()
+
+
+@contextmanager
+def share_line_index(text: str) -> Iterator[_SharedIndex]:
+    """
+    Let ``get_line_index`` calls for ``text`` in this block reuse one index
+
+    The text is only referenced while the block runs. The shared index (or
+    None if nothing asked for one) is available as ``.index`` on the yielded
+    object.
+    """
+    previous = getattr(_shared, 'current', None)
+    _shared.current = shared = _SharedIndex(text)
+    try:
+        yield shared
+    finally:
+        _shared.current = previous
+
+
+def get_line_index(text: str) -> LineIndex:
+    """Return a line index for text, reusing the one shared for it if any"""
+    shared = getattr(_shared, 'current', None)
+    if shared is None or shared.text is not text:
+        return LineIndex(text)
+    if shared.index is None:
+        shared.index = LineIndex(text)
+    return shared.index
@@ -0,0 +1,155 @@
+"""
+Loaders for exported JSON results
+
+``load_result`` rebuilds a whole StructuredData. ``iter_questions`` reads an
+export incrementally and yields its questions one at a time, so large
+files never have to be parsed into memory at once.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Any, Iterator, TextIO, Union
+
+from .data_models import StructuredData, MultipleChoiceQuestion, SCHEMA_VERSION
+
+
+QUESTIONS_KEY = 'multiple_choice_questions'
+_NON_WHITESPACE = re.compile(r'[^ \t\n\r]')
+_CHUNK_SIZE = 1 << 16
+
+
+def load_result(path: Union[str, Path]) -> StructuredData:
+    """Load a StructuredData from a JSON export file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return StructuredData.from_dict(json.load(f))
+
+
+class _IncrementalReader:
+    """
+    Walks a JSON document from a stream, decoding one value at a time
+
+    Values are decoded with ``json.JSONDecoder.raw_decode`` from a buffer
+    that is refilled from the stream when a value is incomplete.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = _CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, min_size: int) -> bool:
+        """Read at least min_size more characters; return False at end of stream"""
+        if self.eof:
+            return False
+        if self.pos > len(self.buffer) // 2:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        chunk = self.stream.read(max(min_size, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            match = _NON_WHITESPACE.search(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            if not self._fill(self.chunk_size):
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON document, found {found!r}")
+        self.pos += 1
+
+    def consume_if(self, char: str) -> bool:
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value that ends the buffer may be a truncated number
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow reads geometrically so long values are re-decoded O(log n) times
+            if not self._fill(read_size):
+                continue
+            read_size *= 2
+
+    def object_keys(self) -> Iterator[str]:
+        """Yield the keys of the object at the cursor, leaving it at each value"""
+        self.expect('{')
+        if self.consume_if('}'):
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.consume_if('}'):
+                return
+            self.expect(',')
+
+    def array_items(self) -> Iterator[Any]:
+        """Yield the decoded items of the array at the cursor"""
+        self.expect('[')
+        if self.consume_if(']'):
+            return
+        while True:
+            yield self.value()
+            if self.consume_if(']'):
+                return
+            self.expect(',')
+
+
+def iter_question_dicts(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the question dictionaries of a JSON export one at a time
+
+    Only the question list is decoded item by item; other values are decoded
+    and discarded as they are passed.
+
+    Raises:
+        ValueError: If the export uses a newer schema version or is malformed
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _IncrementalReader(f)
+        for key in reader.object_keys():
+            if key == 'schema_version':
+                version = reader.value()
+                if version > SCHEMA_VERSION:
+                    raise ValueError(f"Unsupported schema version {version} (newest supported: {SCHEMA_VERSION})")
+            elif key == 'extracted_data':
+                for data_key in reader.object_keys():
+                    if data_key == QUESTIONS_KEY:
+                        yield from reader.array_items()
+                    else:
+                        reader.value()
+            else:
+                reader.value()
+
+
+def iter_questions(path: Union[str, Path]) -> Iterator[MultipleChoiceQuestion]:
+    """Yield the questions of a JSON export as MultipleChoiceQuestion objects"""
+    for data in iter_question_dicts(path):
+        yield MultipleChoiceQuestion.from_dict(data)
@@ -0,0 +1,98 @@
+"""
+Progress reporting and cooperative cancellation for long-running transformations
+"""
+
+import threading
+from typing import Dict, Any, Callable, Optional
+
+
+# (stage, done, total) - total is 0 when the size is unknown
+ProgressCallback = Callable[[str, int, int], None]
+QuestionCallback = Callable[[Dict[str, Any]], None]
+
+
+class OperationCancelled(Exception):
+    """Raised when a transformation is stopped through its CancellationToken"""
+
+
+class CancellationToken:
+    """
+    Thread-safe flag used to ask a running transformation to stop
+
+    Work checks the token at chunk and question boundaries and raises
+    OperationCancelled once it is set. A ``multiprocessing`` event may be
+    given instead of the default thread event so that worker processes can
+    see the cancellation.
+    """
+
+    def __init__(self, event=None):
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation"""
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        """Return True once cancellation has been requested"""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelled if cancellation has been requested"""
+        if self._event.is_set():
+            raise OperationCancelled("Operation cancelled")
+
+
+class ProcessingContext:
+    """
+    Carries callbacks from a caller into sources and processors
+
+    Sources report how much of the input has been read, and processors
+    that accept a ``context`` keyword report how far through the text they
+    are and hand over questions as soon as they are extracted. Progress
+    callbacks are throttled to roughly ``resolution`` calls per stage.
+
+    Every progress report and emitted question is also a cancellation
+    point: once ``cancel_token`` is cancelled they raise OperationCancelled.
+    """
+
+    def __init__(self, on_progress: Optional[ProgressCallback] = None,
+                 on_question: Optional[QuestionCallback] = None,
+                 resolution: int = 200,
+                 cancel_token: Optional[CancellationToken] = None):
+        self.on_progress = on_progress
+        self.on_question = on_question
+        self.resolution = resolution
+        self.cancel_token = cancel_token
+        self.stage = ''
+        self.total = 0
+        self.done = 0
+        self._next_report = 0
+
+    def set_stage(self, stage: str, total: int) -> None:
+        """Start a new stage of work with a known (or 0 for unknown) total"""
+        self.stage = stage
+        self.total = total
+        self.done = 0
+        self._next_report = 0
+        self.report_progress(0)
+
+    def check_cancelled(self) -> None:
+        """Raise OperationCancelled if the operation has been cancelled"""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    def report_progress(self, done: int) -> None:
+        """Report the amount of work done so far in the current stage"""
+        self.check_cancelled()
+        self.done = done
+        if self.on_progress is None:
+            return
+        if done >= self._next_report or (self.total and done >= self.total):
+            self._next_report = done + max(1, self.total // self.resolution)
+            self.on_progress(self.stage, done, self.total)
+
+    def emit_question(self, question: Dict[str, Any]) -> None:
+        """Hand an extracted question dictionary to the caller"""
+        self.check_cancelled()
+        if self.on_question is not None:
+            self.on_question(question)
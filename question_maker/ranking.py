@@ -0,0 +1,328 @@
+"""
+BM25-ranked keyword search over extracted questions
+
+``QuestionIndex`` keeps an inverted index whose postings (document ids and
+term frequencies) are NumPy arrays in CSR form. Questions are buffered as
+they are added and flushed into index segments, which later flushes merge
+so that their number stays logarithmic. Queries score
+the most selective terms over their full postings and, once the best
+``k`` scores are out of reach of the remaining terms, only look those terms
+up for the candidates still in contention (MaxScore pruning).
+
+An index can be saved as ``.npy`` files and memory-mapped back, so a large
+index opens without reading its postings into memory.
+
+Requires NumPy (``pip install -e ".[analysis]"``).
+"""
+
+import json
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Hashable, Iterable, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .data_models import StructuredData, MultipleChoiceQuestion
+from .search import _question_text, tokenize
+
+
+# Questions buffered before they are flushed into a segment
+_FLUSH_QUESTIONS = 50000
+
+# Relative slack on pruning decisions, covering float32 score rounding
+_PRUNE_SLACK = 1e-4
+
+# Candidates are binary-searched in a posting list this many times longer;
+# against shorter lists a dense mask over all documents is cheaper
+_LOOKUP_RATIO = 16
+
+_META_FILE = 'index.json'
+_ARRAYS = ('offsets', 'doc_ids', 'tfs', 'max_tf', 'min_length')
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Ranked search requires numpy: pip install numpy")
+
+
+@dataclass
+class _Segment:
+    """
+    Postings of a run of documents in CSR form
+
+    Term t's postings are doc_ids[offsets[t]:offsets[t + 1]] (ascending) and
+    the matching tfs. Terms added to the vocabulary after the segment was
+    built (t >= len(offsets) - 1) have no postings in it. max_tf and
+    min_length bound each term's BM25 contribution.
+    """
+    offsets: 'np.ndarray'
+    doc_ids: 'np.ndarray'
+    tfs: 'np.ndarray'
+    max_tf: 'np.ndarray'
+    min_length: 'np.ndarray'
+
+    @property
+    def term_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def postings(self, term: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        if term >= self.term_count:
+            return self.doc_ids[:0], self.tfs[:0]
+        start, end = self.offsets[term], self.offsets[term + 1]
+        return self.doc_ids[start:end], self.tfs[start:end]
+
+
+def _build_segment(terms: 'np.ndarray', doc_ids: 'np.ndarray', tfs: 'np.ndarray',
+                   lengths: 'np.ndarray', term_count: int) -> _Segment:
+    """Group (term, doc, tf) triples by term; docs must already be ascending within each term"""
+    order = np.argsort(terms, kind='stable')
+    terms, doc_ids, tfs = terms[order], doc_ids[order], tfs[order]
+    offsets = np.zeros(term_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(terms, minlength=term_count), out=offsets[1:])
+
+    max_tf = np.zeros(term_count, dtype=tfs.dtype)
+    min_length = np.zeros(term_count, dtype=np.float32)
+    present = np.flatnonzero(np.diff(offsets))
+    if len(present):
+        starts = offsets[present]
+        max_tf[present] = np.maximum.reduceat(tfs, starts)
+        min_length[present] = np.minimum.reduceat(lengths[doc_ids], starts)
+    return _Segment(offsets, doc_ids, tfs, max_tf, min_length)
+
+
+def _merge_segments(older: _Segment, newer: _Segment, lengths: 'np.ndarray', term_count: int) -> _Segment:
+    """Merge two segments; the older one's documents come first in every posting list"""
+    def expand(segment: _Segment) -> 'np.ndarray':
+        return np.repeat(np.arange(segment.term_count, dtype=np.int64), np.diff(segment.offsets))
+
+    return _build_segment(np.concatenate((expand(older), expand(newer))),
+                          np.concatenate((older.doc_ids, newer.doc_ids)),
+                          np.concatenate((older.tfs, newer.tfs)),
+                          lengths, term_count)
+
+
+class QuestionIndex:
+    """
+    Incremental BM25 index over questions from many results
+
+    Questions are identified by keys: (source, question_number) for
+    ``add_result``, positions for ``add_questions``, or any key passed to
+    ``add`` (keys must be JSON-serializable for ``save``).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization (0 = none, 1 = full)
+        """
+        _require_numpy()
+        self.k1 = k1
+        self.b = b
+        self.keys: List[Hashable] = []
+        self.vocabulary: Dict[str, int] = {}
+        self._segments: List[_Segment] = []
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._pending_terms = array('q')
+        self._pending_docs = array('q')
+        self._pending_tfs = array('l')
+        self._pending_lengths = array('f')
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: Hashable, question: Union[Dict[str, Any], MultipleChoiceQuestion]) -> None:
+        """Add a question under a caller-chosen key"""
+        if isinstance(question, MultipleChoiceQuestion):
+            question = question.to_dict()
+        doc_id = len(self.keys)
+        self.keys.append(key)
+        vocabulary = self.vocabulary
+        counts = Counter(tokenize(_question_text(question)))
+        self._pending_terms.extend(vocabulary.setdefault(term, len(vocabulary)) for term in counts)
+        self._pending_tfs.extend(counts.values())
+        self._pending_docs.extend([doc_id] * len(counts))
+        self._pending_lengths.append(sum(counts.values()))
+        if len(self._pending_lengths) >= _FLUSH_QUESTIONS:
+            self.flush()
+
+    def add_questions(self, questions: Iterable[Union[Dict[str, Any], MultipleChoiceQuestion]]) -> None:
+        """Add questions keyed by their position in this index"""
+        for question in questions:
+            self.add(len(self.keys), question)
+
+    def add_result(self, result: StructuredData) -> None:
+        """Add a result's questions keyed by (source, question_number)"""
+        for question in result.get_field('multiple_choice_questions', []):
+            self.add((result.source, question.get('question_number')), question)
+
+    def add_results(self, results: Iterable[StructuredData]) -> None:
+        """Add the questions of several results"""
+        for result in results:
+            self.add_result(result)
+
+    def flush(self) -> None:
+        """Move buffered questions into a segment, merging segments of similar size"""
+        if not self._pending_lengths:
+            return
+        term_count = len(self.vocabulary)
+        self._lengths = np.concatenate((self._lengths, np.array(self._pending_lengths, dtype=np.float32)))
+        segment = _build_segment(np.array(self._pending_terms, dtype=np.int64),
+                                 np.array(self._pending_docs, dtype=np.int64),
+                                 np.array(self._pending_tfs, dtype=np.int32),
+                                 self._lengths, term_count)
+        self._pending_terms = array('q')
+        self._pending_docs = array('q')
+        self._pending_tfs = array('l')
+        self._pending_lengths = array('f')
+
+        segments = self._segments
+        segments.append(segment)
+        # Merge while the previous segment is not much larger, so the sizes
+        # roughly double towards older segments
+        while len(segments) > 1 and len(segments[-2].doc_ids) <= 2 * len(segments[-1].doc_ids):
+            newer = segments.pop()
+            segments[-1] = _merge_segments(segments[-1], newer, self._lengths, term_count)
+
+    def _compact(self) -> None:
+        """Flush and merge everything into a single segment"""
+        self.flush()
+        term_count = len(self.vocabulary)
+        while len(self._segments) > 1:
+            newer = self._segments.pop()
+            self._segments[-1] = _merge_segments(self._segments[-1], newer, self._lengths, term_count)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Hashable, float]]:
+        """
+        Return the k questions scoring highest for a query under BM25
+
+        Args:
+            query: Words to search for; unknown words are ignored
+            k: Number of results
+
+        Returns:
+            (key, score) pairs, best first; equal scores are listed in the
+            order the questions were added
+        """
+        self.flush()
+        documents = len(self.keys)
+        terms = [self.vocabulary[token] for token in dict.fromkeys(tokenize(query))
+                 if token in self.vocabulary]
+        if not terms or documents == 0 or k <= 0:
+            return []
+
+        k1, b = self.k1, self.b
+        average_length = max(float(self._lengths.mean()), 1e-9)
+        # BM25's k1 * (1 - b + b * length / average length) for every document
+        norm = (k1 * (1.0 - b)) + (k1 * b / average_length) * self._lengths
+
+        # Per-term IDF and an upper bound on its contribution to any document:
+        # the tf factor grows with tf and shrinks with length
+        plan = []
+        for term in terms:
+            df = 0
+            bound = 0.0
+            for segment in self._segments:
+                doc_ids, _ = segment.postings(term)
+                if len(doc_ids):
+                    df += len(doc_ids)
+                    max_tf = float(segment.max_tf[term])
+                    min_norm = k1 * (1.0 - b + b * float(segment.min_length[term]) / average_length)
+                    bound = max(bound, max_tf * (k1 + 1.0) / (max_tf + min_norm))
+            if df:
+                idf = float(np.log(1.0 + (documents - df + 0.5) / (df + 0.5)))
+                plan.append((idf * bound, idf, term))
+        if not plan:
+            return []
+        plan.sort(key=lambda item: -item[0])
+        remaining = [0.0] * (len(plan) + 1)  # Sum of bounds of plan[i:]
+        for i in range(len(plan) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + plan[i][0]
+
+        scores = np.zeros(documents, dtype=np.float32)
+        threshold = 0.0  # Lower bound on the k-th best score
+        candidates = None
+        for i, (_, idf, term) in enumerate(plan):
+            reach = remaining[i] * (1.0 + _PRUNE_SLACK)
+            if candidates is not None:
+                candidates = candidates[scores[candidates] >= threshold - reach]
+                alive = None
+            elif len(scores) > k and reach < threshold:
+                # Documents scoring below threshold - reach cannot reach the
+                # top k any more; the other terms are only looked up for the rest
+                candidates = np.flatnonzero(scores >= threshold - reach)
+                alive = None
+            for segment in self._segments:
+                doc_ids, tfs = segment.postings(term)
+                if not len(doc_ids):
+                    continue
+                if candidates is not None and len(candidates) * _LOOKUP_RATIO < len(doc_ids):
+                    found = np.searchsorted(doc_ids, candidates)
+                    found[found == len(doc_ids)] = 0
+                    hit = doc_ids[found] == candidates
+                    doc_ids, tfs = candidates[hit], tfs[found[hit]]
+                elif candidates is not None:
+                    if alive is None:
+                        alive = np.zeros(documents, dtype=bool)
+                        alive[candidates] = True
+                    keep = alive[doc_ids]
+                    doc_ids, tfs = doc_ids[keep], tfs[keep]
+                tf = tfs.astype(np.float32)
+                scores[doc_ids] += idf * tf * (k1 + 1.0) / (tf + norm[doc_ids])
+                if candidates is None and len(doc_ids) >= k and i + 1 < len(plan):
+                    term_scores = scores[doc_ids]
+                    threshold = max(threshold, float(np.partition(term_scores, len(term_scores) - k)[-k]))
+
+        pool = candidates if candidates is not None else np.flatnonzero(scores)
+        if len(pool) > k:
+            pool = pool[np.argpartition(-scores[pool], k - 1)[:k]]
+        pool = pool[np.lexsort((pool, -scores[pool]))]
+        return [(self.keys[doc], float(scores[doc])) for doc in pool.tolist() if scores[doc] > 0]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the index to a directory: postings as .npy files, keys and
+        vocabulary as JSON
+        """
+        self._compact()
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        segment = self._segments[0] if self._segments else _build_segment(
+            np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32),
+            self._lengths, len(self.vocabulary))
+        for name in _ARRAYS:
+            np.save(path / f"{name}.npy", getattr(segment, name))
+        np.save(path / "lengths.npy", self._lengths)
+        meta = {'k1': self.k1, 'b': self.b, 'vocabulary': list(self.vocabulary), 'keys': self.keys}
+        with open(path / _META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> 'QuestionIndex':
+        """
+        Open an index written by ``save``
+
+        Args:
+            path: The index directory
+            mmap: Memory-map the postings instead of reading them into
+                memory; questions added later go to new in-memory segments
+        """
+        _require_numpy()
+        path = Path(path)
+        with open(path / _META_FILE, encoding='utf-8') as f:
+            meta = json.load(f)
+        index = cls(k1=meta['k1'], b=meta['b'])
+        index.vocabulary = {term: term_id for term_id, term in enumerate(meta['vocabulary'])}
+        # JSON turns tuple keys such as (source, question_number) into lists
+        index.keys = [tuple(key) if isinstance(key, list) else key for key in meta['keys']]
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mode) for name in _ARRAYS}
+        index._lengths = np.load(path / "lengths.npy")
+        if len(arrays['doc_ids']):
+            index._segments = [_Segment(**arrays)]
+        return index
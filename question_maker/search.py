@@ -0,0 +1,160 @@
+"""
+Inverted token index for filtering extracted questions as the user types
+
+The index maps each lowercased word token of a question's stem and options to
+the sorted list of question positions that contain it. A query matches the
+questions that contain every query token, with the last token treated as a
+prefix so partially typed words already match.
+"""
+
+import bisect
+import re
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercased word tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _question_text(question: Dict[str, Any]) -> str:
+    options = question.get('options')
+    if options:
+        return ' '.join((question.get('question', ''), *options.values()))
+    return question.get('question', '')
+
+
+def _intersect(first: List[int], second: List[int]) -> List[int]:
+    """Intersect two sorted position lists"""
+    if len(first) > len(second):
+        first, second = second, first
+    if len(first) * 8 < len(second):
+        # Much shorter list: binary search into the longer one
+        result = []
+        low = 0
+        for position in first:
+            low = bisect.bisect_left(second, position, low)
+            if low == len(second):
+                break
+            if second[low] == position:
+                result.append(position)
+        return result
+    members = set(second)
+    return [position for position in first if position in members]
+
+
+class QuestionSearchIndex:
+    """
+    Inverted index over a list of question dictionaries
+
+    Build it once per result; questions appended to the result later (for
+    example while extraction is still streaming) are added with ``extend``.
+    Positions returned by ``search`` are indexes into that question list.
+    """
+
+    def __init__(self, questions: Optional[Iterable[Dict[str, Any]]] = None):
+        self.postings: Dict[str, List[int]] = {}
+        self.size = 0
+        self._sorted_terms: Optional[List[str]] = None
+        self._prefix_cache: Dict[str, List[int]] = {}
+        if questions is not None:
+            self.extend(questions)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def extend(self, questions: Iterable[Dict[str, Any]]) -> None:
+        """Index more questions, numbered after the ones already indexed"""
+        postings = self.postings
+        findall = _TOKEN_PATTERN.findall
+        terms_before = len(postings)
+        position = self.size
+        for question in questions:
+            for token in set(findall(_question_text(question).lower())):
+                posting = postings.get(token)
+                if posting is None:
+                    postings[token] = [position]
+                else:
+                    posting.append(position)
+            position += 1
+        self.size = position
+        new_terms = len(postings) != terms_before
+        if new_terms:
+            self._sorted_terms = None
+        self._prefix_cache.clear()
+
+    def _prefix_positions(self, prefix: str) -> List[int]:
+        """Return the sorted positions of questions with a token starting with prefix"""
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return cached
+
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = self._sorted_terms
+        start = bisect.bisect_left(terms, prefix)
+        end = bisect.bisect_left(terms, prefix + '\U0010ffff', start)
+        if end - start == 1:
+            positions = self.postings[terms[start]]
+        else:
+            # Mark positions in a flag array instead of merging many lists
+            flags = bytearray(self.size)
+            for term in terms[start:end]:
+                for position in self.postings[term]:
+                    flags[position] = 1
+            positions = [position for position, flag in enumerate(flags) if flag] if end > start else []
+        self._prefix_cache[prefix] = positions
+        return positions
+
+    def search(self, query: str) -> Optional[List[int]]:
+        """
+        Return the sorted positions of questions matching every query token
+
+        The last token matches as a prefix unless the query ends with
+        whitespace. An empty query returns None, meaning "no filter".
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+
+        complete = tokens if query[-1:].isspace() else tokens[:-1]
+        lists = []
+        for token in set(complete):
+            posting = self.postings.get(token)
+            if posting is None:
+                return []
+            lists.append(posting)
+        if len(complete) < len(tokens):
+            lists.append(self._prefix_positions(tokens[-1]))
+
+        lists.sort(key=len)
+        result = lists[0]
+        for posting in lists[1:]:
+            if not result:
+                break
+            result = _intersect(result, posting)
+        return list(result)
+
+
+def match_spans(text: str, query: str) -> List[Tuple[int, int]]:
+    """
+    Return the (start, end) spans of a text's words matched by a query
+
+    Uses the same rules as ``QuestionSearchIndex.search``: whole tokens, and
+    a prefix match for the last token of a query that is still being typed.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    prefix = None if query[-1:].isspace() else tokens[-1]
+    whole = set(tokens if prefix is None else tokens[:-1])
+
+    spans = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        word = match.group().lower()
+        if word in whole or (prefix is not None and word.startswith(prefix)):
+            spans.append(match.span())
+    return spans
@@ -0,0 +1,235 @@
+"""
+Offset-based text segmentation
+
+Segmenters return ``SegmentSpans``: (start, end) offsets into the original
+text kept in a flat integer array, so memory grows with the number of
+segments rather than with a second copy of the text. Segment strings and
+``TextSegment`` objects are only created when accessed.
+"""
+
+import re
+from array import array
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .data_models import TextSegment
+
+
+# Words that end with a period without ending the sentence (lowercase, no final period)
+ABBREVIATIONS = frozenset({
+    'e.g', 'i.e', 'cf', 'vs', 'viz', 'approx', 'ca', 'al', 'fig', 'figs',
+    'eq', 'no', 'nos', 'vol', 'pp', 'p', 'ch', 'sec', 'dept', 'mr', 'mrs', 'ms',
+    'dr', 'prof', 'st', 'jr', 'sr', 'inc', 'ltd', 'co', 'corp', 'mt', 'ft', 'u.s',
+})
+
+# Sentence-ending punctuation (with closing quotes or brackets) followed by
+# whitespace or the end of the text, or a blank line
+_SENTENCE_END = re.compile(r'[.!?]+["\'\)\]”’]*(?=\s|$)|\n[ \t]*\r?\n')
+_NON_SPACE = re.compile(r'\S')
+# A run of complete lines that are empty or hold only whitespace
+_BLANK_LINES = re.compile(r'(?:[^\S\n]*\n)+')
+# A newline followed by blank lines and the next line's indentation; starting
+# at the literal newline keeps the scan fast
+_PARAGRAPH_BREAK = re.compile(r'\n[^\S\n]*\n\s*')
+_LAST_WORD = re.compile(r'([^\s(\[\"\']+)$')
+
+# Characters before a period searched for the word it ends
+_WORD_WINDOW = 24
+
+
+class SegmentSpans:
+    """
+    Segments of a text stored as a flat array of (start, end) offsets
+
+    Indexing returns a ``TextSegment`` whose text is sliced on access;
+    ``span`` and ``spans`` give the offsets without creating any strings.
+    """
+
+    def __init__(self, text: str, category: Optional[str] = None):
+        self.text = text
+        self.category = category
+        self.offsets = array('q')
+
+    def __len__(self) -> int:
+        return len(self.offsets) // 2
+
+    def __getitem__(self, index: int) -> TextSegment:
+        start, end = self.span(index)
+        return TextSegment(text=self.text[start:end], start_position=start,
+                           end_position=end, category=self.category)
+
+    def __iter__(self) -> Iterator[TextSegment]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, start: int, end: int) -> None:
+        """Add a segment's offsets"""
+        self.offsets.append(start)
+        self.offsets.append(end)
+
+    def span(self, index: int) -> Tuple[int, int]:
+        """Return a segment's (start, end) offsets"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return self.offsets[2 * index], self.offsets[2 * index + 1]
+
+    def spans(self) -> Iterator[Tuple[int, int]]:
+        """Iterate over the (start, end) offsets"""
+        offsets = self.offsets
+        return zip(offsets[0::2], offsets[1::2])
+
+    def strings(self) -> Iterator[str]:
+        """Iterate over the segment texts, slicing each as it is reached"""
+        text = self.text
+        for start, end in self.spans():
+            yield text[start:end]
+
+    def to_list(self) -> List[List[int]]:
+        """Return the offsets as [start, end] pairs, for serialization"""
+        return [[start, end] for start, end in self.spans()]
+
+
+def _is_abbreviation(text: str, period: int) -> bool:
+    """True if the period at ``period`` ends an abbreviation or an initial"""
+    match = _LAST_WORD.search(text, max(0, period - _WORD_WINDOW), period)
+    if match is None:
+        return False
+    word = match.group(1).lower()
+    if len(word) == 1 and word.isalpha():
+        return True  # An initial, as in "J. Smith"
+    return word in ABBREVIATIONS
+
+
+def _trim_end(text: str, start: int, end: int) -> int:
+    """Move ``end`` back over whitespace, not before ``start``"""
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def split_sentences(text: str) -> SegmentSpans:
+    """
+    Split text into sentences in one pass, returning their offsets
+
+    A sentence ends at '.', '!' or '?' (and any closing quotes or brackets)
+    followed by whitespace, or at a blank line. A period does not end a
+    sentence after a known abbreviation ("e.g.", "Dr.") or an initial, or
+    when the next word starts in lower case; decimals such as "3.5" never
+    match because the period is not followed by whitespace. Spans exclude
+    surrounding whitespace and include the closing punctuation.
+    """
+    spans = SegmentSpans(text, category='sentence')
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        boundary = match.group()
+        if boundary[0] == '\n':
+            end = _trim_end(text, start, match.start())
+        else:
+            if boundary[0] == '.' and '!' not in boundary and '?' not in boundary:
+                following = _NON_SPACE.search(text, match.end())
+                if following is not None and following.group().islower():
+                    continue
+                if _is_abbreviation(text, match.start()):
+                    continue
+            end = match.end()
+        first = _NON_SPACE.search(text, start, end)
+        if first is not None:
+            spans.append(first.start(), end)
+        start = match.end()
+
+    end = _trim_end(text, start, len(text))
+    first = _NON_SPACE.search(text, start, end)
+    if first is not None:
+        spans.append(first.start(), end)
+    return spans
+
+
+class ParagraphSegmenter:
+    """
+    Incremental paragraph segmenter over text arriving in chunks
+
+    Paragraphs are separated by one or more blank lines (empty or
+    whitespace-only, so CRLF endings and stray spaces are handled). ``feed``
+    returns the paragraphs completed by each chunk as absolute (start, end)
+    offsets that exclude surrounding whitespace. Only the unfinished last
+    line is kept between chunks, never the text of earlier paragraphs.
+    """
+
+    def __init__(self):
+        self._carry = ''        # Incomplete last line
+        self._carry_start = 0   # Its offset in the whole text
+        self._start: Optional[int] = None  # Open paragraph's start, if any
+        self._end = 0
+
+    def feed(self, chunk: str) -> List[Tuple[int, int]]:
+        """Add the next chunk; returns the paragraphs it completed"""
+        data = self._carry + chunk
+        base = self._carry_start
+        cut = data.rfind('\n') + 1
+        completed: List[Tuple[int, int]] = []
+        if cut:
+            self._scan(data, 0, cut, base, completed)
+        self._carry = data[cut:]
+        self._carry_start = base + cut
+        return completed
+
+    def close(self) -> List[Tuple[int, int]]:
+        """Finish the text; returns the paragraphs still open"""
+        completed: List[Tuple[int, int]] = []
+        data = self._carry
+        if data.strip():
+            self._content(data, 0, len(data), self._carry_start)
+        if self._start is not None:
+            completed.append((self._start, self._end))
+            self._start = None
+        self._carry = ''
+        return completed
+
+    def _scan(self, data: str, position: int, end: int, base: int,
+              completed: List[Tuple[int, int]]) -> None:
+        """Process complete lines data[position:end], which ends with a newline"""
+        leading = _BLANK_LINES.match(data, position, end)
+        if leading is not None:
+            if self._start is not None:
+                completed.append((self._start, self._end))
+                self._start = None
+            position = leading.end()
+        for blank in _PARAGRAPH_BREAK.finditer(data, position, end):
+            if self._start is None:
+                self._start = base + _NON_SPACE.search(data, position).start()
+            completed.append((self._start, base + _trim_end(data, position, blank.start())))
+            position = blank.end()
+            # The break ends at the next paragraph's first character
+            self._start = base + position if position < end else None
+        if position < end:
+            self._content(data, position, end, base)
+
+    def _content(self, data: str, start: int, end: int, base: int) -> None:
+        """Extend the open paragraph (or open one) with non-blank lines data[start:end]"""
+        if self._start is None:
+            self._start = base + _NON_SPACE.search(data, start, end).start()
+        self._end = base + _trim_end(data, start, end)
+
+
+def split_paragraphs(text: str) -> SegmentSpans:
+    """
+    Split text into paragraphs separated by blank lines, returning their offsets
+
+    Any run of empty or whitespace-only lines (including ``\\r\\n`` line
+    endings) separates paragraphs. Spans exclude surrounding whitespace.
+    """
+    spans = SegmentSpans(text, category='paragraph')
+    segmenter = ParagraphSegmenter()
+    spans.offsets.extend(chain.from_iterable(segmenter.feed(text)))
+    spans.offsets.extend(chain.from_iterable(segmenter.close()))
+    return spans
+
+
+def iter_paragraph_spans(chunks: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """Yield the (start, end) offsets of paragraphs in text read as a sequence of chunks"""
+    segmenter = ParagraphSegmenter()
+    for chunk in chunks:
+        yield from segmenter.feed(chunk)
+    yield from segmenter.close()
@@ -0,0 +1,309 @@
+"""
+SQLite-backed persistence for extracted questions
+"""
+
+import json
+import sqlite3
+from typing import Dict, List, Any, Optional, Iterable, Iterator
+
+from .data_models import StructuredData, hash_text
+
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    timestamp TEXT,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id),
+    source TEXT NOT NULL,
+    question_number INTEGER,
+    question TEXT NOT NULL,
+    options TEXT NOT NULL,
+    start_position INTEGER,
+    end_position INTEGER,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_source ON documents(source);
+CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash);
+CREATE INDEX IF NOT EXISTS idx_questions_source ON questions(source);
+CREATE INDEX IF NOT EXISTS idx_questions_number ON questions(source, question_number);
+CREATE INDEX IF NOT EXISTS idx_questions_content_hash ON questions(content_hash);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    question, options, content='questions', content_rowid='id'
+);
+"""
+
+_INSERT_DOCUMENT = (
+    "INSERT INTO documents (source, content_hash, timestamp, metadata) VALUES (?, ?, ?, ?)"
+)
+_INSERT_QUESTION = (
+    "INSERT INTO questions (id, document_id, source, question_number, question, options, "
+    "start_position, end_position, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_FTS = "INSERT INTO questions_fts (rowid, question, options) VALUES (?, ?, ?)"
+_QUESTION_COLUMNS = (
+    "q.id, q.source, q.question_number, q.question, q.options, q.start_position, q.end_position"
+)
+
+
+def question_hash(question: Dict[str, Any]) -> str:
+    """
+    Return a content hash for a question dictionary
+
+    The hash covers the question text and its options, so the same question
+    extracted from two documents hashes identically.
+    """
+    options = question.get('options', {})
+    parts = [question.get('question', '')]
+    parts.extend(f"{label} {options[label]}" for label in sorted(options))
+    return hash_text('\n'.join(parts))
+
+
+def _fts_query(text: str) -> str:
+    """Turn plain text into an FTS5 query matching each word literally"""
+    # A double-quoted FTS5 string is tokenized like the indexed text, so
+    # punctuation and operator words lose any special meaning
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def _like_pattern(word: str) -> str:
+    """Return a LIKE pattern (with '\\' as its escape) matching a word anywhere"""
+    escaped = word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class QuestionStore:
+    """
+    Local SQLite database of extracted multiple-choice questions
+
+    Results are ingested in batched transactions with prepared statements.
+    Questions are indexed by source, question number and content hash, and
+    question and option text is indexed with FTS5 when SQLite provides it.
+    """
+
+    def __init__(self, path: str = ':memory:', batch_size: int = 5000):
+        """
+        Open (or create) a question store
+
+        Args:
+            path: Database file path, or ':memory:' for a temporary store
+            batch_size: Number of questions written per transaction
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        self.has_fts = self._create_fts()
+        self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.connection.commit()
+
+    def _create_fts(self) -> bool:
+        """Create the FTS5 index, returning False if FTS5 is unavailable"""
+        try:
+            self.connection.executescript(_FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self.connection.close()
+
+    def __enter__(self) -> 'QuestionStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def add_result(self, result: StructuredData) -> int:
+        """
+        Store a single result and its questions
+
+        Returns:
+            Number of questions stored
+        """
+        return self.add_results([result])
+
+    def add_results(self, results: Iterable[StructuredData]) -> int:
+        """
+        Bulk-insert results and their questions
+
+        Questions are buffered and flushed every ``batch_size`` rows, each
+        flush running in its own transaction.
+
+        Args:
+            results: StructuredData objects to store
+
+        Returns:
+            Number of questions stored
+        """
+        cursor = self.connection.cursor()
+        next_id = self._next_question_id()
+        question_rows: List[tuple] = []
+        fts_rows: List[tuple] = []
+        total = 0
+
+        for result in results:
+            cursor.execute(_INSERT_DOCUMENT, (
+                result.source,
+                result.get_content_hash(),
+                result.timestamp,
+                json.dumps(result.metadata, default=str),
+            ))
+            document_id = cursor.lastrowid
+
+            for question in result.get_field('multiple_choice_questions', []):
+                options = question.get('options', {})
+                options_json = json.dumps(options, ensure_ascii=False)
+                question_rows.append((
+                    next_id,
+                    document_id,
+                    result.source,
+                    question.get('question_number'),
+                    question['question'],
+                    options_json,
+                    question.get('start_position', 0),
+                    question.get('end_position', 0),
+                    question_hash(question),
+                ))
+                if self.has_fts:
+                    fts_rows.append((next_id, question['question'], ' '.join(options.values())))
+                next_id += 1
+
+                if len(question_rows) >= self.batch_size:
+                    total += self._flush(cursor, question_rows, fts_rows)
+
+        total += self._flush(cursor, question_rows, fts_rows)
+        return total
+
+    def _next_question_id(self) -> int:
+        row = self.connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM questions").fetchone()
+        return row[0]
+
+    def _flush(self, cursor: sqlite3.Cursor, question_rows: List[tuple], fts_rows: List[tuple]) -> int:
+        """Write buffered rows in one transaction and clear the buffers"""
+        count = len(question_rows)
+        if question_rows:
+            cursor.executemany(_INSERT_QUESTION, question_rows)
+        if fts_rows:
+            cursor.executemany(_INSERT_FTS, fts_rows)
+        self.connection.commit()
+        question_rows.clear()
+        fts_rows.clear()
+        return count
+
+    def count_questions(self, source: Optional[str] = None) -> int:
+        """Return the number of stored questions, optionally for one source"""
+        if source is None:
+            row = self.connection.execute("SELECT COUNT(*) FROM questions").fetchone()
+        else:
+            row = self.connection.execute(
+                "SELECT COUNT(*) FROM questions WHERE source = ?", (source,)
+            ).fetchone()
+        return row[0]
+
+    def get_sources(self) -> List[str]:
+        """Return the distinct sources in the store"""
+        rows = self.connection.execute("SELECT DISTINCT source FROM documents ORDER BY source")
+        return [row[0] for row in rows]
+
+    def iter_questions(self, source: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate stored questions in insertion order
+
+        Args:
+            source: Only yield questions from this source
+        """
+        sql = f"SELECT {_QUESTION_COLUMNS} FROM questions q"
+        params: tuple = ()
+        if source is not None:
+            sql += " WHERE q.source = ?"
+            params = (source,)
+        sql += " ORDER BY q.id"
+        for row in self.connection.execute(sql, params):
+            yield self._row_to_question(row)
+
+    def get_question(self, source: str, question_number: int) -> Optional[Dict[str, Any]]:
+        """Return the question with the given number from a source, if stored"""
+        row = self.connection.execute(
+            f"SELECT {_QUESTION_COLUMNS} FROM questions q "
+            "WHERE q.source = ? AND q.question_number = ? ORDER BY q.id DESC LIMIT 1",
+            (source, question_number),
+        ).fetchone()
+        return self._row_to_question(row) if row else None
+
+    def find_by_hash(self, content_hash: str) -> List[Dict[str, Any]]:
+        """Return all stored copies of a question with the given content hash"""
+        rows = self.connection.execute(
+            f"SELECT {_QUESTION_COLUMNS} FROM questions q WHERE q.content_hash = ? ORDER BY q.id",
+            (content_hash,),
+        )
+        return [self._row_to_question(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Full-text search over question and option text
+
+        Uses FTS5 ranking when available and falls back to a substring
+        match of each word otherwise. The query is plain text, not FTS5
+        syntax: each whitespace-separated word is matched literally
+        (punctuation such as "3.5" or "what's" included, "OR" is just a
+        word, and '%' or '_' are not wildcards), and questions must match
+        all of them.
+
+        Args:
+            query: Words to search for
+            limit: Maximum number of questions to return
+
+        Returns:
+            List of question dictionaries, best matches first
+        """
+        words = query.split()
+        if not words:
+            return []
+        if self.has_fts:
+            rows = self.connection.execute(
+                f"SELECT {_QUESTION_COLUMNS} FROM questions_fts f "
+                "JOIN questions q ON q.id = f.rowid "
+                "WHERE questions_fts MATCH ? ORDER BY f.rank LIMIT ?",
+                (_fts_query(query), limit),
+            )
+        else:
+            # Each word must occur in the question or its options
+            condition = " AND ".join(
+                ["(q.question LIKE ? ESCAPE '\\' OR q.options LIKE ? ESCAPE '\\')"] * len(words))
+            parameters: List[Any] = []
+            for word in words:
+                pattern = _like_pattern(word)
+                parameters += [pattern, pattern]
+            rows = self.connection.execute(
+                f"SELECT {_QUESTION_COLUMNS} FROM questions q "
+                f"WHERE {condition} ORDER BY q.id LIMIT ?",
+                (*parameters, limit),
+            )
+        return [self._row_to_question(row) for row in rows]
+
+    @staticmethod
+    def _row_to_question(row: tuple) -> Dict[str, Any]:
+        question_id, source, number, text, options, start, end = row
+        return {
+            'id': question_id,
+            'source': source,
+            'question': text,
+            'options': json.loads(options),
+            'question_number': number,
+            'start_position': start,
+            'end_position': end,
+        }
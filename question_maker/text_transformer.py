@@ -2,9 +2,108 @@
 Text transformation engine for converting text into structured data
 """
 
-from typing import Dict, Any, List, Optional
-from .data_models import StructuredData, TextSegment
-from .input_handlers import TextSource, create_source
+import inspect
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Iterator, Tuple, Union
+from .data_models import StructuredData, TextSegment, MultipleChoiceQuestion, hash_text
+from .grammars import (
+    ANSWER_KEY_HEADER_PATTERN, ANSWER_KEY_INITIALS, ANSWER_KEY_LETTERS_PATTERN, ANSWER_KEY_PAIRS_PATTERN,
+    ANSWER_LINE_INITIALS, ANSWER_LINE_PATTERN, QuestionGrammar, detect_grammar, get_grammar
+)
+from .input_handlers import (
+    TextSource, ContentCache, create_source, get_locator, default_content_cache
+)
+from .progress import ProcessingContext, CancellationToken, OperationCancelled
+from .lines import get_line_index, share_line_index
+from .segments import split_paragraphs, split_sentences
+
+
+# Lines parsed between progress reports and cancellation checks
+_CHECKPOINT_LINES = 4096
+
+# Seconds between cancellation checks while waiting on batch workers
+_BATCH_POLL_SECONDS = 0.1
+
+# Texts shorter than this are parsed in one piece even when workers are given
+_PARALLEL_MIN_CHARS = 4 * 2**20
+
+# Target size of the chunks a large text is split into for parallel parsing
+_PARALLEL_CHUNK_CHARS = 2 * 2**20
+
+
+def _accepts_context(processor: callable) -> bool:
+    """
+    Return True if a processor takes a ``context`` keyword argument
+    
+    Not cached: a cache keyed on processors would keep every processor (and
+    whatever it holds, such as a compiled glossary) alive, and reading a
+    signature costs little next to a transform.
+    """
+    try:
+        return 'context' in inspect.signature(processor).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+@dataclass
+class BatchItemResult:
+    """
+    Outcome of one input of a parallel batch
+    
+    Attributes:
+        index: Position of the input in the batch
+        input_data: The input as given
+        result: The StructuredData, or None if the input failed
+        error: The exception raised for the input, or None on success
+        duration: Seconds spent transforming the input
+    """
+    index: int
+    input_data: str
+    result: Optional[StructuredData] = None
+    error: Optional[BaseException] = None
+    duration: float = 0.0
+
+
+def _split_input(input_item: Any, source_type: Optional[str]) -> tuple:
+    """Return (input_data, source_type) for a batch input item"""
+    if isinstance(input_item, tuple):
+        return input_item[0], input_item[1] if len(input_item) > 1 else source_type
+    return input_item, source_type
+
+
+# The stop event of the batch a worker process belongs to (see _init_worker)
+_worker_stop_event = None
+
+
+def _init_worker(stop_event) -> None:
+    """Process-pool initializer: keep the batch's stop event for _transform_job"""
+    # Process-shared events can only be handed over when workers start
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+
+
+def _transform_job(processors: List[callable], input_data: str,
+                   source_type: Optional[str], stop_event=None) -> tuple:
+    """
+    Transform one input in a worker; returns (result, seconds)
+    
+    Once ``stop_event`` (in a worker process, the one given to
+    ``_init_worker``) is set, the job raises OperationCancelled at its next
+    cancellation checkpoint.
+    """
+    stop_event = stop_event if stop_event is not None else _worker_stop_event
+    context = None
+    if stop_event is not None:
+        context = ProcessingContext(cancel_token=CancellationToken(stop_event))
+    transformer = TextTransformer()
+    transformer.processors = list(processors)
+    started = time.perf_counter()
+    result = transformer.transform(input_data, source_type, context)
+    return result, time.perf_counter() - started
 
 
 class TextTransformer:
@@ -12,8 +111,19 @@ class TextTransformer:
     Main class for transforming text into structured data
     """
     
-    def __init__(self):
+    def __init__(self, keep_content: bool = True, content_cache: Optional[ContentCache] = None):
+        """
+        Args:
+            keep_content: Keep the original text on each result. When False,
+                results hold a content hash and locator instead, and the text
+                is reloaded on demand with ``StructuredData.load_content``.
+            content_cache: Cache for texts without a file or URL locator
+                (defaults to the shared cache, which keeps a bounded amount in
+                memory and moves the rest to temporary files)
+        """
         self.processors: List[callable] = []
+        self.keep_content = keep_content
+        self.content_cache = content_cache
     
     def add_processor(self, processor: callable) -> None:
         """
@@ -24,20 +134,29 @@ class TextTransformer:
         """
         self.processors.append(processor)
     
-    def transform(self, input_data: str, source_type: Optional[str] = None) -> StructuredData:
+    def transform(self, input_data: str, source_type: Optional[str] = None,
+                  context: Optional[ProcessingContext] = None) -> StructuredData:
         """
         Transform text from any source into structured data
         
         Args:
             input_data: File path, URL, or text string
             source_type: Optional type hint ('file', 'url', 'string')
+            context: Optional ProcessingContext that receives read and
+                processing progress and streamed questions
         
         Returns:
             StructuredData object containing extracted information
+        
+        Raises:
+            OperationCancelled: If the context's cancel token is cancelled
         """
+        if context is not None:
+            context.check_cancelled()
+        
         # Get text from source
         source = create_source(input_data, source_type)
-        text = source.read()
+        text = source.read(context)
         source_info = source.get_source_info()
         
         # Create structured data object
@@ -46,142 +165,570 @@ class TextTransformer:
             content=text
         )
         
-        # Apply processors
-        for processor in self.processors:
-            result = processor(text)
-            if isinstance(result, dict):
-                structured_data.extracted_data.update(result)
+        # Apply processors, sharing one line index between them
+        with share_line_index(text) as shared:
+            for processor in self.processors:
+                if context is not None:
+                    context.set_stage(getattr(processor, '__name__', 'processing'), len(text))
+                    if _accepts_context(processor):
+                        result = processor(text, context=context)
+                    else:
+                        result = processor(text)
+                    context.report_progress(len(text))
+                else:
+                    result = processor(text)
+                if isinstance(result, dict):
+                    structured_data.extracted_data.update(result)
+            if shared.index is not None:
+                structured_data.line_index()  # Keep the index with the result
         
         # Add basic metadata
         structured_data.metadata['text_length'] = len(text)
         structured_data.metadata['processor_count'] = len(self.processors)
         
+        if not self.keep_content:
+            self._store_content_by_reference(structured_data, source, text)
+        
         return structured_data
     
-    def transform_batch(self, inputs: List[tuple], source_type: Optional[str] = None) -> List[StructuredData]:
+    def _store_content_by_reference(self, structured_data: StructuredData,
+                                    source: TextSource, text: str) -> None:
+        """Replace a result's content with its hash and a locator"""
+        content_hash = hash_text(text)
+        locator = get_locator(source)
+        if locator is None:
+            cache = self.content_cache if self.content_cache is not None else default_content_cache
+            locator = cache.put(content_hash, text)
+        
+        structured_data.content = None
+        structured_data.content_hash = content_hash
+        structured_data.content_locator = locator
+    
+    def transform_batch(self, inputs: List[tuple], source_type: Optional[str] = None,
+                        context: Optional[ProcessingContext] = None,
+                        max_workers: Optional[int] = None) -> List[StructuredData]:
         """
         Transform multiple texts into structured data
         
         Args:
             inputs: List of (input_data, optional_source_type) tuples
             source_type: Default source type if not specified in tuple
+            context: Optional ProcessingContext passed to each transform;
+                its cancel token is checked between inputs
+            max_workers: When greater than 1, transform inputs in parallel
+                with ``iter_transform_parallel`` (progress is not reported)
         
         Returns:
             List of StructuredData objects
+        
+        Raises:
+            The first error raised by any input, in input order
         """
+        if max_workers is not None and max_workers > 1:
+            cancel_token = context.cancel_token if context is not None else None
+            outcomes = sorted(self.iter_transform_parallel(inputs, source_type, max_workers,
+                                                           cancel_token=cancel_token),
+                              key=lambda outcome: outcome.index)
+            for outcome in outcomes:
+                if outcome.error is not None:
+                    raise outcome.error
+            return [outcome.result for outcome in outcomes]
+        
         results = []
         for input_item in inputs:
-            if isinstance(input_item, tuple):
-                input_data, item_source_type = input_item[0], input_item[1] if len(input_item) > 1 else source_type
-            else:
-                input_data, item_source_type = input_item, source_type
-            
-            results.append(self.transform(input_data, item_source_type))
+            if context is not None:
+                context.check_cancelled()
+            input_data, item_source_type = _split_input(input_item, source_type)
+            results.append(self.transform(input_data, item_source_type, context))
         
         return results
+    
+    def iter_transform_parallel(self, inputs: List[Any], source_type: Optional[str] = None,
+                                max_workers: Optional[int] = None,
+                                use_processes: bool = True,
+                                cancel_token: Optional[CancellationToken] = None,
+                                on_start: Optional[Callable[[int], None]] = None
+                                ) -> Iterator[BatchItemResult]:
+        """
+        Transform inputs on a bounded pool of workers, yielding as each finishes
+        
+        At most ``max_workers`` inputs are in flight at once, so a large
+        batch never queues all of its work up front. Errors are reported per
+        input instead of stopping the batch.
+        
+        Args:
+            inputs: Input strings or (input_data, optional_source_type) tuples
+            source_type: Default source type if not specified in tuple
+            max_workers: Pool size (defaults to the number of CPUs)
+            use_processes: Use worker processes so parsing scales with cores;
+                processors must then be picklable module-level functions.
+                With False, a thread pool is used.
+            cancel_token: Stops the batch once cancelled: inputs not yet
+                started are dropped, and running ones stop at their next
+                cancellation checkpoint
+            on_start: Called with an input's index when it is submitted
+        
+        Yields:
+            BatchItemResult for each input, in completion order
+        
+        Raises:
+            OperationCancelled: If ``cancel_token`` is cancelled
+        """
+        # Imported here: the process pool pulls in multiprocessing
+        from concurrent.futures import (
+            ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+        )
+        
+        items = [_split_input(item, source_type) for item in inputs]
+        max_workers = max(1, max_workers or os.cpu_count() or 1)
+        pool_size = min(max_workers, len(items) or 1)
+        # Set when the batch ends early, so running jobs stop too
+        if use_processes:
+            import multiprocessing
+            stop_event = multiprocessing.Event()
+            job_stop_event = None  # Workers get it from _init_worker
+            executor = ProcessPoolExecutor(max_workers=pool_size, initializer=_init_worker,
+                                           initargs=(stop_event,))
+        else:
+            import threading
+            stop_event = job_stop_event = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=pool_size)
+        
+        running = {}
+        next_index = 0
+        try:
+            while next_index < len(items) or running:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                while next_index < len(items) and len(running) < max_workers:
+                    input_data, item_source_type = items[next_index]
+                    future = executor.submit(_transform_job, self.processors,
+                                             input_data, item_source_type, job_stop_event)
+                    running[future] = next_index
+                    if on_start is not None:
+                        on_start(next_index)
+                    next_index += 1
+                
+                done, _ = wait(running, timeout=_BATCH_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    input_data, item_source_type = items[index]
+                    outcome = BatchItemResult(index=index, input_data=input_data)
+                    try:
+                        outcome.result, outcome.duration = future.result()
+                    except Exception as e:
+                        outcome.error = e
+                    else:
+                        if not self.keep_content:
+                            self._store_content_by_reference(
+                                outcome.result, create_source(input_data, item_source_type),
+                                outcome.result.content)
+                    yield outcome
+        finally:
+            # Jobs still running (only if the batch was cancelled or
+            # abandoned) stop at their next checkpoint, and any not yet
+            # started never start; idle workers then exit
+            stop_event.set()
+            for future in running:
+                future.cancel()
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:  # pragma: no cover - cancel_futures is new in 3.9
+                executor.shutdown(wait=False)
 
 
 # Built-in processors
 def basic_stats_processor(text: str) -> Dict[str, Any]:
     """Extract basic statistics from text"""
     words = text.split()
-    lines = text.split('\n')
     
     return {
         'word_count': len(words),
-        'line_count': len(lines),
+        'line_count': len(get_line_index(text)),
         'char_count': len(text),
         'avg_word_length': sum(len(word) for word in words) / len(words) if words else 0
     }
 
 
 def extract_sentences(text: str) -> Dict[str, Any]:
-    """Extract sentences from text (simple implementation)"""
-    # Simple sentence splitting on period, exclamation, question mark
-    import re
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
+    """
+    Extract sentence positions from text
+    
+    Sentences are found by ``segments.split_sentences``, which skips
+    abbreviations and decimals. They are returned as [start, end] offsets
+    into the text rather than as copied strings; use
+    ``segments.split_sentences`` directly for lazily sliced sentence texts.
+    """
+    spans = split_sentences(text)
     
     return {
-        'sentences': sentences,
-        'sentence_count': len(sentences)
+        'sentence_spans': spans.to_list(),
+        'sentence_count': len(spans)
     }
 
 
 def extract_paragraphs(text: str) -> Dict[str, Any]:
-    """Extract paragraphs from text"""
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+    """
+    Extract paragraph positions from text
+    
+    Paragraphs are separated by any run of blank or whitespace-only lines,
+    including CRLF line endings. Like sentences, they are returned as
+    [start, end] offsets; use ``segments.split_paragraphs`` for lazily
+    sliced texts, or ``segments.iter_paragraph_spans`` for chunked input.
+    """
+    spans = split_paragraphs(text)
     
     return {
-        'paragraphs': paragraphs,
-        'paragraph_count': len(paragraphs)
+        'paragraph_spans': spans.to_list(),
+        'paragraph_count': len(spans)
     }
 
 
-def extract_multiple_choice_questions(text: str) -> Dict[str, Any]:
+def iter_multiple_choice_questions(text: str,
+                                   context: Optional[ProcessingContext] = None,
+                                   grammar: Optional[Union[str, QuestionGrammar]] = None
+                                   ) -> Iterator[MultipleChoiceQuestion]:
     """
-    Extract multiple-choice questions from text
+    Yield multiple-choice questions from text as each one is completed
     
-    Expects questions in the format:
-    Question text?
-    A Option 1
-    B Option 2
-    C Option 3
-    ...
+    Uses the same formats as ``extract_multiple_choice_questions``. Questions
+    without options are skipped.
     
-    Returns:
-        Dictionary containing extracted questions and metadata
+    Stem and option texts are collected as lists of line pieces and joined
+    once when a question is complete, so wrapped lines cost no repeated
+    string concatenation.
+    
+    Args:
+        text: Text to parse
+        context: Optional context; progress is reported (and cancellation
+            checked) every few thousand lines, even between questions
+        grammar: Question format (a QuestionGrammar or its name); detected
+            from the start of the text if not given
     """
-    import re
-    from .data_models import MultipleChoiceQuestion
+    grammar = detect_grammar(text) if grammar is None else get_grammar(grammar)
+    return _parse_questions(text, context, grammar)
+
+
+def _parse_questions(text: str, context: Optional[ProcessingContext],
+                     grammar: QuestionGrammar) -> Iterator[MultipleChoiceQuestion]:
+    """
+    The parser behind ``iter_multiple_choice_questions``
     
-    questions = []
-    lines = text.split('\n')
-    current_question = None
-    current_position = 0
+    Its return value (the StopIteration value) is the number the next
+    question would have been given, which lets parallel chunk parsing
+    renumber the questions of later chunks.
+    """
+    option_pattern = grammar.option_pattern.match
+    number_pattern = grammar.number_pattern.match if grammar.number_pattern is not None else None
+    
+    answer_line = ANSWER_LINE_PATTERN.match
+    key_header = ANSWER_KEY_HEADER_PATTERN.match
+    key_pairs = ANSWER_KEY_PAIRS_PATTERN.match
+    key_letters = ANSWER_KEY_LETTERS_PATTERN.match
+    in_key = False  # Inside an answer-key block, whose lines are skipped
+    
+    # The open question. Single-line texts are stored as strings; pieces of
+    # wrapped texts are collected in ``wrapped`` (keyed by option label, or
+    # None for the stem) and joined when the question is complete
+    stem = None
+    options: Dict[str, str] = {}
+    wrapped: Dict[Optional[str], List[str]] = {}
+    last_label = None       # Option a continuation line extends (None: the stem)
+    stem_indent = 0         # Indentation of the stem's first line
+    option_indent = 0       # Indentation of the last option line
+    continuation_start = 0  # Offset of the first line continuing the last option
+    current_number = current_start = 0
+    after_blank = False
     line_position = 0
     question_number = 1
     
-    for i, line in enumerate(lines):
-        line = line.strip()
-        line_position += len(lines[i]) + 1  # +1 for newline character
+    for line_index, raw_line in enumerate(text.split('\n')):
+        if context is not None and line_index % _CHECKPOINT_LINES == 0:
+            context.report_progress(line_position)
+        line = raw_line.strip()
+        # Offset of the line's first non-blank character; '\r' of a CRLF
+        # ending is trailing whitespace, so it never shifts this
+        indent = len(raw_line) - len(raw_line.lstrip())
+        content_position = line_position + indent
+        line_position += len(raw_line) + 1  # +1 for newline character
         
         if not line:
+            after_blank = True
             continue
-            
-        # Check if line is an option (starts with single letter followed by space)
-        option_match = re.match(r'^([A-Z])\s+(.+)$', line)
+        
+        if in_key:
+            if key_pairs(line) or key_letters(line):
+                continue
+            in_key = False
+        
+        # Check if line is an option (a letter label in the grammar's style)
+        option_match = option_pattern(line)
         
         if option_match:
-            if current_question is not None:
+            if stem is not None:
                 label, option_text = option_match.groups()
-                current_question.add_option(label, option_text)
+                label = label.upper()
+                if label in options or (last_label is not None and label < last_label):
+                    # The labels restart, so this option belongs to the next
+                    # question; lines read as continuing the last option
+                    # were that question's stem
+                    moved = wrapped.pop(last_label, None)
+                    if moved is not None:
+                        options[last_label] = moved[0]
+                    yield _build_question(stem, options, wrapped, current_number, current_start,
+                                          continuation_start if moved is not None else content_position)
+                    options = {}
+                    wrapped = {}
+                    if moved is not None:
+                        stem = moved[1]
+                        if len(moved) > 2:
+                            wrapped[None] = moved[1:]
+                        current_start = continuation_start
+                    else:
+                        stem = ''  # Options with no stem line between them
+                        current_start = content_position
+                    current_number = question_number
+                    question_number += 1
+                last_label = label
+                options[label] = option_text
+                option_indent = indent
+        elif (stem is not None and not after_blank
+              and (indent > (option_indent if options else stem_indent) or line[0].islower()
+                   or (not options and number_pattern is not None))
+              and not (number_pattern is not None and number_pattern(line))
+              and not answer_line(line) and not key_header(line)):
+            # Continuation of the stem or of the last option: indented
+            # further or starting in lower case, or (in numbered banks,
+            # where an unnumbered line cannot start a stem) any line
+            # before the first option
+            pieces = wrapped.get(last_label)
+            if pieces is None:
+                pieces = wrapped[last_label] = [options[last_label] if last_label else stem]
+                if last_label is not None:
+                    continuation_start = content_position
+            pieces.append(line)
         else:
             # This is likely a new question
-            if current_question is not None:
+            if stem is not None and options:  # Only yield if it has options
                 # Finalize the previous question
-                current_question.end_position = line_position - len(line) - 1
-                if current_question.options:  # Only add if it has options
-                    questions.append(current_question)
+                yield _build_question(stem, options, wrapped, current_number,
+                                      current_start, content_position)
+            stem = last_label = None
+            options = {}
+            if wrapped:
+                wrapped = {}
+            
+            if line[0] in ANSWER_LINE_INITIALS and answer_line(line):
+                # An answer line closes the question without starting one
+                after_blank = False
+                continue
+            if line[0] in ANSWER_KEY_INITIALS and key_header(line):
+                # So does an answer-key block, along with its key lines
+                after_blank = False
+                in_key = True
+                continue
             
-            # Start a new question
-            current_question = MultipleChoiceQuestion(
-                question=line,
-                question_number=question_number,
-                start_position=line_position - len(line) - 1
-            )
+            # Start a new question, taking its number from the text if it has one
+            number_match = number_pattern(line) if number_pattern is not None else None
+            if number_match:
+                question_number = int(number_match.group(1))
+                line = number_match.group(2)
+            stem = line
+            stem_indent = indent
+            current_number = question_number
+            current_start = content_position
             question_number += 1
+        after_blank = False
     
     # Don't forget the last question
-    if current_question is not None and current_question.options:
-        current_question.end_position = len(text)
-        questions.append(current_question)
+    if stem is not None and options:
+        yield _build_question(stem, options, wrapped, current_number, current_start, len(text))
+    return question_number
+
+
+def _build_question(stem: str, options: Dict[str, str], wrapped: Dict[Optional[str], List[str]],
+                    question_number: int, start_position: int, end_position: int) -> MultipleChoiceQuestion:
+    """Create a parsed question, joining the pieces of wrapped stem and option texts"""
+    for label, pieces in wrapped.items():
+        if label is None:
+            stem = ' '.join(pieces)
+        else:
+            options[label] = ' '.join(pieces)
+    return MultipleChoiceQuestion(
+        question=stem,
+        options=options,
+        question_number=question_number,
+        start_position=start_position,
+        end_position=end_position
+    )
+
+
+def _chunk_boundary(text: str, position: int, grammar: QuestionGrammar) -> Optional[int]:
+    """
+    Find the first offset after ``position`` where the parser's state resets
+    
+    That is the first character of a line that always starts a new question
+    regardless of what precedes it (never an answer or answer-key line): in
+    numbered banks, a numbered line; in others, a line that is not an option
+    and follows a blank line, or follows an option line without indentation
+    or a lower-case start (which would make it a continuation).
+    """
+    option_pattern = grammar.option_pattern.match
+    number_pattern = grammar.number_pattern.match if grammar.number_pattern is not None else None
+    previous = None  # 'blank' or 'option' for the previous line, if known
+    
+    line_start = text.find('\n', position) + 1
+    while 0 < line_start < len(text):
+        line_end = text.find('\n', line_start)
+        if line_end == -1:
+            line_end = len(text)
+        raw_line = text[line_start:line_end]
+        line = raw_line.strip()
+        if not line:
+            previous = 'blank'
+        elif option_pattern(line):
+            previous = 'option'
+        else:
+            indent = len(raw_line) - len(raw_line.lstrip())
+            if not (ANSWER_LINE_PATTERN.match(line) or ANSWER_KEY_HEADER_PATTERN.match(line)
+                    or ANSWER_KEY_PAIRS_PATTERN.match(line) or ANSWER_KEY_LETTERS_PATTERN.match(line)):
+                if number_pattern is not None:
+                    if number_pattern(line):
+                        return line_start + indent
+                elif previous == 'blank' or (previous == 'option' and indent == 0
+                                             and not line[0].islower()):
+                    return line_start + indent
+            previous = None
+        line_start = line_end + 1
+    return None
+
+
+def _chunk_boundaries(text: str, grammar: QuestionGrammar, chunk_chars: int) -> List[int]:
+    """Split offsets for parsing chunks independently: [0, ..., len(text)]"""
+    boundaries = [0]
+    while boundaries[-1] + chunk_chars < len(text):
+        boundary = _chunk_boundary(text, boundaries[-1] + chunk_chars, grammar)
+        if boundary is None:
+            break
+        boundaries.append(boundary)
+    boundaries.append(len(text))
+    return boundaries
+
+
+def _parse_chunk(chunk: str, grammar: QuestionGrammar) -> Tuple[List[Dict[str, Any]], int]:
+    """Parse one chunk in a worker; returns (question dicts, next question number)"""
+    parser = _parse_questions(chunk, None, grammar)
+    questions = []
+    while True:
+        try:
+            questions.append(next(parser).to_dict())
+        except StopIteration as stop:
+            return questions, stop.value
+
+
+def _iter_questions_parallel(text: str, grammar: QuestionGrammar,
+                             max_workers: int) -> Iterator[Dict[str, Any]]:
+    """
+    Parse a large text's chunks on a process pool, yielding question dicts in order
+    
+    Chunk-relative positions are shifted to absolute ones, and in banks
+    without question numbers the running question number carries over from
+    chunk to chunk, so the output matches a sequential parse exactly.
+    """
+    # Imported here: the process pool pulls in multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    boundaries = _chunk_boundaries(text, grammar, _PARALLEL_CHUNK_CHARS)
+    chunk_count = len(boundaries) - 1
+    executor = ProcessPoolExecutor(max_workers=min(max_workers, chunk_count))
+    pending = deque()
+    next_chunk = 0
+    number_offset = 0
+    try:
+        while next_chunk < chunk_count or pending:
+            # Keep a bounded number of chunks in flight
+            while next_chunk < chunk_count and len(pending) < 2 * max_workers:
+                start, end = boundaries[next_chunk], boundaries[next_chunk + 1]
+                pending.append((start, executor.submit(_parse_chunk, text[start:end], grammar)))
+                next_chunk += 1
+            
+            start, future = pending.popleft()
+            questions, next_number = future.result()
+            for question in questions:
+                question['start_position'] += start
+                question['end_position'] += start
+                if grammar.number_pattern is None:
+                    question['question_number'] += number_offset
+                yield question
+            number_offset += next_number - 1
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def extract_multiple_choice_questions(text: str, context: Optional[ProcessingContext] = None,
+                                      grammar: Optional[Union[str, QuestionGrammar]] = None,
+                                      max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extract multiple-choice questions from text
+    
+    Expects questions in the format:
+    Question text?
+    A Option 1
+    B Option 2
+    C Option 3
+    ...
+    
+    Options may also be labelled ``A.``, ``A)``, ``(a)``, ``a.`` or ``a)``,
+    and questions may be numbered ``1.``, ``1)`` or ``Q1:``. The format is
+    detected once from the start of the text (see ``grammars.detect_grammar``)
+    and the whole text is parsed with it. Option labels are normalized to
+    capital letters.
+    
+    Wrapped text is joined with single spaces: lines directly after a stem
+    or an option continue it if they are indented further or start in lower
+    case, and any other line starts a new stem, so a heading above a
+    question is not glued onto it. In numbered banks, a numbered line always
+    starts a new question and unnumbered lines before the first option
+    continue the stem. Option labels that repeat or go back (A after B)
+    start a new question, taking as its stem any lines that seemed to
+    continue the last option. Answer lines such as ``Answer: B`` end a
+    question, and answer-key blocks (``Answers: 1-B 2-C``, or ``Answers:``
+    followed by a line of letters) end it and are skipped.
+    
+    Args:
+        text: Text to extract questions from
+        context: Optional context that receives each question as it is
+            extracted, along with progress through the text
+        grammar: Question format (a QuestionGrammar or its name, e.g.
+            'letter_dot+numbered'); detected if not given
+        max_workers: With more than one, a text of several megabytes is
+            split at question boundaries and its chunks are parsed on a
+            process pool. The result is identical to a sequential parse.
+    
+    Returns:
+        Dictionary containing extracted questions and metadata
+    """
+    grammar = detect_grammar(text) if grammar is None else get_grammar(grammar)
+    
+    if max_workers is not None and max_workers > 1 and len(text) >= _PARALLEL_MIN_CHARS:
+        question_dicts = _iter_questions_parallel(text, grammar, max_workers)
+    else:
+        # Convert questions to dictionaries for serialization
+        question_dicts = (question.to_dict()
+                          for question in iter_multiple_choice_questions(text, context, grammar))
     
-    # Convert questions to dictionaries for serialization
-    questions_data = [q.to_dict() for q in questions]
+    questions_data = []
+    for question_data in question_dicts:
+        questions_data.append(question_data)
+        if context is not None:
+            context.emit_question(question_data)
+            context.report_progress(question_data['end_position'])
     
     return {
         'multiple_choice_questions': questions_data,
         'question_count': len(questions_data),
-        'questions_with_options': sum(1 for q in questions_data if q.get('options'))
+        'questions_with_options': sum(1 for q in questions_data if q.get('options')),
+        'question_format': grammar.name
     }
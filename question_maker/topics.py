@@ -0,0 +1,360 @@
+"""
+Topic clustering of questions with TF-IDF vectors and mini-batch k-means
+
+Questions (stem and options) are turned into a sparse, L2-normalized TF-IDF
+matrix held as NumPy CSR arrays, then grouped by spherical (cosine) k-means
+updated one mini-batch at a time, so memory stays bounded by the batch and
+the centroids rather than growing with the number of questions squared.
+
+Requires NumPy (``pip install -e ".[analysis]"``).
+"""
+
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .data_models import StructuredData, MultipleChoiceQuestion
+from .dedup import question_text
+
+
+_TOKEN_PATTERN = re.compile(r'[^\W\d_]{2,}')
+
+# Common words dropped before weighting (IDF would give them little weight anyway)
+STOP_WORDS = frozenset("""
+    a about above after again all also an and any are as at be because been before being
+    below between both but by can could did do does doing during each few for from further
+    had has have having he her here hers him his how if in into is it its itself just me
+    more most my no nor not now of off on once only or other our out over own same she
+    should so some such than that the their them then there these they this those through
+    to too under until up very was we were what when where which while who whom why will
+    with would you your following true false none
+""".split())
+
+# Upper bound on (non-zeros x clusters) similarity cells computed per batch
+_MAX_BATCH_CELLS = 1 << 23
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Topic clustering requires numpy: pip install numpy")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of two or more letters, without stop words"""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+@dataclass
+class TfidfMatrix:
+    """
+    Sparse TF-IDF matrix in CSR form, one L2-normalized row per document
+
+    Attributes:
+        indptr: Row i's entries are at indptr[i]:indptr[i + 1]
+        indices: Feature (column) of each entry
+        data: Weight of each entry
+        vocabulary: Term of each feature
+    """
+    indptr: 'np.ndarray'
+    indices: 'np.ndarray'
+    data: 'np.ndarray'
+    vocabulary: List[str]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.indptr) - 1, len(self.vocabulary)
+
+    def row_terms(self, row: int) -> Dict[str, float]:
+        """Return a row's terms and weights"""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return {self.vocabulary[i]: float(w) for i, w in zip(self.indices[start:end], self.data[start:end])}
+
+
+def build_tfidf(texts: Iterable[str], min_df: int = 2, max_df: float = 0.5,
+                max_features: int = 1 << 16) -> TfidfMatrix:
+    """
+    Build a TF-IDF matrix over texts
+
+    Term frequencies are sublinear (1 + log tf) and inverse document
+    frequencies smoothed (log((1 + n) / (1 + df)) + 1). Tokens are stored as
+    a flat integer array while reading, and everything after tokenization
+    is vectorized.
+
+    Args:
+        texts: Documents to weight
+        min_df: Drop terms found in fewer documents than this
+        max_df: Drop terms found in more than this fraction of documents
+        max_features: Keep at most this many terms, the most frequent first
+
+    Returns:
+        The matrix; rows without any kept term are all zero
+    """
+    _require_numpy()
+    terms: Dict[str, int] = {}
+    token_ids = array('i')
+    lengths = array('q')
+    for text in texts:
+        tokens = tokenize(text)
+        token_ids.extend(terms.setdefault(token, len(terms)) for token in tokens)
+        lengths.append(len(tokens))
+
+    documents = len(lengths)
+    term_count = max(len(terms), 1)
+    rows = np.repeat(np.arange(documents, dtype=np.int64), np.array(lengths, dtype=np.int64))
+    # One key per (document, term) pair; unique() sorts them by row, then term
+    keys, counts = np.unique(rows * term_count + np.array(token_ids, dtype=np.int64),
+                             return_counts=True)
+    del rows
+    rows, columns = np.divmod(keys, term_count)
+    df = np.bincount(columns, minlength=term_count)
+
+    keep = (df >= min_df) & (df <= max_df * documents)
+    if np.count_nonzero(keep) > max_features:
+        cutoff = np.argsort(-np.where(keep, df, -1), kind='stable')[:max_features]
+        keep = np.zeros_like(keep)
+        keep[cutoff] = True
+    new_ids = np.full(term_count, -1, dtype=np.int64)
+    kept = np.flatnonzero(keep)
+    new_ids[kept] = np.arange(len(kept))
+    by_id = list(terms)
+    vocabulary = [by_id[i] for i in kept.tolist()]
+
+    mask = keep[columns]
+    rows, columns, counts = rows[mask], new_ids[columns[mask]], counts[mask]
+    idf = np.log((1.0 + documents) / (1.0 + df[kept])) + 1.0
+    data = ((1.0 + np.log(counts)) * idf[columns]).astype(np.float32)
+    norms = np.sqrt(np.bincount(rows, weights=data.astype(np.float64) ** 2, minlength=documents))
+    data /= norms[rows].astype(np.float32)
+
+    indptr = np.zeros(documents + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=documents), out=indptr[1:])
+    return TfidfMatrix(indptr=indptr, indices=columns.astype(np.int32), data=data, vocabulary=vocabulary)
+
+
+def _similarities(matrix: TfidfMatrix, rows: 'np.ndarray', centroids_t: 'np.ndarray') -> 'np.ndarray':
+    """Cosine similarities (rows x clusters) of matrix rows to unit centroids (features x clusters)"""
+    starts, ends = matrix.indptr[rows], matrix.indptr[rows + 1]
+    lengths = ends - starts
+    result = np.zeros((len(rows), centroids_t.shape[1]), dtype=np.float32)
+    nonempty = np.flatnonzero(lengths)
+    if len(nonempty) == 0:
+        return result
+    entries = _gather(starts[nonempty], lengths[nonempty])
+    products = centroids_t[matrix.indices[entries]] * matrix.data[entries, None]
+    offsets = np.zeros(len(nonempty), dtype=np.int64)
+    np.cumsum(lengths[nonempty][:-1], out=offsets[1:])
+    result[nonempty] = np.add.reduceat(products, offsets, axis=0)
+    return result
+
+
+def _gather(starts: 'np.ndarray', lengths: 'np.ndarray') -> 'np.ndarray':
+    """Concatenate the index ranges start:start + length (all lengths positive)"""
+    total = int(lengths.sum())
+    steps = np.ones(total, dtype=np.int64)
+    first = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=first[1:])
+    steps[first] = starts - np.concatenate(([0], starts[:-1] + lengths[:-1] - 1))
+    return np.cumsum(steps)
+
+
+def _batches(matrix: TfidfMatrix, order: 'np.ndarray', batch_size: int, clusters: int):
+    """Split rows into batches of at most batch_size rows and a bounded number of cells"""
+    max_entries = max(1, _MAX_BATCH_CELLS // clusters)
+    lengths = np.diff(matrix.indptr)[order]
+    start = 0
+    while start < len(order):
+        end = min(start + batch_size, len(order))
+        cumulative = np.cumsum(lengths[start:end])
+        fits = int(np.searchsorted(cumulative, max_entries, side='right'))
+        end = start + max(1, fits)
+        yield order[start:end]
+        start = end
+
+
+@dataclass
+class TopicClusters:
+    """
+    Result of clustering questions by topic
+
+    Attributes:
+        labels: Cluster of each question, or -1 if it has no weighted term
+        similarities: Cosine similarity of each question to its cluster's centroid
+        centroids: Unit-length cluster centroids (clusters x features)
+        vocabulary: Term of each feature
+    """
+    labels: 'np.ndarray'
+    similarities: 'np.ndarray'
+    centroids: 'np.ndarray'
+    vocabulary: List[str]
+
+    def sizes(self) -> List[int]:
+        """Number of questions in each cluster"""
+        return np.bincount(self.labels[self.labels >= 0], minlength=len(self.centroids)).tolist()
+
+    def top_terms(self, cluster: int, count: int = 8) -> List[str]:
+        """The terms with the largest weights in a cluster's centroid"""
+        weights = self.centroids[cluster]
+        top = np.argsort(-weights, kind='stable')[:count]
+        return [self.vocabulary[i] for i in top if weights[i] > 0]
+
+    def summary(self, terms: int = 8) -> List[Dict[str, Any]]:
+        """One dictionary per cluster with its 'topic' id, 'size' and 'terms'"""
+        return [{'topic': cluster, 'size': size, 'terms': self.top_terms(cluster, terms)}
+                for cluster, size in enumerate(self.sizes())]
+
+
+def kmeans_tfidf(matrix: TfidfMatrix, n_clusters: int, batch_size: int = 4096,
+                 epochs: int = 3, seed: int = 1) -> TopicClusters:
+    """
+    Cluster the rows of a TF-IDF matrix with mini-batch spherical k-means
+
+    Centroids start from k-means++ seeding on a sample, then each batch
+    moves every centroid towards the mean of its assigned rows with a
+    per-centroid learning rate of 1 / (rows assigned so far), as in
+    Sculley's web-scale k-means, and renormalizes it. A final batched pass
+    assigns every row to its most similar centroid; rows without any term
+    are labelled -1.
+
+    Args:
+        matrix: Rows to cluster
+        n_clusters: Number of clusters (capped at the number of rows)
+        batch_size: Rows per mini-batch
+        epochs: Passes over the rows, each in a new random order
+        seed: Seed for sampling and batch order
+    """
+    _require_numpy()
+    documents, features = matrix.shape
+    rows = np.flatnonzero(np.diff(matrix.indptr))  # Rows with at least one term
+    labels = np.full(documents, -1, dtype=np.int64)
+    similarities = np.zeros(documents, dtype=np.float32)
+    n_clusters = max(1, min(n_clusters, len(rows)))
+    if len(rows) == 0:
+        return TopicClusters(labels=labels, similarities=similarities,
+                             centroids=np.zeros((n_clusters, features), dtype=np.float32),
+                             vocabulary=matrix.vocabulary)
+
+    generator = np.random.RandomState(seed)
+    centroids_t = _seed_centroids(matrix, rows, n_clusters, generator)
+    seen = np.zeros(n_clusters, dtype=np.float64)
+
+    for _ in range(epochs):
+        for batch in _batches(matrix, generator.permutation(rows), batch_size, n_clusters):
+            nearest = np.argmax(_similarities(matrix, batch, centroids_t), axis=1)
+            lengths = matrix.indptr[batch + 1] - matrix.indptr[batch]
+            entries = _gather(matrix.indptr[batch], lengths)
+            sums = np.zeros((features, n_clusters), dtype=np.float32)
+            np.add.at(sums, (matrix.indices[entries], np.repeat(nearest, lengths)), matrix.data[entries])
+
+            assigned = np.bincount(nearest, minlength=n_clusters).astype(np.float64)
+            moved = np.flatnonzero(assigned)
+            seen[moved] += assigned[moved]
+            rate = (1.0 / seen[moved]).astype(np.float32)
+            # c <- (1 - n/seen) c + sum/seen, i.e. c moves towards each assigned row at rate 1/seen
+            centroids_t[:, moved] *= 1.0 - assigned[moved].astype(np.float32) * rate
+            centroids_t[:, moved] += sums[:, moved] * rate
+            _normalize_columns(centroids_t, moved)
+
+    for batch in _batches(matrix, rows, batch_size, n_clusters):
+        scores = _similarities(matrix, batch, centroids_t)
+        labels[batch] = np.argmax(scores, axis=1)
+        similarities[batch] = scores[np.arange(len(batch)), labels[batch]]
+    return TopicClusters(labels=labels, similarities=similarities,
+                         centroids=np.ascontiguousarray(centroids_t.T), vocabulary=matrix.vocabulary)
+
+
+def _normalize_columns(centroids_t: 'np.ndarray', columns: 'np.ndarray') -> None:
+    norms = np.linalg.norm(centroids_t[:, columns], axis=0)
+    norms[norms == 0] = 1.0
+    centroids_t[:, columns] /= norms
+
+
+def _seed_centroids(matrix: TfidfMatrix, rows: 'np.ndarray', n_clusters: int,
+                    generator: 'np.random.RandomState') -> 'np.ndarray':
+    """
+    Greedy k-means++ seeding on a sample of rows
+
+    Each step draws a few candidates with probability proportional to their
+    squared distance from the chosen centroids and keeps the one that lowers
+    the total distance most, which avoids seeding one topic twice far more
+    reliably than a single draw.
+
+    Returns:
+        Unit centroids as a (features x clusters) array
+    """
+    features = matrix.shape[1]
+    sample_size = min(len(rows), max(10 * n_clusters, 2048))
+    sample = np.sort(generator.choice(rows, sample_size, replace=False))
+    candidates_per_step = 2 + int(np.log(n_clusters))
+    centroids_t = np.zeros((features, n_clusters), dtype=np.float32)
+
+    def row_vectors(chosen: 'np.ndarray') -> 'np.ndarray':
+        vectors = np.zeros((features, len(chosen)), dtype=np.float32)
+        for column, row in enumerate(chosen):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            vectors[matrix.indices[start:end], column] = matrix.data[start:end]
+        return vectors
+
+    centroids_t[:, 0] = row_vectors(sample[[generator.randint(sample_size)]])[:, 0]
+    # Squared distance between unit vectors is 2 - 2 cos
+    distances = np.maximum(2.0 - 2.0 * _similarities(matrix, sample, centroids_t[:, :1])[:, 0], 0)
+    for cluster in range(1, n_clusters):
+        weights = distances.astype(np.float64)
+        total = weights.sum()
+        if total > 0:
+            picks = generator.choice(sample_size, candidates_per_step, p=weights / total)
+        else:
+            picks = generator.randint(sample_size, size=candidates_per_step)
+        vectors = row_vectors(sample[picks])
+        trial = np.minimum(distances[:, None], 2.0 - 2.0 * _similarities(matrix, sample, vectors))
+        best = int(np.argmin(trial.sum(axis=0)))
+        centroids_t[:, cluster] = vectors[:, best]
+        distances = np.maximum(trial[:, best], 0)
+    return centroids_t
+
+
+def cluster_questions(questions: Iterable[Union[Dict[str, Any], MultipleChoiceQuestion]],
+                      n_clusters: int = 20, min_df: int = 2, max_df: float = 0.5,
+                      max_features: int = 1 << 16, batch_size: int = 4096,
+                      epochs: int = 3, seed: int = 1) -> TopicClusters:
+    """
+    Cluster questions by topic from their stem and option text
+
+    Args:
+        questions: Question dictionaries or MultipleChoiceQuestion objects
+        n_clusters: Number of topics
+        min_df, max_df, max_features: Vocabulary limits, as in ``build_tfidf``
+        batch_size, epochs, seed: Clustering settings, as in ``kmeans_tfidf``
+
+    Returns:
+        TopicClusters whose labels follow the order of ``questions``
+    """
+    matrix = build_tfidf((question_text(question) for question in questions),
+                         min_df=min_df, max_df=max_df, max_features=max_features)
+    return kmeans_tfidf(matrix, n_clusters, batch_size=batch_size, epochs=epochs, seed=seed)
+
+
+def assign_topics(result: StructuredData, n_clusters: int = 20, terms: int = 8,
+                  **options: Any) -> Optional[TopicClusters]:
+    """
+    Cluster a result's questions and record each question's 'topic'
+
+    Also stores a per-topic summary ('topic', 'size', 'terms') under
+    ``extracted_data['topics']``. Options are passed to ``cluster_questions``.
+
+    Returns:
+        The clusters, or None if the result has no questions
+    """
+    questions = result.get_field('multiple_choice_questions', [])
+    if not questions:
+        return None
+    clusters = cluster_questions(questions, n_clusters, **options)
+    for question, label in zip(questions, clusters.labels.tolist()):
+        question['topic'] = label if label >= 0 else None
+    result.add_field('topics', clusters.summary(terms))
+    return clusters
@@ -0,0 +1,70 @@
+"""
+Change detection for watching an input file while it is being edited
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+from .data_models import hash_text
+
+
+class FileWatcher:
+    """
+    Detects settled changes to a file by polling its modification time and size
+
+    ``poll`` is cheap (one ``stat`` call) and reports a change only after the
+    file has stopped changing for ``debounce`` seconds, so an editor's burst
+    of writes on save triggers one reprocess. ``check_content`` then compares
+    the text's hash with the last processed one, so saves that leave the
+    content unchanged are skipped.
+    """
+
+    def __init__(self, path: Union[str, Path], debounce: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            path: File to watch
+            debounce: Seconds the file must stay unchanged before reporting
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.path = str(path)
+        self.debounce = debounce
+        self.clock = clock
+        self.content_hash: Optional[str] = None
+        self._signature = self._stat()
+        self._changed_at: Optional[float] = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> bool:
+        """
+        Return True once the file has changed and then settled
+
+        A file that is missing when it settles is not reported; it is
+        reported again once it reappears and settles.
+        """
+        signature = self._stat()
+        now = self.clock()
+        if signature != self._signature:
+            self._signature = signature
+            self._changed_at = now
+            return False
+        if self._changed_at is not None and now - self._changed_at >= self.debounce:
+            self._changed_at = None
+            return signature is not None
+        return False
+
+    def check_content(self, text: str) -> bool:
+        """Record a text's hash; return True if it differs from the last one recorded"""
+        content_hash = hash_text(text)
+        if content_hash == self.content_hash:
+            return False
+        self.content_hash = content_hash
+        return True
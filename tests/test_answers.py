@@ -0,0 +1,131 @@
+"""Tests for answer-key extraction and joining"""
+
+import pytest
+from question_maker import TextTransformer
+from question_maker.answers import extract_answer_key, join_answers, extract_questions_with_answers
+
+
+NUMBERED_BANK = """1. What is 2 + 2?
+A. 3
+B. 4
+
+2. Which is larger?
+A. 1
+B. 2
+
+3. Which is a fruit?
+A. Apple
+B. Brick
+
+Answers: 1-B 2-B
+3-A, 9-C"""
+
+
+def test_extract_numbered_answer_key():
+    """Test parsing a key block that continues on the next line"""
+    entries = extract_answer_key(NUMBERED_BANK)
+    
+    assert [(entry['number'], entry['answer']) for entry in entries] == [(1, 'B'), (2, 'B'), (3, 'A'), (9, 'C')]
+    assert NUMBERED_BANK[entries[2]['position']:].startswith("3-A")
+
+
+@pytest.mark.parametrize("key", ["Answer key: 1. b, 2. c", "ANSWERS:\n1) B 2) C", "Key: 1 B; 2 C"])
+def test_extract_answer_key_layouts(key):
+    """Test common numbered key layouts"""
+    entries = extract_answer_key(f"Some questions\n\n{key}\n\nMore prose follows.")
+    
+    assert [(entry['number'], entry['answer']) for entry in entries] == [(1, 'B'), (2, 'C')]
+
+
+def test_questions_with_numbered_key():
+    """Test joining a key on question numbers and reporting unmatched keys"""
+    result = extract_questions_with_answers(NUMBERED_BANK)
+    
+    assert [q['answer'] for q in result['multiple_choice_questions']] == ['B', 'B', 'A']
+    assert result['answer_count'] == 3
+    assert [entry['number'] for entry in result['unmatched_answer_keys']] == [9]
+    assert result['unanswered_questions'] == []
+
+
+def test_letter_key_on_line_after_header():
+    """Test a key of letters under its header, which must not parse as a question"""
+    text = "What is 2+2?\nA 3\nB 4\n\nWhich is larger?\nA 1\nB 2\n\nAnswers:\n\nB A"
+    
+    assert [entry['answer'] for entry in extract_answer_key(text)] == ['B', 'A']
+    
+    result = extract_questions_with_answers(text)
+    
+    assert result['question_count'] == 2
+    assert [q['answer'] for q in result['multiple_choice_questions']] == ['B', 'A']
+    assert result['multiple_choice_questions'][1]['end_position'] == text.index("Answers:")
+    assert result['unmatched_answer_keys'] == []
+    assert result['unanswered_questions'] == []
+
+
+def test_questions_with_inline_answers():
+    """Test per-question answer lines and questions left without one"""
+    text = """What is 2 + 2?
+A 3
+B 4
+Answer: B
+
+Which is larger?
+A 1
+B 2
+
+Which is a fruit?
+(a) Apple
+(b) Brick
+Correct answer: (a)"""
+    
+    result = extract_questions_with_answers(text, grammar='letter')
+    questions = result['multiple_choice_questions']
+    
+    # The '(a)' options are not options in this grammar, so the third
+    # question is dropped and its answer line matches nothing
+    assert [q['answer'] for q in questions] == ['B', None]
+    assert result['unanswered_questions'] == [questions[1]['question_number']]
+    assert [entry['answer'] for entry in result['unmatched_answer_keys']] == ['A']
+
+
+
+def test_unnumbered_questions_join_key_by_order():
+    """Test that keys for unnumbered questions are joined by position"""
+    text = """Intro line without options
+
+What is 2 + 2?
+A 3
+B 4
+Which is larger?
+A 1
+B 2
+
+Answers: B A"""
+    
+    result = extract_questions_with_answers(text)
+    
+    assert [q['answer'] for q in result['multiple_choice_questions']] == ['B', 'A']
+    assert result['unmatched_answer_keys'] == []
+
+
+def test_join_answers_by_position_reports_out_of_range():
+    """Test numbered keys joined on position without question numbers"""
+    questions = [{'question': 'one', 'start_position': 0}, {'question': 'two', 'start_position': 10}]
+    entries = [{'number': 2, 'answer': 'C', 'position': 20, 'inline': False},
+               {'number': 5, 'answer': 'A', 'position': 25, 'inline': False}]
+    
+    unmatched, unanswered = join_answers(questions, entries, by_number=False)
+    
+    assert questions[1]['answer'] == 'C'
+    assert unmatched == [entries[1]]
+    assert unanswered == [None]
+
+
+def test_answers_with_transformer():
+    """Test the processor with TextTransformer and the answer on question objects"""
+    transformer = TextTransformer()
+    transformer.add_processor(extract_questions_with_answers)
+    
+    result = transformer.transform(NUMBERED_BANK, source_type='string')
+    
+    assert [q.answer for q in result.get_questions()] == ['B', 'B', 'A']
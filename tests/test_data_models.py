@@ -1,7 +1,7 @@
 """Tests for data models"""
 
 import pytest
-from question_maker.data_models import StructuredData, TextSegment
+from question_maker.data_models import StructuredData, TextSegment, hash_text
 
 
 def test_structured_data_creation():
@@ -70,3 +70,62 @@ def test_text_segment_to_dict():
     assert result["text"] == "Test"
     assert result["start_position"] == 0
     assert result["end_position"] == 4
+
+
+def test_structured_data_to_dict_without_content():
+    """Test excluding the original text from the dictionary"""
+    data = StructuredData(source="test.txt", content="Test content")
+    
+    result = data.to_dict(include_content=False)
+    
+    assert result["content"] is None
+    assert "content_hash" not in result
+    assert data.content == "Test content"
+
+
+def test_structured_data_release_and_load_content():
+    """Test dropping content and reloading it from a cache locator"""
+    from question_maker.input_handlers import ContentCache
+    cache = ContentCache()
+    data = StructuredData(source="string", content="Some text")
+    data.content_locator = cache.put("key", "Some text")
+    
+    data.release_content()
+    
+    assert not data.is_content_loaded()
+    assert data.get_content_hash() == hash_text("Some text")
+    assert data.load_content(cache) == "Some text"
+    assert data.to_dict()["content_locator"] == "cache:key"
+
+
+def test_structured_data_load_content_detects_changes():
+    """Test that reloaded text is verified against the content hash"""
+    from question_maker.input_handlers import ContentCache
+    cache = ContentCache()
+    data = StructuredData(source="string", content=None,
+                          content_hash=hash_text("original"),
+                          content_locator=cache.put("key", "edited"))
+    
+    with pytest.raises(ValueError):
+        data.load_content(cache)
+
+
+def test_structured_data_merge():
+    """Test combining results into an aggregate"""
+    first = StructuredData(source="a.txt", content="abc",
+                           extracted_data={'question_count': 1, 'avg_word_length': 3.0,
+                                           'multiple_choice_questions': [{'question': 'Q1?'}]})
+    second = StructuredData(source="b.txt", content="defgh",
+                            extracted_data={'question_count': 2,
+                                            'multiple_choice_questions': [{'question': 'Q2?'},
+                                                                          {'question': 'Q3?'}]})
+    
+    merged = StructuredData.merge([first, second], source="2 files")
+    
+    assert merged.source == "2 files"
+    assert merged.content is None
+    assert merged.get_content_length() == 8
+    assert merged.get_field('question_count') == 3
+    assert 'avg_word_length' not in merged.extracted_data
+    assert [q['source'] for q in merged.get_field('multiple_choice_questions')] == ["a.txt", "b.txt", "b.txt"]
+    assert 'source' not in first.get_field('multiple_choice_questions')[0]
@@ -0,0 +1,101 @@
+"""Tests for near-duplicate question detection"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from question_maker import MultipleChoiceQuestion, QuestionStore, StructuredData
+from question_maker.dedup import (
+    QuestionDeduplicator, find_near_duplicates, shingle_hashes, choose_bands
+)
+
+
+def make_question(text, options=("Tyrosine", "Glutamine", "Glutamate", "Lysine")):
+    return {
+        'question': text,
+        'options': dict(zip("ABCDE", options)),
+    }
+
+
+BASE = "Which of the following is an essential amino acid in humans according to the textbook?"
+REWORDED = "Which one of the following is an essential amino acid in humans according to the textbook?"
+OTHER = "Which enzyme catalyses the oxidative deamination of glutamate in the mitochondria?"
+
+
+def test_shingle_hashes_short_text():
+    """Test that short texts still produce one shingle"""
+    assert len(shingle_hashes("Hi", shingle_size=3)) == 1
+    assert shingle_hashes("Same words here") == shingle_hashes("same  WORDS here")
+
+
+def test_choose_bands_tracks_threshold():
+    """Test that a higher threshold uses more rows per band"""
+    low_bands, low_rows = choose_bands(0.5, 128)
+    high_bands, high_rows = choose_bands(0.9, 128)
+    
+    assert low_bands * low_rows <= 128
+    assert high_rows > low_rows
+
+
+def test_find_near_duplicates():
+    """Test clustering reworded copies and leaving distinct questions alone"""
+    questions = [
+        make_question(BASE),
+        make_question(OTHER, ("GDH", "ALT", "AST", "CPS-I")),
+        make_question(REWORDED),
+        make_question(BASE),
+    ]
+    
+    clusters = find_near_duplicates(questions, threshold=0.7)
+    
+    assert clusters == [[0, 2, 3]]
+
+
+def test_threshold_controls_matches():
+    """Test that a strict threshold keeps reworded questions apart"""
+    questions = [make_question(BASE), make_question(REWORDED)]
+    
+    assert find_near_duplicates(questions, threshold=0.6) == [[0, 1]]
+    assert find_near_duplicates(questions, threshold=1.0) == []
+
+
+def test_accepts_question_objects():
+    """Test deduplicating MultipleChoiceQuestion instances"""
+    first = MultipleChoiceQuestion(question=BASE, options={'A': 'Tyrosine', 'B': 'Lysine'})
+    second = MultipleChoiceQuestion(question=BASE, options={'A': 'Tyrosine', 'B': 'Lysine'})
+    
+    assert find_near_duplicates([first, second]) == [[0, 1]]
+
+
+def test_signatures_are_batched_consistently():
+    """Test that signatures do not depend on how questions are batched"""
+    deduplicator = QuestionDeduplicator()
+    deduplicator.add("a", make_question(BASE))
+    first = deduplicator.signatures()
+    deduplicator.add("b", make_question(OTHER))
+    both = deduplicator.signatures()
+    
+    assert both.shape == (2, 128)
+    assert (both[0] == first[0]).all()
+
+
+def test_deduplicate_across_results_and_store():
+    """Test keys for results and store-backed questions"""
+    result_a = StructuredData(source="a.txt", content="",
+                              extracted_data={'multiple_choice_questions': [
+                                  dict(make_question(BASE), question_number=1)]})
+    result_b = StructuredData(source="b.txt", content="",
+                              extracted_data={'multiple_choice_questions': [
+                                  dict(make_question(OTHER), question_number=1),
+                                  dict(make_question(REWORDED), question_number=2)]})
+    
+    deduplicator = QuestionDeduplicator(threshold=0.7)
+    deduplicator.add_result(result_a)
+    deduplicator.add_result(result_b)
+    assert deduplicator.find_clusters() == [[("a.txt", 1), ("b.txt", 2)]]
+    
+    with QuestionStore() as store:
+        store.add_results([result_a, result_b])
+        from_store = QuestionDeduplicator(threshold=0.7)
+        from_store.add_store(store)
+        assert from_store.find_clusters() == [[1, 3]]
@@ -0,0 +1,190 @@
+"""Tests for streaming exporters"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+
+import pytest
+from question_maker import TextTransformer, StructuredData
+from question_maker.text_transformer import basic_stats_processor, extract_multiple_choice_questions
+from question_maker.exporters import (
+    JSONExporter, CSVExporter, TextExporter, BackgroundExporter,
+    stream_result, export_result, auto_export
+)
+
+
+QUIZ_TEXT = """What is the capital of France?
+A London
+B Paris
+C Berlin
+
+Pick the sixth option.
+A One
+B Two
+C Three
+D Four
+E Five
+F Six"""
+
+
+def make_result():
+    transformer = TextTransformer()
+    transformer.add_processor(extract_multiple_choice_questions)
+    transformer.add_processor(basic_stats_processor)
+    return transformer.transform(QUIZ_TEXT, source_type='string')
+
+
+@pytest.mark.parametrize("indent", [2, None])
+@pytest.mark.parametrize("include_content", [True, False])
+def test_json_exporter_matches_json_dump(indent, include_content):
+    """Test that streamed JSON is identical to dumping to_dict()"""
+    result = make_result()
+    stream = io.StringIO()
+    
+    stream_result(result, [JSONExporter(stream, indent=indent, include_content=include_content)])
+    
+    expected = json.dumps(result.to_dict(include_content=include_content), indent=indent, ensure_ascii=False)
+    assert stream.getvalue() == expected
+
+
+def test_json_exporter_without_questions():
+    """Test JSON export of a result with no question list"""
+    result = StructuredData(source="string", content="text", extracted_data={'word_count': 1})
+    stream = io.StringIO()
+    
+    stream_result(result, [JSONExporter(stream)])
+    
+    assert json.loads(stream.getvalue()) == result.to_dict()
+
+
+def test_csv_exporter_dynamic_option_columns():
+    """Test that CSV columns cover every option label, including F"""
+    stream = io.StringIO()
+    
+    stream_result(make_result(), [CSVExporter(stream)])
+    
+    rows = list(csv.reader(io.StringIO(stream.getvalue())))
+    assert rows[0] == ['Question_Number', 'Question_Text', 'Option_A', 'Option_B', 'Option_C',
+                       'Option_D', 'Option_E', 'Option_F', 'Start_Position', 'End_Position']
+    assert rows[1][2:8] == ['London', 'Paris', 'Berlin', '', '', '']
+    assert rows[2][7] == 'Six'
+
+
+def test_text_exporter():
+    """Test the human-readable text format"""
+    stream = io.StringIO()
+    
+    stream_result(make_result(), [TextExporter(stream)])
+    
+    text = stream.getvalue()
+    assert text.startswith("QUESTION MAKER - EXTRACTED RESULTS\n")
+    assert "EXTRACTED QUESTIONS (2 found):" in text
+    assert "1. What is the capital of France?\n   A) London\n" in text
+    assert "   F) Six\n" in text
+
+
+def test_stream_result_single_pass():
+    """Test that all exporters are fed from one traversal of the questions"""
+    class RecordingExporter(TextExporter):
+        def __init__(self, stream, log):
+            super().__init__(stream)
+            self.log = log
+        
+        def write_question(self, number, question):
+            self.log.append((id(self), number))
+    
+    log = []
+    first, second = RecordingExporter(io.StringIO(), log), RecordingExporter(io.StringIO(), log)
+    
+    count = stream_result(make_result(), [first, second])
+    
+    assert count == 2
+    assert log == [(id(first), 1), (id(second), 1), (id(first), 2), (id(second), 2)]
+
+
+def test_export_result_writes_files():
+    """Test exporting several formats to files with per-format options"""
+    result = make_result()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        targets = {name: os.path.join(temp_dir, f"out.{name}") for name in ('json', 'csv', 'text')}
+        
+        paths = export_result(result, targets, {'json': {'include_content': False}})
+        
+        with open(paths['json'], encoding='utf-8') as f:
+            assert json.load(f)['content'] is None
+        with open(paths['csv'], encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == 3
+        assert paths['text'].read_text(encoding='utf-8').startswith("QUESTION MAKER")
+
+
+def test_export_result_unknown_format():
+    """Test that unknown formats are rejected"""
+    with pytest.raises(ValueError):
+        export_result(make_result(), {'xml': 'out.xml'})
+
+
+def test_auto_export_file_names():
+    """Test timestamped auto-export names and skipping CSV without questions"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = auto_export(make_result(), temp_dir, timestamp="20250101_000000")
+        assert sorted(p.name for p in paths.values()) == [
+            "questions_20250101_000000.csv", "results_20250101_000000.json"]
+        
+        no_questions = StructuredData(source="string", content="text")
+        paths = auto_export(no_questions, temp_dir, timestamp="20250101_000001")
+        assert list(paths) == ['json']
+
+
+def test_export_result_failure_leaves_existing_files():
+    """Test that a failed export neither replaces files nor leaves temp files"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target = os.path.join(temp_dir, "out.json")
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write("previous")
+        broken = StructuredData(source="string", content="text",
+                                extracted_data={'unserializable': object()})
+        
+        with pytest.raises(TypeError):
+            export_result(broken, {'json': target})
+        
+        with open(target, encoding='utf-8') as f:
+            assert f.read() == "previous"
+        assert os.listdir(temp_dir) == ["out.json"]
+
+
+def test_background_exporter_coalesces_pending_jobs():
+    """Test that a pending job is replaced by a newer one with the same key"""
+    import threading
+    release = threading.Event()
+    completed = []
+    exporter = BackgroundExporter(on_complete=lambda key, paths, error: completed.append((key, paths, error)))
+    
+    exporter.submit('blocker', lambda: release.wait(5) and {})
+    assert exporter.submit('auto', lambda: {'json': 'first'}) is False
+    assert exporter.submit('auto', lambda: {'json': 'second'}) is True
+    assert exporter.is_busy()
+    
+    release.set()
+    assert exporter.close(timeout=5)
+    
+    assert completed == [('blocker', {}, None), ('auto', {'json': 'second'}, None)]
+    assert not exporter.is_busy()
+    with pytest.raises(RuntimeError):
+        exporter.submit('auto', lambda: {})
+
+
+def test_background_exporter_reports_errors():
+    """Test that a failing job is reported instead of stopping the writer"""
+    completed = []
+    exporter = BackgroundExporter(on_complete=lambda key, paths, error: completed.append((key, error)))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        exporter.submit('bad', lambda: export_result(make_result(), {'json': os.path.join(temp_dir, 'missing', 'x.json')}))
+        exporter.submit_result('good', make_result(), {'json': os.path.join(temp_dir, 'x.json')})
+        assert exporter.wait(timeout=5)
+        
+        assert isinstance(completed[0][1], OSError)
+        assert completed[1] == ('good', None)
+        assert os.path.exists(os.path.join(temp_dir, 'x.json'))
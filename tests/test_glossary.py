@@ -0,0 +1,159 @@
+"""Tests for glossary term tagging"""
+
+import io
+import pickle
+import random
+import re
+
+import pytest
+
+from question_maker import TextTransformer, MultipleChoiceQuestion
+from question_maker.answers import extract_questions_with_answers
+from question_maker.exporters import CSVExporter, TextExporter, stream_result
+from question_maker.glossary import (
+    Glossary, compile_glossary, load_glossary, tag_questions, glossary_processor
+)
+
+
+TERMS = ["amino acid", "acid", "glutamate dehydrogenase", "dehydrogenase", "DNA", "C++", "C#"]
+
+BANK = """1. Which enzyme is glutamate
+dehydrogenase?
+A. An amino-acid oxidase
+B. A DNA polymerase
+
+2. What is an Acid?
+A. A proton donor
+B. Acidic rain
+
+Answers: 1-A 2-A"""
+
+
+WORD = r'\w+(?:\.\w+)*[+#]*'
+
+
+def _brute_force(terms, text):
+    """Matches found by comparing every run of words with every term"""
+    normalized = {}
+    for index, term in enumerate(terms):
+        normalized.setdefault(tuple(re.findall(WORD, term.lower())), index)
+    words = [(match.start(), match.end(), match.group().lower()) for match in re.finditer(WORD, text)]
+    longest = max(len(key) for key in normalized)
+    found = set()
+    for first in range(len(words)):
+        for count in range(1, longest + 1):
+            key = tuple(word for _, _, word in words[first:first + count])
+            if len(key) == count and key in normalized:
+                found.add((words[first][0], words[first + count - 1][1], normalized[key]))
+    return found
+
+
+def test_find_whole_words_and_overlaps():
+    """Test case-insensitive whole-word matching, overlapping terms and phrases across lines"""
+    glossary = Glossary(TERMS)
+    text = "Glutamate\nDehydrogenase binds DNA; acidic amino-acids are not amino acid"
+    found = [(text[start:end], glossary.terms[index]) for start, end, index in glossary.find(text)]
+
+    assert found == [
+        ("Glutamate\nDehydrogenase", "glutamate dehydrogenase"),
+        ("Dehydrogenase", "dehydrogenase"),
+        ("DNA", "DNA"),
+        ("amino acid", "amino acid"),
+        ("acid", "acid"),
+    ]
+
+
+def test_find_keeps_symbols_in_words():
+    """Test "C++" and "C#" stay distinct and neither matches a bare C"""
+    glossary = Glossary(TERMS)
+    text = "C, C. and C-sharp; C# or C++? dna."
+    found = [(text[start:end], glossary.terms[index]) for start, end, index in glossary.find(text)]
+
+    assert found == [("C#", "C#"), ("C++", "C++"), ("dna", "DNA")]
+
+
+def test_terms_with_the_same_words_are_warned_about():
+    """Test duplicate and wordless terms are reported instead of silently merged"""
+    with pytest.warns(UserWarning, match="'dna' has the same words as 'DNA'"):
+        glossary = Glossary(["DNA", "dna", "C#"])
+    with pytest.warns(UserWarning, match="'\\+\\+' has no words"):
+        Glossary(["++"])
+
+    assert glossary.find_terms("dna") == {"DNA": [[0, 3]]}
+
+
+def test_find_matches_brute_force():
+    """Test the automaton against a word-by-word comparison on random text"""
+    rng = random.Random(7)
+    vocabulary = [f"w{i}" for i in range(40)] + ["c", "c++", "c#", "v1.2"]
+    terms = list(dict.fromkeys(' '.join(rng.sample(vocabulary, rng.randint(1, 4))) for _ in range(150)))
+    text = ' '.join(rng.choice(vocabulary) + rng.choice([' ', ', ', '\n']) for _ in range(3000))
+
+    assert set(Glossary(terms).find(text)) == _brute_force(terms, text)
+
+
+def test_find_within_range():
+    """Test offsets stay absolute when scanning part of a text"""
+    glossary = Glossary(["acid"])
+    text = "acid base acid"
+
+    assert glossary.find(text, 4) == [(10, 14, 0)]
+    assert glossary.find_terms(text, 0, 9) == {"acid": [[0, 4]]}
+
+
+def test_compiled_glossary_is_cached_and_pickles_by_terms(tmp_path):
+    """Test repeated compiles, loaded files and unpickled copies share one automaton"""
+    glossary = compile_glossary(TERMS)
+    path = tmp_path / "glossary.txt"
+    path.write_text("# Biology\n" + "\n".join(TERMS) + "\n\n", encoding='utf-8')
+
+    assert compile_glossary(list(TERMS)) is glossary
+    assert load_glossary(str(path)) is glossary
+    assert pickle.loads(pickle.dumps(glossary)) is glossary
+
+
+def test_tag_questions():
+    """Test each question gets the terms within its own span"""
+    questions = [{'start_position': 0, 'end_position': 10}, {'start_position': 10, 'end_position': 20}]
+    counts = tag_questions("DNA acid. dna only.", questions, TERMS)
+
+    assert questions[0]['terms'] == {"DNA": [[0, 3]], "acid": [[4, 8]]}
+    assert questions[1]['terms'] == {"DNA": [[10, 13]]}
+    assert counts == {"DNA": 2, "acid": 1}
+
+
+def test_labels_are_not_tagged():
+    """Test question numbers and option labels are skipped, and C never matches C++"""
+    text = "1. Which is written in C?\nA. vitamin B\nB. Tcell\nC. T cell\n\n2. C++ or C#?\nA. 1\nB. 2\n"
+    transformer = TextTransformer()
+    transformer.add_processor(glossary_processor(["C++", "C#", "vitamin A", "T-cell", "C", "A", "1"]))
+    first, second = transformer.transform(text, 'string').extracted_data['multiple_choice_questions']
+
+    assert first['terms'] == {"C": [[23, 24]], "T-cell": [[text.index("T cell"), text.index("T cell") + 6]]}
+    assert second['terms'] == {"C++": [[text.index("C++"), text.index("C++") + 3]],
+                               "C#": [[text.index("C#"), text.index("C#") + 2]],
+                               "1": [[text.index("A. 1") + 3, text.index("A. 1") + 4]]}
+
+
+def test_glossary_processor_with_answers():
+    """Test the processor composes with answer-key extraction and survives serialization"""
+    transformer = TextTransformer()
+    transformer.add_processor(glossary_processor(TERMS, extract=extract_questions_with_answers))
+
+    result = transformer.transform(BANK, 'text')
+    data = result.extracted_data
+    first, second = data['multiple_choice_questions']
+
+    assert first['answer'] == 'A'
+    assert list(first['terms']) == ["glutamate dehydrogenase", "dehydrogenase", "amino acid", "acid", "DNA"]
+    assert [BANK[start:end] for start, end in first['terms']['amino acid']] == ["amino-acid"]
+    assert second['terms'] == {"acid": [[BANK.index("Acid"), BANK.index("Acid") + 4]]}
+    assert data['glossary_term_counts']['acid'] == 2
+    assert data['tagged_question_count'] == 2
+
+    assert MultipleChoiceQuestion.from_dict(first).to_dict() == first
+
+    text_stream, csv_stream = io.StringIO(), io.StringIO()
+    stream_result(result, [TextExporter(text_stream), CSVExporter(csv_stream)])
+    assert "Terms: glutamate dehydrogenase, dehydrogenase" in text_stream.getvalue()
+    assert csv_stream.getvalue().splitlines()[0].split(',')[-3] == 'Terms'
@@ -0,0 +1,60 @@
+"""Tests for question format detection"""
+
+import pytest
+from question_maker.grammars import GRAMMARS, DEFAULT_GRAMMAR, detect_grammar, get_grammar
+
+
+def make_bank(stem_format, option_format, count=3):
+    lines = []
+    for number in range(1, count + 1):
+        lines.append(stem_format.format(number=number))
+        for label in "abcd":
+            lines.append(option_format.format(lower=label, upper=label.upper()))
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("option_format,expected", [
+    ("{upper} Option", "letter"),
+    ("{upper}. Option", "letter_dot"),
+    ("{upper}) Option", "letter_paren"),
+    ("({lower}) Option", "enclosed"),
+    ("({upper}) Option", "enclosed"),
+    ("{lower}. Option", "lower"),
+    ("{lower}) Option", "lower"),
+])
+def test_detect_option_styles(option_format, expected):
+    """Test detecting each built-in option style"""
+    text = make_bank("What is question {number}?", option_format)
+    
+    assert detect_grammar(text).name == expected
+
+
+@pytest.mark.parametrize("stem_format", ["{number}. What?", "{number}) What?", "Q{number}: What?",
+                                         "Question {number}. What?"])
+def test_detect_numbered_questions(stem_format):
+    """Test detecting numbered question stems"""
+    text = make_bank(stem_format, "{upper}. Option")
+    
+    assert detect_grammar(text).name == "letter_dot+numbered"
+
+
+def test_detect_defaults_without_options():
+    """Test that text without option lines falls back to the default grammar"""
+    assert detect_grammar("Just some prose.\nA sentence starting with A.") is DEFAULT_GRAMMAR
+    assert detect_grammar("") is DEFAULT_GRAMMAR
+
+
+def test_detect_only_reads_the_sample():
+    """Test that detection ignores text beyond the sample"""
+    text = make_bank("What?", "{upper} Option", count=2) + "\n" + make_bank("What?", "{upper}) Option", count=50)
+    
+    assert detect_grammar(text, sample_size=len(text)).name == "letter_paren"
+    assert detect_grammar(text, sample_size=60).name == "letter"
+
+
+def test_get_grammar_by_name():
+    """Test resolving grammar names"""
+    assert get_grammar("letter_paren") is GRAMMARS[2]
+    assert get_grammar("lower+numbered").number_pattern is not None
+    with pytest.raises(ValueError):
+        get_grammar("roman")
@@ -0,0 +1,90 @@
+"""Tests for the result history"""
+
+import os
+
+import pytest
+from question_maker import StructuredData
+from question_maker.history import ResultHistory, estimate_size, write_spilled, load_spilled
+
+
+def make_result(source, question_count=10, content="x" * 1000):
+    questions = [{'question': f"{source} question {i}?", 'options': {'A': "yes", 'B': "no"},
+                  'question_number': i + 1, 'start_position': 0, 'end_position': 0}
+                 for i in range(question_count)]
+    return StructuredData(source=source, content=content,
+                          extracted_data={'multiple_choice_questions': questions,
+                                          'question_count': question_count})
+
+
+def test_estimate_size_grows_with_content_and_questions():
+    """Test that the size estimate accounts for content and questions"""
+    assert estimate_size(make_result("a", 10)) > estimate_size(make_result("a", 1))
+    assert estimate_size(make_result("a", 1, "x" * 5000)) > estimate_size(make_result("a", 1))
+
+
+def test_spill_round_trip(tmp_path):
+    """Test that spilled results reload unchanged"""
+    result = make_result("quiz.txt")
+    path = tmp_path / "result.json.gz"
+    
+    write_spilled(result, path)
+    
+    assert load_spilled(path) == result
+    assert os.listdir(tmp_path) == ["result.json.gz"]
+
+
+def test_history_spills_least_recently_used(tmp_path):
+    """Test that entries beyond the memory budget are spilled and reloaded"""
+    size = estimate_size(make_result("a"))
+    history = ResultHistory(memory_budget=int(size * 2.5), directory=tmp_path)
+    first = history.add(make_result("a"))
+    second = history.add(make_result("b"))
+    third = history.add(make_result("c"))
+    
+    assert not first.in_memory and first.path.exists()
+    assert second.in_memory and third.in_memory
+    assert history.memory_used() <= history.memory_budget
+    
+    assert history.get(first.entry_id).source == "a"
+    
+    # Reloading the first makes the second the least recently used
+    assert first.in_memory
+    assert not second.in_memory
+    assert [entry.source for entry in history.entries()] == ["c", "b", "a"]
+
+
+def test_history_keeps_most_recent_entry_over_budget(tmp_path):
+    """Test that the newest result stays in memory even if it alone exceeds the budget"""
+    history = ResultHistory(memory_budget=1, directory=tmp_path)
+    entry = history.add(make_result("big"))
+    
+    assert entry.in_memory
+
+
+def test_history_max_entries_and_replace(tmp_path):
+    """Test dropping the oldest entries and replacing an entry"""
+    history = ResultHistory(max_entries=2, directory=tmp_path)
+    first = history.add(make_result("a"))
+    second = history.add(make_result("b"))
+    third = history.add(make_result("c"), replaces=second.entry_id)
+    history.add(make_result("d"))
+    
+    assert [entry.source for entry in history.entries()] == ["d", "c"]
+    with pytest.raises(KeyError):
+        history.get(first.entry_id)
+    assert history.get(third.entry_id).source == "c"
+
+
+def test_history_background_spill_and_close(tmp_path):
+    """Test spilling on a background writer and cleanup of the temp directory"""
+    history = ResultHistory(memory_budget=1, background=True)
+    first = history.add(make_result("a"))
+    history.add(make_result("b"))
+    assert history.wait(timeout=5)
+    
+    assert not first.in_memory and first.path.exists()
+    assert history.get(first.entry_id).source == "a"
+    
+    directory = history.directory
+    history.close()
+    assert not directory.exists()
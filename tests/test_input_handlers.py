@@ -5,7 +5,8 @@ import tempfile
 import os
 from pathlib import Path
 from question_maker.input_handlers import (
-    FileSource, StringSource, URLSource, create_source
+    FileSource, StringSource, URLSource, create_source,
+    ContentCache, resolve_locator
 )
 
 
@@ -90,3 +91,70 @@ def test_create_source_auto_detect_string():
     # Non-existent file path should be treated as string
     source = create_source("/nonexistent/path.txt")
     assert isinstance(source, StringSource)
+
+
+def test_content_cache_in_memory():
+    """Test storing and resolving text in an in-memory cache"""
+    cache = ContentCache()
+    locator = cache.put("abc", "Cached text")
+    
+    assert locator == "cache:abc"
+    assert resolve_locator(locator, cache) == "Cached text"
+    
+    cache.discard("abc")
+    with pytest.raises(KeyError):
+        cache.get("abc")
+
+
+def test_content_cache_spills_beyond_memory_budget():
+    """Test that least recently used texts move to disk and still resolve"""
+    cache = ContentCache(memory_budget=10)
+    cache.put("a", "first")
+    cache.put("b", "second")
+    cache.get("a")  # Now the most recently used
+    cache.put("c", "third")
+    
+    assert cache.memory_used <= 10
+    assert [cache.get(key) for key in "abc"] == ["first", "second", "third"]
+    
+    spill_directory = cache._spill_directory
+    assert (spill_directory / "b.txt").exists()
+    cache.discard("b")
+    with pytest.raises(KeyError):
+        cache.get("b")
+    
+    del cache
+    assert not spill_directory.exists()
+
+
+def test_content_cache_on_disk():
+    """Test a directory-backed cache"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ContentCache(temp_dir)
+        locator = cache.put("abc", "Disk text")
+        
+        assert (Path(temp_dir) / "abc.txt").exists()
+        assert resolve_locator(locator, ContentCache(temp_dir)) == "Disk text"
+
+
+def test_resolve_file_locator():
+    """Test resolving a plain file path locator"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+        f.write("File text")
+        temp_file = f.name
+    
+    try:
+        assert resolve_locator(temp_file) == "File text"
+    finally:
+        os.unlink(temp_file)
+
+
+def test_import_does_not_load_http_stack():
+    """Test that importing the package for local text leaves requests and numpy unloaded"""
+    import subprocess
+    import sys
+    code = ("import sys, question_maker; "
+            "print('requests' in sys.modules, 'numpy' in sys.modules)")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert output.stdout.strip() == 'False False'
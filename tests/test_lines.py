@@ -0,0 +1,69 @@
+"""Tests for the line-offset index"""
+
+import pytest
+from question_maker import lines
+from question_maker import TextTransformer
+from question_maker.lines import LineIndex, get_line_index, share_line_index
+from question_maker.text_transformer import basic_stats_processor
+
+
+TEXT = "first line\r\nsecond\n\nfourth é line\nlast"
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def index(request, monkeypatch):
+    """A LineIndex built with and without NumPy"""
+    if request.param == 'python':
+        monkeypatch.setattr(lines, '_np', False)
+    else:
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(lines, '_NUMPY_MIN_CHARS', 0)
+        monkeypatch.setattr(lines, '_SCAN_CHUNK_CHARS', 8)
+    return LineIndex(TEXT)
+
+
+def test_line_index_round_trips_every_offset(index):
+    """Test offset -> (line, column) -> offset for every position in the text"""
+    assert len(index) == TEXT.count('\n') + 1
+    for offset in range(len(TEXT) + 1):
+        line, column = index.position(offset)
+        assert TEXT.split('\n')[line - 1][:column] == TEXT[offset - column:offset]
+        assert index.offset(line, column) == offset
+    assert index.positions(range(len(TEXT) + 1)) == [index.position(o) for o in range(len(TEXT) + 1)]
+
+
+def test_line_index_spans_and_errors(index):
+    """Test line spans exclude newlines and out-of-range lookups raise IndexError"""
+    assert index.line_span(1) == (0, len("first line\r"))
+    assert index.line_span(3) == (19, 19)
+    assert index.line_span(5) == (len(TEXT) - 4, len(TEXT))
+    assert index.position(TEXT.index("é")) == (4, 7)
+    
+    with pytest.raises(IndexError):
+        index.line_of(len(TEXT) + 1)
+    with pytest.raises(IndexError):
+        index.offset(2, 7)
+    with pytest.raises(IndexError):
+        index.line_span(0)
+
+
+def test_line_index_shared_between_processors_and_kept_on_result():
+    """Test that processors in one transform build a single index, kept by the result"""
+    built = []
+    
+    def line_processor(text):
+        built.append(get_line_index(text))
+        return {}
+    
+    transformer = TextTransformer()
+    transformer.add_processor(basic_stats_processor)
+    transformer.add_processor(line_processor)
+    result = transformer.transform(TEXT, source_type='string')
+    
+    assert result.extracted_data['line_count'] == 5
+    assert result.line_index() is built[0]
+    assert 'line_index' not in str(result.to_dict())
+    
+    with share_line_index(TEXT):
+        assert get_line_index(TEXT) is get_line_index(TEXT)
+    assert get_line_index(TEXT) is not get_line_index(TEXT)
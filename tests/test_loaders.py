@@ -0,0 +1,112 @@
+"""Tests for loading exported results"""
+
+import json
+import os
+import tempfile
+
+import pytest
+from question_maker import TextTransformer, StructuredData, MultipleChoiceQuestion
+from question_maker.text_transformer import basic_stats_processor, extract_multiple_choice_questions
+from question_maker.exporters import export_result
+from question_maker.loaders import load_result, iter_questions, iter_question_dicts, _IncrementalReader
+
+
+QUIZ_TEXT = """What is the capital of France?
+A London
+B Paris
+C Berlin
+
+Which planet is closest to the Sun?
+A Venus
+B Mercury"""
+
+
+def make_result():
+    transformer = TextTransformer()
+    transformer.add_processor(extract_multiple_choice_questions)
+    transformer.add_processor(basic_stats_processor)
+    return transformer.transform(QUIZ_TEXT, source_type='string')
+
+
+@pytest.fixture
+def export_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "results.json")
+        export_result(make_result(), {'json': path})
+        yield path
+
+
+def test_structured_data_round_trip():
+    """Test rebuilding StructuredData from to_dict()"""
+    result = make_result()
+    
+    loaded = StructuredData.from_dict(result.to_dict())
+    
+    assert loaded == result
+    assert StructuredData.from_json(json.dumps(result.to_dict())) == result
+
+
+def test_from_dict_legacy_and_future_versions():
+    """Test that unversioned dicts load and newer versions are rejected"""
+    legacy = {'source': 'string', 'content': 'text', 'extracted_data': {}, 'metadata': {},
+              'timestamp': '2025-01-01T00:00:00'}
+    assert StructuredData.from_dict(legacy).source == 'string'
+    
+    with pytest.raises(ValueError):
+        StructuredData.from_dict(dict(legacy, schema_version=99))
+
+
+def test_get_questions_returns_typed_objects():
+    """Test converting extracted question dicts to MultipleChoiceQuestion"""
+    questions = make_result().get_questions()
+    
+    assert all(isinstance(q, MultipleChoiceQuestion) for q in questions)
+    assert questions[0].options['B'] == "Paris"
+    assert questions[1].question_number == 2
+
+
+def test_load_result(export_path):
+    """Test loading a whole export file"""
+    loaded = load_result(export_path)
+    
+    assert loaded.source == "string"
+    assert loaded.get_questions() == make_result().get_questions()
+
+
+def test_iter_questions(export_path):
+    """Test streaming questions from an export file"""
+    questions = list(iter_questions(export_path))
+    
+    assert [q.question for q in questions] == [
+        "What is the capital of France?", "Which planet is closest to the Sun?"]
+    assert questions[1].options == {'A': 'Venus', 'B': 'Mercury'}
+
+
+def test_iter_questions_small_chunks(export_path, monkeypatch):
+    """Test that values split across read chunks are decoded correctly"""
+    import question_maker.loaders as loaders
+    monkeypatch.setattr(loaders, '_CHUNK_SIZE', 7)
+    
+    questions = list(iter_question_dicts(export_path))
+    
+    with open(export_path, encoding='utf-8') as f:
+        assert questions == json.load(f)['extracted_data']['multiple_choice_questions']
+
+
+def test_reader_does_not_truncate_numbers():
+    """Test that a number at the end of a chunk is not decoded early"""
+    import io
+    reader = _IncrementalReader(io.StringIO('[12345, 6]'), chunk_size=3)
+    
+    assert list(reader.array_items()) == [12345, 6]
+
+
+def test_iter_questions_rejects_newer_schema():
+    """Test the schema version check in the streaming reader"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "future.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'schema_version': 99, 'extracted_data': {}}, f)
+        
+        with pytest.raises(ValueError):
+            list(iter_questions(path))
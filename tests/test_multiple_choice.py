@@ -1,6 +1,7 @@
 """Tests for multiple-choice question extraction"""
 
 import pytest
+from dataclasses import asdict
 from question_maker import TextTransformer, MultipleChoiceQuestion
 from question_maker.text_transformer import extract_multiple_choice_questions
 
@@ -36,6 +37,7 @@ def test_multiple_choice_question_to_dict():
     assert result['question'] == "Test question?"
     assert result['options']['A'] == "Option A"
     assert result['question_number'] == 1
+    assert result == asdict(question)
 
 
 def test_multiple_choice_question_full_text():
@@ -205,4 +207,185 @@ E It is located in the mitochondria."""
     # Verify all questions have 5 options (A through E)
     for question in questions:
         assert len(question['options']) == 5
-        assert all(label in question['options'] for label in ['A', 'B', 'C', 'D', 'E'])
\ No newline at end of file
+        assert all(label in question['options'] for label in ['A', 'B', 'C', 'D', 'E'])
+
+def test_iter_multiple_choice_questions_yields_objects():
+    """Test the generator form of the question parser"""
+    from question_maker.text_transformer import iter_multiple_choice_questions
+    text = """What is 2 + 2?
+A 3
+B 4
+
+Not a question
+
+Which is larger?
+A 1
+B 2"""
+    
+    questions = list(iter_multiple_choice_questions(text))
+    
+    assert [q.question for q in questions] == ["What is 2 + 2?", "Which is larger?"]
+    assert questions[1].question_number == 3
+    assert questions[1].end_position == len(text)
+
+
+def test_extract_numbered_questions_with_dotted_options():
+    """Test a numbered bank with 'A.' options and CRLF line endings"""
+    text = ("1. What is 2 + 2?\r\nA. 3\r\nB. 4\r\n\r\n"
+            "Q7: Which is larger?\r\nA. 1\r\nB. 2\r\n")
+    
+    result = extract_multiple_choice_questions(text)
+    
+    assert result['question_format'] == "letter_dot+numbered"
+    questions = result['multiple_choice_questions']
+    assert [q['question'] for q in questions] == ["What is 2 + 2?", "Which is larger?"]
+    assert [q['question_number'] for q in questions] == [1, 7]
+    assert questions[0]['options'] == {'A': "3", 'B': "4"}
+    assert text[questions[1]['start_position']:].startswith("Q7:")
+
+
+def test_extract_questions_with_lowercase_options_normalizes_labels():
+    """Test that '(a)' style labels are stored as capital letters"""
+    text = """Which gas do plants absorb?
+(a) Oxygen
+(b) Carbon dioxide
+(c) Nitrogen"""
+    
+    result = extract_multiple_choice_questions(text)
+    
+    assert result['question_format'] == "enclosed"
+    assert result['multiple_choice_questions'][0]['options'] == {
+        'A': "Oxygen", 'B': "Carbon dioxide", 'C': "Nitrogen"}
+
+
+def test_extract_questions_with_explicit_grammar():
+    """Test overriding format detection"""
+    text = "Pick one\nA) yes\nB) no"
+    
+    assert extract_multiple_choice_questions(text, grammar="letter")['question_count'] == 0
+    assert extract_multiple_choice_questions(text, grammar="letter_paren")['question_count'] == 1
+
+
+def test_extract_wrapped_stems_and_options():
+    """Test joining continuation lines of stems and options"""
+    text = """Which of the following statements regarding
+glutamate dehydrogenase is INCORRECT?
+A It can use either NAD+ or NADP+
+  as a coenzyme.
+B It catalyses an essentially reversible
+reaction.
+C It is located in the mitochondria.
+Which planet is closest to the Sun?
+A Venus
+B Mercury"""
+    
+    result = extract_multiple_choice_questions(text)
+    questions = result['multiple_choice_questions']
+    
+    assert [q['question'] for q in questions] == [
+        "Which of the following statements regarding glutamate dehydrogenase is INCORRECT?",
+        "Which planet is closest to the Sun?"]
+    assert questions[0]['options'] == {
+        'A': "It can use either NAD+ or NADP+ as a coenzyme.",
+        'B': "It catalyses an essentially reversible reaction.",
+        'C': "It is located in the mitochondria."}
+    assert questions[0]['start_position'] == 0
+    assert questions[0]['end_position'] == text.index("Which planet")
+    assert [q['question_number'] for q in questions] == [1, 2]
+
+
+def test_extract_wrapped_numbered_questions():
+    """Test that numbered lines start questions and blank lines end stems"""
+    text = """Chapter 3 review
+
+1. Which enzyme
+   catalyses the first step?
+a) Hexokinase
+b) Aldolase
+Answer: a
+2. Which is larger?
+a) 1
+b) 2"""
+    
+    result = extract_multiple_choice_questions(text)
+    questions = result['multiple_choice_questions']
+    
+    assert result['question_format'] == "lower+numbered"
+    assert [q['question'] for q in questions] == ["Which enzyme catalyses the first step?", "Which is larger?"]
+    assert questions[0]['options'] == {'A': "Hexokinase", 'B': "Aldolase"}
+    assert questions[0]['start_position'] == text.index("1. Which")
+    assert questions[0]['end_position'] == text.index("Answer: a")
+
+
+def test_restarting_option_labels_start_a_new_question():
+    """Test that options going back to A end the question instead of overwriting it"""
+    text = "What is 2+2?\nA 3\nB 4\nwhich is bigger?\nA 1\nB 2\nA 5\nB 6"
+    
+    questions = extract_multiple_choice_questions(text)['multiple_choice_questions']
+    
+    assert [(q['question'], q['options']) for q in questions] == [
+        ("What is 2+2?", {'A': "3", 'B': "4"}),
+        ("which is bigger?", {'A': "1", 'B': "2"}),
+        ("", {'A': "5", 'B': "6"}),
+    ]
+    assert questions[0]['end_position'] == text.index("which")
+    assert questions[1]['start_position'] == text.index("which")
+    assert questions[2]['start_position'] == text.index("A 5")
+
+
+def test_heading_above_question_is_not_part_of_stem():
+    """Test that an unindented, capitalized line directly above a stem starts its own stem"""
+    text = "Chapter 3 Quiz\nWhat is 2+2?\nA 3\nB 4\nInstructions: pick one\nWhich is larger?\nA 1\nB 2"
+    
+    questions = extract_multiple_choice_questions(text)['multiple_choice_questions']
+    
+    assert [q['question'] for q in questions] == ["What is 2+2?", "Which is larger?"]
+    assert questions[0]['start_position'] == text.index("What")
+
+
+def make_mixed_bank(count, numbered):
+    """A bank mixing wrapped stems and options, blank lines, answers and stray text"""
+    lines = []
+    for number in range(1, count + 1):
+        stem = f"{number}. Which enzyme" if numbered else "Which enzyme"
+        lines += [stem, f"  acts in step {number}?"]
+        lines += ["A. Hexokinase", "   (first step)", "B. Aldolase", "C. enolase"]
+        if number % 3 == 0:
+            lines.append("Answer: B")
+        if number % 4 == 0:
+            lines += ["", "Stray text without options", ""]
+        elif number % 5 == 0:
+            lines.append("")
+    return "\r\n".join(lines)
+
+
+@pytest.mark.parametrize("numbered", [True, False])
+def test_parallel_extraction_matches_sequential(monkeypatch, numbered):
+    """Test that chunked parallel parsing gives exactly the sequential result"""
+    from question_maker import text_transformer
+    text = make_mixed_bank(300, numbered)
+    sequential = extract_multiple_choice_questions(text)
+    
+    monkeypatch.setattr(text_transformer, '_PARALLEL_MIN_CHARS', 0)
+    monkeypatch.setattr(text_transformer, '_PARALLEL_CHUNK_CHARS', 1000)
+    grammar = text_transformer.detect_grammar(text)
+    assert len(text_transformer._chunk_boundaries(text, grammar, 1000)) > 10
+    
+    parallel = extract_multiple_choice_questions(text, max_workers=2)
+    
+    assert parallel == sequential
+    assert sequential['question_count'] == 300
+
+
+def test_chunk_boundaries_start_new_questions():
+    """Test that every chunk boundary falls on the first character of a stem"""
+    from question_maker.text_transformer import _chunk_boundaries, detect_grammar
+    text = make_mixed_bank(100, numbered=False)
+    
+    boundaries = _chunk_boundaries(text, detect_grammar(text), 500)
+    
+    assert boundaries[0] == 0 and boundaries[-1] == len(text)
+    assert len(boundaries) > 10
+    for boundary in boundaries[1:-1]:
+        assert text[boundary - 1] == '\n'
+        assert text.startswith(("Which enzyme", "Stray text"), boundary)
@@ -0,0 +1,113 @@
+"""Tests for BM25-ranked question search"""
+
+import math
+import random
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from question_maker import MultipleChoiceQuestion, StructuredData
+from question_maker import ranking
+from question_maker.ranking import QuestionIndex
+from question_maker.search import tokenize
+
+
+QUESTIONS = [
+    {'question': "Which enzyme is subject to allosteric regulation?",
+     'options': {'A': "Glutamate dehydrogenase", 'B': "Hexokinase"}},
+    {'question': "Glutamate dehydrogenase regulation involves which effector?",
+     'options': {'A': "GTP", 'B': "ADP"}},
+    {'question': "What is the capital of France?", 'options': {'A': "Paris", 'B': "Lyon"}},
+    {'question': "Which amino acid is glutamate derived from?", 'options': {'A': "Alpha-ketoglutarate"}},
+]
+
+
+def brute_force_bm25(questions, query, k1=1.2, b=0.75):
+    """Score every question against every query term"""
+    documents = [Counter(tokenize(' '.join([q['question'], *q['options'].values()]))) for q in questions]
+    lengths = [sum(document.values()) for document in documents]
+    average = sum(lengths) / len(lengths)
+    scores = [0.0] * len(documents)
+    for term in set(tokenize(query)):
+        df = sum(1 for document in documents if term in document)
+        if not df:
+            continue
+        idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+        for i, document in enumerate(documents):
+            tf = document.get(term, 0)
+            if tf:
+                scores[i] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[i] / average))
+    return scores
+
+
+def make_bank(count, seed=0):
+    """Questions over a Zipf-like vocabulary, so some words are very common"""
+    generator = random.Random(seed)
+    words = [f"w{i}" for i in range(400)]
+    weights = [1 / (i + 1) for i in range(400)]
+    return [{'question': ' '.join(generator.choices(words, weights, k=12)),
+             'options': {'A': ' '.join(generator.choices(words, weights, k=3))}}
+            for _ in range(count)]
+
+
+def test_search_ranks_by_bm25():
+    """Test that the best match for a multi-word query comes first"""
+    index = QuestionIndex()
+    index.add_questions(QUESTIONS)
+    
+    hits = index.search("glutamate dehydrogenase regulation", k=3)
+    
+    assert [key for key, _ in hits] == [1, 0, 3]
+    expected = brute_force_bm25(QUESTIONS, "glutamate dehydrogenase regulation")
+    assert [score for _, score in hits] == pytest.approx([expected[1], expected[0], expected[3]], rel=1e-5)
+    assert index.search("unknown words") == []
+    assert index.search("") == []
+
+
+@pytest.mark.parametrize("query", ["w0 w1 w2", "w3 w250", "w399 w0", "w5", "w1 w2 w3 w4 w5 w6 w7 w8"])
+def test_pruned_top_k_matches_exhaustive_scoring(monkeypatch, query):
+    """Test MaxScore pruning and segment merging against scoring every question"""
+    monkeypatch.setattr(ranking, '_FLUSH_QUESTIONS', 97)
+    questions = make_bank(2000)
+    index = QuestionIndex()
+    index.add_questions(questions)
+    
+    hits = index.search(query, k=10)
+    
+    scores = brute_force_bm25(questions, query)
+    expected = sorted(range(len(scores)), key=lambda i: (-scores[i], i))[:10]
+    assert [score for _, score in hits] == pytest.approx([scores[i] for i in expected], rel=1e-4)
+    assert len(index._segments) < 8
+
+
+def test_add_result_keys_and_incremental_adds():
+    """Test (source, question_number) keys and questions added after a search"""
+    index = QuestionIndex()
+    index.add_result(StructuredData(source='bio.txt', content=None, extracted_data={
+        'multiple_choice_questions': [dict(question, question_number=n) for n, question in enumerate(QUESTIONS, 1)]}))
+    assert index.search("capital france", k=1)[0][0] == ('bio.txt', 3)
+    
+    index.add('extra', MultipleChoiceQuestion(question="Capital of France and its capital city?"))
+    
+    assert index.search("capital", k=1)[0][0] == 'extra'
+    assert len(index) == 5
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load(tmp_path, mmap):
+    """Test that a loaded (memory-mapped) index answers like the original and can grow"""
+    index = QuestionIndex(k1=1.5, b=0.5)
+    index.add_result(StructuredData(source='bio.txt', content=None, extracted_data={
+        'multiple_choice_questions': [dict(question, question_number=n) for n, question in enumerate(QUESTIONS, 1)]}))
+    index.save(tmp_path / "index")
+    
+    loaded = QuestionIndex.load(tmp_path / "index", mmap=mmap)
+    
+    assert isinstance(loaded._segments[0].doc_ids, np.memmap) == mmap
+    assert loaded.search("glutamate dehydrogenase") == index.search("glutamate dehydrogenase")
+    assert loaded.search("france", k=1)[0][0] == ('bio.txt', 3)
+    
+    loaded.add('new', {'question': "Glutamate glutamate glutamate", 'options': {}})
+    assert loaded.search("glutamate", k=1)[0][0] == 'new'
@@ -0,0 +1,73 @@
+"""Tests for the question search index"""
+
+from question_maker.search import QuestionSearchIndex, match_spans, tokenize
+
+
+QUESTIONS = [
+    {'question': "What is the capital of France?", 'options': {'A': "Paris", 'B': "Lyon"}},
+    {'question': "Which enzyme breaks down starch?", 'options': {'A': "Amylase", 'B': "Lipase"}},
+    {'question': "What is the capital of Spain?", 'options': {'A': "Madrid", 'B': "Paris"}},
+    {'question': "Name the largest planet", 'options': {}},
+]
+
+
+def test_tokenize():
+    """Test lowercased word tokens"""
+    assert tokenize("What's the Capital?") == ['what', 's', 'the', 'capital']
+
+
+def test_search_requires_every_token():
+    """Test that complete tokens are intersected"""
+    index = QuestionSearchIndex(QUESTIONS)
+    
+    assert index.search("capital ") == [0, 2]
+    assert index.search("capital paris ") == [0, 2]
+    assert index.search("capital france ") == [0]
+    assert index.search("capital mars ") == []
+
+
+def test_search_last_token_is_prefix():
+    """Test that the token being typed matches as a prefix"""
+    index = QuestionSearchIndex(QUESTIONS)
+    
+    assert index.search("capital fr") == [0]
+    assert index.search("ase") == []
+    assert index.search("lip") == [1]
+    assert index.search("p") == [0, 2, 3]
+
+
+def test_search_options_and_case():
+    """Test that option text is indexed and matching ignores case"""
+    index = QuestionSearchIndex(QUESTIONS)
+    
+    assert index.search("AMYLASE") == [1]
+    assert index.search("madrid spain") == [2]
+
+
+def test_empty_query_means_no_filter():
+    """Test that a blank query returns None"""
+    index = QuestionSearchIndex(QUESTIONS)
+    
+    assert index.search("") is None
+    assert index.search("  ?! ") is None
+
+
+def test_extend_adds_positions_and_invalidates_prefixes():
+    """Test incremental indexing of appended questions"""
+    index = QuestionSearchIndex(QUESTIONS[:2])
+    assert index.search("capi") == [0]
+    
+    index.extend(QUESTIONS[2:])
+    
+    assert len(index) == 4
+    assert index.search("capi") == [0, 2]
+    assert index.search("planet") == [3]
+
+
+def test_match_spans():
+    """Test highlighting spans use the same rules as searching"""
+    text = "What is the capital of France?"
+    
+    assert match_spans(text, "capital fr") == [(12, 19), (23, 29)]
+    assert match_spans(text, "the ") == [(8, 11)]
+    assert match_spans(text, "") == []
@@ -0,0 +1,81 @@
+"""Tests for offset-based text segmentation"""
+
+import pytest
+from question_maker.data_models import TextSegment
+from question_maker.segments import (
+    ParagraphSegmenter, SegmentSpans, iter_paragraph_spans, split_paragraphs, split_sentences
+)
+
+
+def test_split_sentences_skips_abbreviations_and_decimals():
+    """Test that abbreviations, initials and decimals do not end sentences"""
+    text = "Dr. Smith added 3.5 mL, e.g. as in Fig. 2. It worked! Did J. R. Tolkien agree? \"Yes.\""
+    
+    sentences = list(split_sentences(text).strings())
+    
+    assert sentences == ["Dr. Smith added 3.5 mL, e.g. as in Fig. 2.", "It worked!",
+                         "Did J. R. Tolkien agree?", "\"Yes.\""]
+
+
+def test_split_sentences_blank_lines_and_lowercase_continuation():
+    """Test blank-line boundaries, lower-case continuations and trailing text"""
+    text = "  A heading\n\nThe list ends etc. and more.\r\n\r\nNo final stop  \n"
+    
+    spans = split_sentences(text)
+    
+    assert list(spans.strings()) == ["A heading", "The list ends etc. and more.", "No final stop"]
+    for start, end in spans.spans():
+        assert not text[start].isspace() and not text[end - 1].isspace()
+
+
+def test_segment_spans_materialize_lazily():
+    """Test span access and TextSegment materialization"""
+    text = "One. Two."
+    spans = split_sentences(text)
+    
+    assert len(spans) == 2
+    assert spans.span(1) == (5, 9)
+    assert spans[-1] == TextSegment(text="Two.", start_position=5, end_position=9, category='sentence')
+    assert spans.to_list() == [[0, 4], [5, 9]]
+    assert spans.offsets.itemsize == 8
+    with pytest.raises(IndexError):
+        spans.span(2)
+
+
+def test_split_sentences_empty_text():
+    """Test that whitespace-only text has no sentences"""
+    assert len(split_sentences("")) == 0
+    assert len(split_sentences(" \n\n ")) == 0
+
+
+def test_split_paragraphs_handles_crlf_and_whitespace_lines():
+    """Test that any run of blank or whitespace-only lines separates paragraphs"""
+    text = "  First para\r\nline two \r\n\r\n \t\r\nSecond\n\n\n\nThird  "
+    
+    spans = split_paragraphs(text)
+    
+    assert list(spans.strings()) == ["First para\r\nline two", "Second", "Third"]
+    assert spans[0].start_position == 2
+    assert spans[-1] == TextSegment(text="Third", start_position=len(text) - 7,
+                                    end_position=len(text) - 2, category='paragraph')
+    assert len(split_paragraphs(" \n\r\n ")) == 0
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_iter_paragraph_spans_matches_whole_text(chunk_size):
+    """Test that chunked segmentation gives the same offsets wherever chunks split"""
+    text = "Alpha\r\n  beta\r\n \r\n\r\nGamma delta.\n\t\n\nEpsilon\n" * 5
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    
+    assert list(iter_paragraph_spans(chunks)) == list(split_paragraphs(text).spans())
+    assert len(split_paragraphs(text)) == 11  # "Epsilon" runs on into the next "Alpha"
+
+
+def test_paragraph_segmenter_keeps_only_the_current_line():
+    """Test that completed paragraphs are returned as soon as a blank line arrives"""
+    segmenter = ParagraphSegmenter()
+    
+    assert segmenter.feed("One\ntwo") == []
+    assert segmenter.feed("\n\nThree") == [(0, 7)]
+    assert segmenter._carry == "Three"
+    assert segmenter.close() == [(9, 14)]
@@ -0,0 +1,143 @@
+"""Tests for the SQLite question store"""
+
+import os
+import tempfile
+
+import pytest
+from question_maker import TextTransformer, QuestionStore
+from question_maker.text_transformer import extract_multiple_choice_questions
+from question_maker.store import question_hash
+
+
+QUIZ_TEXT = """What is the capital of France?
+A London
+B Paris
+C Berlin
+
+Which enzyme regulates glutamate deamination?
+A Glutamate dehydrogenase
+B Hexokinase
+C Amylase"""
+
+
+def make_result(source="string"):
+    transformer = TextTransformer()
+    transformer.add_processor(extract_multiple_choice_questions)
+    result = transformer.transform(QUIZ_TEXT, source_type='string')
+    result.source = source
+    return result
+
+
+def test_add_result_and_count():
+    """Test storing a result's questions"""
+    with QuestionStore() as store:
+        stored = store.add_result(make_result())
+        
+        assert stored == 2
+        assert store.count_questions() == 2
+        assert store.count_questions("string") == 2
+        assert store.count_questions("other") == 0
+
+
+def test_add_results_in_batches():
+    """Test that batching across several flushes keeps every question"""
+    with QuestionStore(batch_size=3) as store:
+        stored = store.add_results(make_result(f"doc{i}") for i in range(5))
+        
+        assert stored == 10
+        assert store.count_questions() == 10
+        assert store.get_sources() == [f"doc{i}" for i in range(5)]
+        ids = [q['id'] for q in store.iter_questions()]
+        assert ids == sorted(set(ids))
+
+
+def test_get_question_by_number():
+    """Test looking up a question by source and number"""
+    with QuestionStore() as store:
+        store.add_result(make_result("quiz.txt"))
+        
+        question = store.get_question("quiz.txt", 1)
+        assert question['question'] == "What is the capital of France?"
+        assert question['options']['B'] == "Paris"
+        assert store.get_question("quiz.txt", 99) is None
+
+
+def test_find_by_hash_across_sources():
+    """Test that identical questions share a content hash"""
+    with QuestionStore() as store:
+        store.add_results([make_result("a.txt"), make_result("b.txt")])
+        
+        first = next(store.iter_questions("a.txt"))
+        copies = store.find_by_hash(question_hash(first))
+        
+        assert [q['source'] for q in copies] == ["a.txt", "b.txt"]
+
+
+def test_search_question_and_option_text():
+    """Test full-text search over questions and options"""
+    with QuestionStore() as store:
+        store.add_result(make_result())
+        
+        by_question = store.search("capital")
+        assert len(by_question) == 1
+        assert by_question[0]['question_number'] == 1
+        
+        by_option = store.search("dehydrogenase")
+        assert len(by_option) == 1
+        assert by_option[0]['question'].startswith("Which enzyme")
+        
+        assert store.search("nonexistentword") == []
+
+
+@pytest.mark.parametrize("query", ["3.5", "what's", "four-point-five", "A OR", 'say "hi', "(x", "*", "NEAR(", ""])
+def test_search_treats_punctuation_literally(query):
+    """Test that queries with FTS5 syntax characters search instead of raising"""
+    with QuestionStore() as store:
+        store.add_result(make_result())
+        
+        assert isinstance(store.search(query), list)
+
+
+def test_search_matches_punctuated_words():
+    """Test that punctuated words and operator words match the stored text"""
+    result = make_result()
+    result.extracted_data['multiple_choice_questions'].append({
+        'question': "What's 3.5 rounded, four-point-five OR so?",
+        'options': {'A': "4", 'B': "3"}, 'question_number': 3,
+        'start_position': 0, 'end_position': 0})
+    with QuestionStore() as store:
+        store.add_result(result)
+        
+        for query in ["3.5", "what's", "four-point-five", "five OR", '"rounded']:
+            assert [q['question_number'] for q in store.search(query)] == [3], query
+
+
+def test_search_without_fts_matches_every_word_literally():
+    """Test the substring fallback used when SQLite has no FTS5"""
+    with QuestionStore() as store:
+        store.has_fts = False
+        store.add_result(make_result())
+        
+        def numbers(query):
+            return [q['question_number'] for q in store.search(query)]
+        
+        assert numbers("deamination glutamate") == [2]
+        assert numbers("capital Paris") == [1]
+        assert numbers("Paris Hexokinase") == []
+        assert numbers("%") == []
+        assert numbers("_") == []
+        assert numbers("  ") == []
+
+
+def test_store_persists_to_file():
+    """Test reopening a file-backed store"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "questions.db")
+        with QuestionStore(path) as store:
+            store.add_result(make_result())
+        
+        with QuestionStore(path) as store:
+            assert store.count_questions() == 2
+            store.add_result(make_result("second"))
+            assert store.count_questions() == 4
+            assert len(store.search("Paris")) == 2
@@ -3,7 +3,8 @@
 import pytest
 import tempfile
 import os
-from question_maker import TextTransformer
+import time
+from question_maker import TextTransformer, OperationCancelled
 from question_maker.text_transformer import (
     basic_stats_processor, 
     extract_sentences, 
@@ -84,10 +85,11 @@ def test_extract_sentences():
     text = "First sentence. Second sentence! Third sentence?"
     result = extract_sentences(text)
     
-    assert 'sentences' in result
+    assert 'sentence_spans' in result
     assert 'sentence_count' in result
     assert result['sentence_count'] == 3
-    assert len(result['sentences']) == 3
+    assert [text[start:end] for start, end in result['sentence_spans']] == [
+        "First sentence.", "Second sentence!", "Third sentence?"]
 
 
 def test_extract_paragraphs():
@@ -95,10 +97,11 @@ def test_extract_paragraphs():
     text = "First paragraph.\n\nSecond paragraph.\n\nThird paragraph."
     result = extract_paragraphs(text)
     
-    assert 'paragraphs' in result
+    assert 'paragraph_spans' in result
     assert 'paragraph_count' in result
     assert result['paragraph_count'] == 3
-    assert len(result['paragraphs']) == 3
+    assert [text[start:end] for start, end in result['paragraph_spans']] == [
+        "First paragraph.", "Second paragraph.", "Third paragraph."]
 
 
 def test_multiple_processors():
@@ -111,7 +114,7 @@ def test_multiple_processors():
     result = transformer.transform(text, source_type='string')
     
     assert 'word_count' in result.extracted_data
-    assert 'sentences' in result.extracted_data
+    assert 'sentence_spans' in result.extracted_data
     assert 'sentence_count' in result.extracted_data
 
 
@@ -160,3 +163,273 @@ def test_metadata_added():
     assert 'processor_count' in result.metadata
     assert result.metadata['text_length'] == 4
     assert result.metadata['processor_count'] == 1
+
+
+def test_transform_content_by_reference_file():
+    """Test that file results hold a locator instead of the text"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+        f.write("Referenced file content.")
+        temp_file = f.name
+    
+    try:
+        transformer = TextTransformer(keep_content=False)
+        transformer.add_processor(basic_stats_processor)
+        
+        result = transformer.transform(temp_file, source_type='file')
+        
+        assert result.content is None
+        assert result.content_locator == result.source
+        assert result.get_content_length() == len("Referenced file content.")
+        assert result.extracted_data['word_count'] == 3
+        assert result.load_content() == "Referenced file content."
+    finally:
+        os.unlink(temp_file)
+
+
+def test_transform_content_by_reference_string():
+    """Test that string results are reloaded through the content cache"""
+    from question_maker.input_handlers import ContentCache
+    cache = ContentCache()
+    transformer = TextTransformer(keep_content=False, content_cache=cache)
+    
+    result = transformer.transform("Cached text", source_type='string')
+    
+    assert result.content is None
+    assert result.content_locator.startswith("cache:")
+    assert result.load_content(cache) == "Cached text"
+    assert result.to_dict()["content"] is None
+
+
+def test_transform_reports_progress_and_streams_questions():
+    """Test that a ProcessingContext receives file progress and questions"""
+    from question_maker.progress import ProcessingContext
+    from question_maker.text_transformer import extract_multiple_choice_questions
+    
+    text = "What is 2 + 2?\nA 3\nB 4\n\nWhat is 3 + 3?\nA 6\nB 9\n"
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+        f.write(text)
+        temp_file = f.name
+    
+    try:
+        progress, questions = [], []
+        context = ProcessingContext(on_progress=lambda *args: progress.append(args),
+                                    on_question=questions.append)
+        transformer = TextTransformer()
+        transformer.add_processor(basic_stats_processor)
+        transformer.add_processor(extract_multiple_choice_questions)
+        
+        result = transformer.transform(temp_file, source_type='file', context=context)
+        
+        assert ('reading', len(text), len(text)) in progress
+        assert progress[-1] == ('extract_multiple_choice_questions', len(text), len(text))
+        assert [stage for stage, _, _ in progress].count('basic_stats_processor') >= 1
+        assert questions == result.extracted_data['multiple_choice_questions']
+        assert questions[0] is result.extracted_data['multiple_choice_questions'][0]
+    finally:
+        os.unlink(temp_file)
+
+
+def test_transform_with_context_does_not_keep_processors():
+    """Test that processors run with a context are not kept alive afterwards"""
+    import functools
+    import gc
+    import weakref
+    from question_maker.progress import ProcessingContext
+    from question_maker.text_transformer import extract_multiple_choice_questions
+    
+    transformer = TextTransformer()
+    transformer.add_processor(functools.partial(extract_multiple_choice_questions, max_workers=1))
+    processor = weakref.ref(transformer.processors[0])
+    transformer.transform("What?\nA yes\nB no\n", 'string', ProcessingContext())
+    
+    transformer.processors.clear()
+    gc.collect()
+    assert processor() is None
+
+
+def test_progress_is_throttled():
+    """Test that progress callbacks are limited per stage"""
+    from question_maker.progress import ProcessingContext
+    calls = []
+    context = ProcessingContext(on_progress=lambda *args: calls.append(args), resolution=10)
+    
+    context.set_stage('work', 1000)
+    for done in range(1001):
+        context.report_progress(done)
+    
+    assert len(calls) <= 12
+    assert calls[-1] == ('work', 1000, 1000)
+
+
+def test_transform_cancelled_before_start():
+    """Test that a cancelled token stops transform before reading"""
+    from question_maker import ProcessingContext, CancellationToken, OperationCancelled
+    token = CancellationToken()
+    token.cancel()
+    transformer = TextTransformer()
+    transformer.add_processor(basic_stats_processor)
+    
+    with pytest.raises(OperationCancelled):
+        transformer.transform("text", source_type='string',
+                              context=ProcessingContext(cancel_token=token))
+
+
+def test_transform_cancelled_between_questions():
+    """Test cancelling from a question callback stops extraction"""
+    from question_maker import ProcessingContext, CancellationToken, OperationCancelled
+    from question_maker.text_transformer import extract_multiple_choice_questions
+    token = CancellationToken()
+    seen = []
+    
+    def on_question(question):
+        seen.append(question)
+        if len(seen) == 2:
+            token.cancel()
+    
+    text = "\n".join(f"Question {i}?\nA yes\nB no" for i in range(10))
+    transformer = TextTransformer()
+    transformer.add_processor(extract_multiple_choice_questions)
+    
+    with pytest.raises(OperationCancelled):
+        transformer.transform(text, source_type='string',
+                              context=ProcessingContext(on_question=on_question, cancel_token=token))
+    assert len(seen) == 2
+
+
+def test_transform_file_cancelled_while_reading(monkeypatch):
+    """Test that chunked file reads check for cancellation"""
+    from question_maker import ProcessingContext, CancellationToken, OperationCancelled
+    import question_maker.input_handlers as input_handlers
+    monkeypatch.setattr(input_handlers, 'READ_CHUNK_SIZE', 4)
+    
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+        f.write("word " * 100)
+        temp_file = f.name
+    
+    try:
+        token = CancellationToken()
+        reads = []
+        
+        def on_progress(stage, done, total):
+            reads.append(done)
+            if done > 0:
+                token.cancel()
+        
+        transformer = TextTransformer()
+        with pytest.raises(OperationCancelled):
+            transformer.transform(temp_file, source_type='file',
+                                  context=ProcessingContext(on_progress=on_progress, cancel_token=token))
+        assert len(reads) == 2
+    finally:
+        os.unlink(temp_file)
+
+
+def test_transform_batch_cancelled_between_inputs():
+    """Test that transform_batch stops at the next input once cancelled"""
+    from question_maker import ProcessingContext, CancellationToken, OperationCancelled
+    token = CancellationToken()
+    transformer = TextTransformer()
+    
+    def cancelling_processor(text):
+        token.cancel()
+        return {}
+    
+    transformer.add_processor(cancelling_processor)
+    
+    with pytest.raises(OperationCancelled):
+        transformer.transform_batch(["one", "two"], source_type='string',
+                                    context=ProcessingContext(cancel_token=token))
+
+
+def test_iter_transform_parallel_processes():
+    """Test that a process pool transforms every input with its processors"""
+    from question_maker.text_transformer import extract_multiple_choice_questions
+    transformer = TextTransformer()
+    transformer.add_processor(extract_multiple_choice_questions)
+    inputs = [f"Question {i}?\nA Yes\nB No" for i in range(4)]
+    
+    started = []
+    outcomes = list(transformer.iter_transform_parallel(inputs, 'string', max_workers=2,
+                                                        on_start=started.append))
+    
+    assert sorted(started) == [0, 1, 2, 3]
+    assert sorted(outcome.index for outcome in outcomes) == [0, 1, 2, 3]
+    for outcome in outcomes:
+        assert outcome.error is None
+        assert outcome.duration >= 0
+        questions = outcome.result.get_field('multiple_choice_questions')
+        assert questions[0]['question'] == f"Question {outcome.index}?"
+
+
+def test_iter_transform_parallel_reports_errors_per_input():
+    """Test that a failing input does not stop the rest of the batch"""
+    transformer = TextTransformer()
+    transformer.add_processor(basic_stats_processor)
+    
+    outcomes = {outcome.index: outcome for outcome in transformer.iter_transform_parallel(
+        ["hello world", "/no/such/file.txt"], 'file', max_workers=2, use_processes=False)}
+    
+    assert outcomes[1].result is None
+    assert isinstance(outcomes[1].error, FileNotFoundError)
+
+
+def test_transform_batch_parallel_matches_sequential():
+    """Test that transform_batch with workers returns results in input order"""
+    transformer = TextTransformer()
+    transformer.add_processor(basic_stats_processor)
+    inputs = ["one", "two words", "three more words"]
+    
+    sequential = transformer.transform_batch(inputs, source_type='string')
+    parallel = transformer.transform_batch(inputs, source_type='string', max_workers=2)
+    
+    assert [r.extracted_data for r in parallel] == [r.extracted_data for r in sequential]
+
+
+def endless_processor(text, context=None):
+    """Work until cancelled, then write the file named by the text (runs in worker processes)"""
+    deadline = time.monotonic() + 20
+    try:
+        while time.monotonic() < deadline:
+            if context is not None:
+                context.report_progress(0)
+            time.sleep(0.01)
+    except OperationCancelled:
+        with open(text, 'w') as f:
+            f.write("stopped")
+        raise
+    return {}
+
+
+@pytest.mark.parametrize("use_processes", [True, False])
+def test_iter_transform_parallel_cancel_stops_running_jobs(tmp_path, use_processes):
+    """Test that cancelling a batch stops jobs already running in the workers"""
+    from question_maker import CancellationToken
+    token = CancellationToken()
+    transformer = TextTransformer()
+    transformer.add_processor(endless_processor)
+    markers = [str(tmp_path / f"{i}.txt") for i in range(3)]
+    
+    outcomes = transformer.iter_transform_parallel(markers, 'string', max_workers=2,
+                                                   use_processes=use_processes, cancel_token=token,
+                                                   on_start=lambda index: index == 1 and token.cancel())
+    with pytest.raises(OperationCancelled):
+        list(outcomes)
+    
+    deadline = time.monotonic() + 5
+    while not all(os.path.exists(marker) for marker in markers[:2]) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert all(os.path.exists(marker) for marker in markers[:2])
+    assert not os.path.exists(markers[2])  # Never started
+
+
+def test_iter_transform_parallel_cancelled():
+    """Test that a cancelled token stops the batch"""
+    from question_maker import CancellationToken, OperationCancelled
+    token = CancellationToken()
+    token.cancel()
+    transformer = TextTransformer()
+    transformer.add_processor(basic_stats_processor)
+    
+    with pytest.raises(OperationCancelled):
+        list(transformer.iter_transform_parallel(["a", "b"], 'string', max_workers=2,
+                                                 use_processes=False, cancel_token=token))
@@ -0,0 +1,108 @@
+"""Tests for TF-IDF topic clustering"""
+
+import csv
+import io
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from question_maker import MultipleChoiceQuestion, StructuredData
+from question_maker.topics import assign_topics, build_tfidf, cluster_questions, kmeans_tfidf, tokenize
+from question_maker import topics
+from question_maker.exporters import CSVExporter, stream_result
+
+
+TOPIC_WORDS = [
+    ['enzyme', 'protein', 'amino', 'acid', 'glucose', 'catalyses', 'mitochondria', 'ketone'],
+    ['capital', 'river', 'mountain', 'country', 'ocean', 'continent', 'border', 'city'],
+    ['integer', 'prime', 'triangle', 'equation', 'derivative', 'matrix', 'angle', 'fraction'],
+]
+
+
+def make_bank(count, seed=0):
+    """Questions cycling through three topics, each built from its topic's words"""
+    generator = random.Random(seed)
+    questions = []
+    for index in range(count):
+        words = TOPIC_WORDS[index % 3]
+        questions.append({
+            'question': "Which of the " + ' '.join(generator.sample(words, 4)) + "?",
+            'options': {label: generator.choice(words) for label in "ABCD"},
+        })
+    return questions
+
+
+def test_tokenize_drops_stop_words_numbers_and_single_letters():
+    """Test the tokens that TF-IDF weights"""
+    assert tokenize("Which of the following is TRUE of 3 enzymes? A b") == ['enzymes']
+
+
+def test_build_tfidf_rows_are_normalized_and_rare_terms_dropped():
+    """Test vocabulary limits and L2-normalized rows"""
+    matrix = build_tfidf(["enzyme protein enzyme", "enzyme acid", "river city", "river protein", "unique"],
+                         min_df=2, max_df=0.5)
+    
+    assert sorted(matrix.vocabulary) == ['enzyme', 'protein', 'river']
+    assert matrix.shape == (5, 3)
+    norms = np.sqrt(np.add.reduceat(matrix.data ** 2, matrix.indptr[:-1][np.diff(matrix.indptr) > 0]))
+    assert np.allclose(norms, 1.0)
+    assert matrix.row_terms(4) == {}
+    # Sublinear term frequency: "enzyme" twice weighs more than "protein" once
+    first = matrix.row_terms(0)
+    assert first['enzyme'] > first['protein']
+    
+    limited = build_tfidf(["a1 enzyme protein", "enzyme protein", "enzyme"], min_df=1, max_df=1.0, max_features=1)
+    assert limited.vocabulary == ['enzyme']
+
+
+def test_cluster_questions_separates_topics(monkeypatch):
+    """Test that mini-batches (bounded by cells as well as rows) still find the topics"""
+    monkeypatch.setattr(topics, '_MAX_BATCH_CELLS', 3 * 200)
+    questions = make_bank(600)
+    questions.append(MultipleChoiceQuestion(question="?"))
+    
+    clusters = cluster_questions(questions, n_clusters=3, batch_size=64)
+    
+    labels = clusters.labels.tolist()
+    assert labels[-1] == -1  # No terms to cluster on
+    for topic in range(3):
+        assert len({labels[index] for index in range(topic, 600, 3)}) == 1
+    assert len(set(labels[:3])) == 3
+    assert sorted(clusters.sizes()) == [200, 200, 200]
+    assert all(0.5 < similarity <= 1.0 + 1e-6 for similarity in clusters.similarities[:600])
+    
+    terms = set(clusters.top_terms(labels[0], 8))
+    assert terms <= set(TOPIC_WORDS[0])
+
+
+def test_kmeans_caps_clusters_and_handles_empty_matrix():
+    """Test more clusters than rows, and no rows at all"""
+    matrix = build_tfidf(["enzyme protein", "river city"], min_df=1, max_df=1.0)
+    assert sorted(kmeans_tfidf(matrix, 10).labels.tolist()) == [0, 1]
+    
+    assert len(kmeans_tfidf(build_tfidf([]), 5).labels) == 0
+
+
+def test_assign_topics_records_topics_on_result():
+    """Test attaching topic ids and a per-topic summary to a result"""
+    result = StructuredData(source='bank.txt', content=None,
+                            extracted_data={'multiple_choice_questions': make_bank(90)})
+    
+    clusters = assign_topics(result, n_clusters=3, terms=3)
+    
+    questions = result.extracted_data['multiple_choice_questions']
+    assert [question['topic'] for question in questions] == clusters.labels.tolist()
+    summary = result.extracted_data['topics']
+    assert [entry['size'] for entry in summary] == [30, 30, 30]
+    assert all(len(entry['terms']) == 3 for entry in summary)
+    assert result.get_questions()[0].topic == questions[0]['topic']
+    
+    stream = io.StringIO()
+    stream_result(result, [CSVExporter(stream, include_positions=False)])
+    rows = list(csv.reader(io.StringIO(stream.getvalue())))
+    assert rows[0][-1] == 'Topic'
+    assert rows[1][-1] == str(questions[0]['topic'])
+    
+    assert assign_topics(StructuredData(source='empty', content='')) is None
@@ -0,0 +1,71 @@
+"""Tests for the file watcher"""
+
+import os
+import tempfile
+
+from question_maker.watch import FileWatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def write(path, text, mtime_ns):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_poll_reports_settled_changes_once():
+    """Test debouncing: a burst of writes is reported once, after it settles"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "quiz.txt")
+        write(path, "one", 1_000_000_000)
+        clock = FakeClock()
+        watcher = FileWatcher(path, debounce=0.5, clock=clock)
+        
+        assert not watcher.poll()
+        
+        write(path, "two", 2_000_000_000)
+        assert not watcher.poll()
+        clock.now = 0.3
+        write(path, "three", 3_000_000_000)
+        assert not watcher.poll()
+        clock.now = 0.6
+        assert not watcher.poll()
+        clock.now = 0.9
+        assert watcher.poll()
+        clock.now = 2.0
+        assert not watcher.poll()
+
+
+def test_poll_ignores_missing_file_until_it_returns():
+    """Test that a deleted file is not reported and a recreated one is"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "quiz.txt")
+        write(path, "one", 1_000_000_000)
+        clock = FakeClock()
+        watcher = FileWatcher(path, debounce=0.5, clock=clock)
+        
+        os.remove(path)
+        assert not watcher.poll()
+        clock.now = 1.0
+        assert not watcher.poll()
+        
+        write(path, "two", 2_000_000_000)
+        assert not watcher.poll()
+        clock.now = 2.0
+        assert watcher.poll()
+
+
+def test_check_content_compares_hashes():
+    """Test that only a different text counts as a content change"""
+    watcher = FileWatcher("unused.txt")
+    
+    assert watcher.check_content("text")
+    assert not watcher.check_content("text")
+    assert watcher.check_content("edited text")